@@ -1,68 +1,204 @@
 from __future__ import annotations
 import typing
 import ast
-import pretty_doc as pd
-from symtable import SymbolTable, Symbol, symtable
-from symtable import Function as FunctionSymtable
+import warnings
+import contextvars
+import pretty_doc
+from Py2Jl import textdoc
+from Py2Jl.textdoc import Seg as _seg
+from Py2Jl.scope import Scope, build_scope_index
+from Py2Jl.profiling import NodeProfile
+from Py2Jl.fold import fold_constants as _fold_constants
+from Py2Jl.infer import BOOL, INT, FLOAT, NUMERIC, infer_function, container_kind
+from Py2Jl.strbuild import find_string_builders
+from Py2Jl.views import find_views
+from Py2Jl.bounds import find_inbounds
+from Py2Jl.vectorize import NotVectorizable, VectorReport, elementwise_loop
+from Py2Jl.capture import BoxWarning, find_captures
+from Py2Jl.toplevel import GlobalWarning, ModuleGlobals, find_globals
+from Py2Jl.jltypes import JLType, Unmappable, AnnotationWarning, julia_type, argument_type, shared_type
+from Py2Jl.memoize import cache_decorator
+from Py2Jl.hoist import find_hoisted
+from Py2Jl.astwalk import stores
+from Py2Jl.classes import (
+    ClassLayout, find_structs, imported_names, method_params, is_dataclass, is_classvar, field_default)
 from contextlib import contextmanager
 from json import dumps as _dump_json
 
+__version__ = '0.1'
+
 
 def escape_string(x: str):
     return _dump_json(x, ensure_ascii=False)
 
-_d_comma_space = pd.comma * pd.space
-_d_if = pd.seg("if")
-_d_elif = pd.seg("elif")
-_d_else = pd.seg("else")
-_d_colon = pd.seg(":")
-_d_semicolon = pd.seg(";")
-_d_in = pd.seg("in")
+# constants are built from `Seg`, which combines with the documents of both backends
+_d_comma_space = _seg(", ")
+_d_if = _seg("if")
+_d_elif = _seg("elseif")
+_d_else = _seg("else")
+_d_colon = _seg(":")
+_d_semicolon = _seg(";")
+_d_in = _seg("in")
+
+DOC_BACKENDS = {
+    'pretty_doc': pretty_doc,
+    'text': textdoc,
+}
+
+
+# the backend of the compiler building a module in this thread or task, `pretty_doc` otherwise:
+# the `JL*` wrappers below build their documents with it
+_backend: contextvars.ContextVar[typing.Any] = contextvars.ContextVar('doc_backend', default=pretty_doc)
+
+
+def _pd():
+    return _backend.get()
+
+
+@contextmanager
+def doc_backend(name: str):
+    """
+    build the documents of the `JL*` wrappers with the given backend within this context,
+    in this thread or task only.
+    'text' renders the same bytes as 'pretty_doc' without building a document tree.
+    """
+    token = _backend.set(DOC_BACKENDS[name])
+    try:
+        yield
+    finally:
+        _backend.reset(token)
 
 PY_CONT = "PyContinuation"
 
 
+def _int_constant(x: ast.expr) -> int | None:
+    if isinstance(x, ast.Constant) and type(x.value) is int:
+        return x.value
+    if isinstance(x, ast.UnaryOp) and isinstance(x.op, ast.USub):
+        v = _int_constant(x.operand)
+        return None if v is None else -v
+    return None
+
+
+def _bytes_literal(v: bytes) -> str:
+    # `b"..."` is an immutable byte vector Julia builds once; the body of a string macro
+    # is read raw, so `"`, `\` and `$` are `\x` escapes as well
+    return 'b"' + ''.join(
+        chr(c) if 0x20 <= c < 0x7f and c not in b'"\\$' else f"\\x{c:02x}" for c in v) + '"'
+
+
+def _contains_yield(x: ast.AST) -> bool:
+    if isinstance(x, (ast.Yield, ast.YieldFrom, ast.Await)):
+        return True
+    if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+        # only defaults and decorators are evaluated in the enclosing scope
+        outer = [*x.args.defaults, *filter(None, x.args.kw_defaults), *getattr(x, 'decorator_list', ())]
+        return any(map(_contains_yield, outer))
+    return any(map(_contains_yield, ast.iter_child_nodes(x)))
+
+
+def _resumable(body: list[ast.stmt]) -> bool:
+    """
+    whether a generator body can be resumed by jumping to the statement after a yield:
+    every yield is a statement of its own, nested at most in `if`, `while` and `for` bodies.
+    """
+    for x in body:
+        if isinstance(x, ast.Expr) and isinstance(x.value, (ast.Yield, ast.YieldFrom)):
+            if x.value.value and _contains_yield(x.value.value):
+                return False
+        elif not _contains_yield(x):
+            continue
+        elif isinstance(x, (ast.If, ast.While)):
+            if _contains_yield(x.test) or not _resumable(x.body) or not _resumable(x.orelse):
+                return False
+        elif isinstance(x, ast.For):
+            if _contains_yield(x.target) or _contains_yield(x.iter) or not _resumable(x.body):
+                return False
+        else:
+            return False
+    return True
+
+
+_TERMINATORS = (ast.Return, ast.Raise, ast.Break, ast.Continue)
+# modules used at compile time only, such as for annotations and decorators:
+# importing them emits nothing, and what they define is not available at run time
+_COMPILE_TIME_MODULES = frozenset({'__future__', 'dataclasses', 'functools', 'typing'})
+# the Julia type of each kind of display (see `container_kind`)
+_DISPLAY_TYPES = {'list': 'PyVector', 'set': 'Set', 'dict': 'Dict'}
+
+
+def _annotated(body: list[ast.stmt]) -> typing.Iterator[ast.AnnAssign]:
+    """
+    the annotated assignments of a function body, leaving out nested functions and classes.
+    """
+    for x in body:
+        if isinstance(x, ast.AnnAssign):
+            yield x
+        elif not isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield from _annotated([
+                c for c in ast.iter_child_nodes(x)
+                if isinstance(c, (ast.stmt, ast.excepthandler, ast.match_case))])
+
+
+class Resumable:
+    """
+    a generator being compiled to a closure that resumes after its last yield.
+    """
+    def __init__(self, state: str):
+        # 0 before the first call, k after the k-th resume point, -1 once finished
+        self.state = state
+        self.labels: list[str] = []
+        # variables the closure assigns, which must outlive each call
+        self.temporaries: list[str] = []
+
+
 def to_ident(s: str):
     if s.isidentifier() or s.replace('′', '').isidentifier(): # TODO: check julia identifier
         return s
     return f'var{escape_string(s)}'
 
+def method_ident(name: str):
+    """
+    the function holding the methods named `name` of the classes compiled to structs.
+    """
+    return to_ident("." + name)
+
 class JLTarget:
-    def __init__(self, x: pd.Doc):
+    def __init__(self, x: pretty_doc.Doc):
         self.x = x
 
     @classmethod
     def name(cls, s: str):
-        return cls(pd.seg(to_ident(s)))
+        return cls(_pd().seg(to_ident(s)))
 
     def assign(self, expr: JLExpr, *, const=False) -> JLStmt:
         if const:
-            return JLStmt(pd.seg("const") + self.x + pd.seg("=") + expr.x)
-        return JLStmt(self.x + pd.seg("=") + expr.x)
+            return JLStmt(_pd().seg("const") + self.x + _pd().seg("=") + expr.x)
+        return JLStmt(self.x + _pd().seg("=") + expr.x)
 
     def star(self):
-        return JLTarget(pd.parens(self.x * pd.seg("...")))
+        return JLTarget(_pd().parens(self.x * _pd().seg("...")))
 
     @classmethod
     def list(cls, *args: JLTarget):
-        return JLExpr(pd.bracket(pd.seplistof(_d_comma_space, (arg.x for arg in args))))
+        return JLExpr(_pd().bracket(_pd().seplistof(_d_comma_space, (arg.x for arg in args))))
 
     @classmethod
     def tuple(cls, *args: JLTarget):
-        return JLTarget(pd.parens(pd.seplistof(_d_comma_space, (arg.x for arg in args)) * _d_comma_space))
+        return JLTarget(_pd().parens(_pd().seplistof(_d_comma_space, (arg.x for arg in args)) * _d_comma_space))
 
 class JLExpr:
-    def __init__(self, x: pd.Doc):
+    def __init__(self, x: pretty_doc.Doc):
         self.x = x
 
     def __call__(self, *args: JLExpr, **kwds: JLExpr):
         if not kwds:
-            return JLExpr(self.x * pd.parens(pd.seplistof(_d_comma_space, (arg.x for arg in args))))
+            return JLExpr(self.x * _pd().parens(_pd().seplistof(_d_comma_space, (arg.x for arg in args))))
 
-        return JLExpr(self.x * pd.parens(
-            pd.seplistof(_d_comma_space, (arg.x for arg in args))
+        return JLExpr(self.x * _pd().parens(
+            _pd().seplistof(_d_comma_space, (arg.x for arg in args))
             * _d_semicolon
-            * pd.seplistof(_d_comma_space, [pd.seg(k + " = ") * v.x for k, v in kwds.items()])
+            + _pd().seplistof(_d_comma_space, [_pd().seg(k + " = ") * v.x for k, v in kwds.items()])
         ))
 
     def pycall(self, *args: JLExpr, **kwds: JLExpr):
@@ -72,79 +208,82 @@ class JLExpr:
     def doc(self):
         return self.x
 
+    def infix(self, op: str, other: JLExpr):
+        return JLExpr(_pd().parens(self.x + _pd().seg(op) + other.x))
+
     def isa(self, x: JLExpr):
-        return JLExpr(pd.parens(self.x + pd.seg("isa") + x.x))
+        return JLExpr(_pd().parens(self.x + _pd().seg("isa") + x.x))
 
     def kw(self, name: JLExpr) -> JLExpr:
-        return JLExpr(name.x + pd.seg("=") + self.x)
+        return JLExpr(name.x + _pd().seg("=") + self.x)
 
     def assign_to(self, *many_lhs: JLTarget) -> JLExpr:
         r = self.x
         for lhs in many_lhs:
-            r = lhs.x + pd.seg("=") + r
+            r = lhs.x + _pd().seg("=") + r
         r += _d_semicolon
         
-        return JLExpr(pd.parens(r))
+        return JLExpr(_pd().parens(r))
 
     def attr(self, s: str):
-        return JLExpr(self.x * pd.seg(".") * pd.seg(s))
+        return JLExpr(self.x * _pd().seg(".") * _pd().seg(s))
 
     def attr_setter(self, s: str):
-        return JLTarget(self.x * pd.seg(".") * pd.seg(s))
+        return JLTarget(self.x * _pd().seg(".") * _pd().seg(s))
     
     def subscript(self, arg: JLExpr):
-        return JLExpr(self.x * pd.bracket(arg.x))
+        return JLExpr(self.x * _pd().bracket(arg.x))
 
     def subscript_setter(self, arg: JLExpr):
-        return JLTarget(self.x * pd.bracket(arg.x))
+        return JLTarget(self.x * _pd().bracket(arg.x))
 
     def star(self):
-        return JLExpr(pd.parens(self.x * pd.seg("...")))
+        return JLExpr(_pd().parens(self.x * _pd().seg("...")))
 
     def to_stmt(self):
         return JLStmt(self.x * _d_semicolon)
 
     @classmethod
     def name(cls, n: str):
-        return cls(pd.seg(to_ident(n)))
+        return cls(_pd().seg(to_ident(n)))
 
     @classmethod
     def symbol(cls, s: str):
-        return cls(pd.seg(":" + s))
+        return cls(_pd().seg(":" + s))
 
     @classmethod
     def literal(cls, x: str):
-        return cls(pd.seg(x))
+        return cls(_pd().seg(x))
     
     @classmethod
     def mk_call(cls, f: JLExpr, *args: JLExpr):
-        return JLExpr(f.x * pd.parens(pd.seplistof(_d_comma_space, (arg.x for arg in args))))
+        return JLExpr(f.x * _pd().parens(_pd().seplistof(_d_comma_space, (arg.x for arg in args))))
 
     @classmethod
     def namedtuple(cls, **kwd: JLExpr):
-        return JLExpr(pd.parens(_d_semicolon * pd.seplistof(_d_comma_space, [pd.seg(k + " = ") * v.x for k, v in kwd.items()])))
+        return JLExpr(_pd().parens(_d_semicolon * _pd().seplistof(_d_comma_space, [_pd().seg(k + " = ") * v.x for k, v in kwd.items()])))
 
     @classmethod
     def namedtuple2(cls, *kwds: JLExpr):
-        return JLExpr(pd.parens(_d_semicolon * pd.seplistof(_d_comma_space, (arg.x for arg in kwds))))
+        return JLExpr(_pd().parens(_d_semicolon * _pd().seplistof(_d_comma_space, (arg.x for arg in kwds))))
 
     @classmethod
     def tuple(cls, *args: JLExpr):
         if not args:
             return JLExpr.literal("()")
-        return JLExpr(pd.parens(pd.seplistof(_d_comma_space, (arg.x for arg in args)) * _d_comma_space))
+        return JLExpr(_pd().parens(_pd().seplistof(_d_comma_space, (arg.x for arg in args)) * _d_comma_space))
 
     @classmethod
     def list(cls, *args: JLExpr):
-        return JLExpr(pd.bracket(pd.seplistof(_d_comma_space, (arg.x for arg in args))))
+        return JLExpr(_pd().bracket(_pd().seplistof(_d_comma_space, (arg.x for arg in args))))
 
     @classmethod
     def typed_list(cls, t: JLExpr, *args: JLExpr):
-        return JLExpr(t.x * pd.bracket(pd.seplistof(_d_comma_space, (arg.x for arg in args))))
+        return JLExpr(t.x * _pd().bracket(_pd().seplistof(_d_comma_space, (arg.x for arg in args))))
 
     @classmethod
     def curly(cls, *args: JLExpr):
-        return pd.brace(pd.seplistof(_d_comma_space, (arg.x for arg in args)))
+        return _pd().brace(_pd().seplistof(_d_comma_space, (arg.x for arg in args)))
 
     @classmethod
     def and_seq(cls, *args: JLExpr):
@@ -156,60 +295,69 @@ class JLExpr:
 
     @classmethod
     def block(cls, *args: JLStmt):
-        return JLExpr(pd.vsep([
-            pd.seg("begin"),
-            pd.indent(4, pd.vsep([arg.x for arg in args])),
-            pd.seg("end")
+        return JLExpr(_pd().vsep([
+            _pd().seg("begin"),
+            _pd().indent(4, _pd().vsep([arg.x for arg in args])),
+            _pd().seg("end")
         ]))
 
     @classmethod
     def bool(cls, b: bool):
-        return cls(pd.seg("true" if b else "false"))
+        return cls(_pd().seg("true" if b else "false"))
 
     
 
 class JLStmt:
-    def __init__(self, x: pd.Doc):
+    def __init__(self, x: pretty_doc.Doc):
         self.x = x
 
     @classmethod
     def chanining_assign(cls, expr: JLExpr, *targets: JLTarget):
         r = expr.x
         for lhs in targets:
-            r = lhs.x + pd.seg("=") + r
+            r = lhs.x + _pd().seg("=") + r
         return JLStmt(r)
 
     @classmethod
     def ln(cls, file: str, line: int):
-        return JLStmt(pd.seg(f"# {file}, line {line}"))
+        return JLStmt(_pd().seg(f"# {file}, line {line}"))
 
     @classmethod
     def block(cls, *args: JLStmt):
-        return JLStmt(pd.vsep([
-            pd.seg("begin"),
-            pd.indent(4, pd.vsep([arg.x for arg in args])),
-            pd.seg("end")
+        return JLStmt(_pd().vsep([
+            _pd().seg("begin"),
+            _pd().indent(4, _pd().vsep([arg.x for arg in args])),
+            _pd().seg("end")
         ]))
 
     @classmethod
-    def declare_locals(cls, *names: str) -> list[JLStmt]:
-        return [JLStmt(pd.seg(f"local {n}")) for n in names]
+    def declare_locals(cls, *names: str, types: dict[str, str] | None = None) -> list[JLStmt]:
+        types = types or {}
+        return [JLStmt(_pd().seg(f"local {n}::{types[n]}" if n in types else f"local {n}")) for n in names]
 
     @classmethod
     def declare_globals(cls, *names: str) -> list[JLStmt]:
-        return [JLStmt(pd.seg(f"global {n}")) for n in names]
+        return [JLStmt(_pd().seg(f"global {n}")) for n in names]
  
     @classmethod
     def ret(cls, args: JLExpr):
-        return JLStmt(pd.seg("return") + args.x)
+        return JLStmt(_pd().seg("return") + args.x)
 
 
     @classmethod
     def whileloop(cls, cond: JLExpr, *args: JLStmt):
-        return JLStmt(pd.vsep([
-            pd.seg("@noscope") + pd.seg("while") + cond.x,
-            pd.indent(4, pd.vsep([arg.x for arg in args])),
-            pd.seg("end")
+        return JLStmt(_pd().vsep([
+            _pd().seg("@noscope") + _pd().seg("while") + cond.x,
+            _pd().indent(4, _pd().vsep([arg.x for arg in args])),
+            _pd().seg("end")
+        ]))
+
+    @classmethod
+    def forloop(cls, var: str, iterable: JLExpr, *args: JLStmt):
+        return JLStmt(_pd().vsep([
+            _pd().seg("for") + JLTarget.name(var).x + _d_in + iterable.x,
+            _pd().indent(4, _pd().vsep([arg.x for arg in args])),
+            _pd().seg("end")
         ]))
 
 
@@ -218,13 +366,13 @@ class JLStmt:
         suite = []
         for i, (cond, body) in enumerate(args):
             head = _d_if if i == 0 else _d_elif
-            suite.append(head + cond.x * _d_colon)
-            suite.append(pd.indent(4, pd.vsep([ arg.x for arg in body ])))
+            suite.append(head + cond.x)
+            suite.append(_pd().indent(4, _pd().vsep([ arg.x for arg in body ])))
         if orelse:
-            suite.append(_d_else * _d_colon)
-            suite.append(pd.indent(4, pd.vsep([ arg.x for arg in orelse ])))
-        suite.append(pd.seg("end"))
-        return JLStmt(pd.vsep(suite))
+            suite.append(_d_else)
+            suite.append(_pd().indent(4, _pd().vsep([ arg.x for arg in orelse ])))
+        suite.append(_pd().seg("end"))
+        return JLStmt(_pd().vsep(suite))
 
     @classmethod
     def try_catch(cls, try_body: list[JLStmt], catch: None | tuple[str, JLStmt], final: list[JLStmt]):
@@ -232,109 +380,173 @@ class JLStmt:
             if not final:
                 return JLStmt.block(*try_body)
             else:
-                return JLStmt(pd.vsep([
-                    pd.seg("try"),
-                    pd.indent(4, pd.vsep([arg.x for arg in try_body])),
-                    pd.seg("finally"),
-                    pd.indent(4, pd.vsep([arg.x for arg in final])),
-                    pd.seg("end")
+                return JLStmt(_pd().vsep([
+                    _pd().seg("try"),
+                    _pd().indent(4, _pd().vsep([arg.x for arg in try_body])),
+                    _pd().seg("finally"),
+                    _pd().indent(4, _pd().vsep([arg.x for arg in final])),
+                    _pd().seg("end")
                 ]))
         else:
             exception_name, exception_handle = catch
             if not final:
-                return JLStmt(pd.vsep([
-                    pd.seg("try"),
-                    pd.indent(4, pd.vsep([arg.x for arg in try_body])),
-                    pd.seg("catch") + JLTarget.name(exception_name).x,
-                    pd.indent(4, exception_handle.x),
-                    pd.seg("end")
+                return JLStmt(_pd().vsep([
+                    _pd().seg("try"),
+                    _pd().indent(4, _pd().vsep([arg.x for arg in try_body])),
+                    _pd().seg("catch") + JLTarget.name(exception_name).x,
+                    _pd().indent(4, exception_handle.x),
+                    _pd().seg("end")
                 ]))
             else:
-                return JLStmt(pd.vsep([
-                    pd.seg("try"),
-                    pd.indent(4, pd.vsep([arg.x for arg in try_body])),
-                    pd.seg("catch") + JLTarget.name(exception_name).x,
-                    pd.indent(4, exception_handle.x),
-                    pd.seg("finally"),
-                    pd.indent(4, pd.vsep([arg.x for arg in final])),
-                    pd.seg("end")
+                return JLStmt(_pd().vsep([
+                    _pd().seg("try"),
+                    _pd().indent(4, _pd().vsep([arg.x for arg in try_body])),
+                    _pd().seg("catch") + JLTarget.name(exception_name).x,
+                    _pd().indent(4, exception_handle.x),
+                    _pd().seg("finally"),
+                    _pd().indent(4, _pd().vsep([arg.x for arg in final])),
+                    _pd().seg("end")
                 ]))
 
 
 class Intrinsic:
 
-    pycall = JLExpr(pd.seg("jpy_call"))
-    bool = JLExpr(pd.seg("jpy_bool"))
-    and_seq = JLExpr(pd.seg("@jpy_all"))
-    or_seq = JLExpr(pd.seg("@jpy_any"))
-    dict = JLExpr(pd.seg("jpy_dict"))
-    # lambdef = JLExpr(pd.seg("@jpy_lambdef"))
-    set = JLExpr(pd.seg("jpy_set"))
-    list = JLExpr(pd.seg("jpy_list"))
-    nonevalue = JLExpr(pd.seg("jpy_none"))
-    yieldvalue = JLExpr(pd.seg("@jpy_yield"))
-    yieldfrom = JLExpr(pd.seg("@jpy_yieldfrom"))
-    literal = JLExpr(pd.seg("jpy_literal"))
-
-    getiter = JLExpr(pd.seg("jpy_getiter"))
-    movenext = JLExpr(pd.seg("jpy_movenext"))
-    getcurrent = JLExpr(pd.seg("jpy_getcurrent"))
-
-    addlist = JLExpr(pd.seg("jpy_addlist"))
-    slice = JLExpr(pd.seg("jpy_slice"))
+    pycall = JLExpr(_seg("jpy_call"))
+    bool = JLExpr(_seg("jpy_bool"))
+    and_seq = JLExpr(_seg("@jpy_all"))
+    or_seq = JLExpr(_seg("@jpy_any"))
+    dict = JLExpr(_seg("jpy_dict"))
+    # lambdef = JLExpr(_seg("@jpy_lambdef"))
+    set = JLExpr(_seg("jpy_set"))
+    list = JLExpr(_seg("jpy_list"))
+    nonevalue = JLExpr(_seg("jpy_none"))
+    yieldvalue = JLExpr(_seg("@jpy_yield"))
+    yieldfrom = JLExpr(_seg("@jpy_yieldfrom"))
+    literal = JLExpr(_seg("jpy_literal"))
+    typed_dict = JLExpr(_seg("jpy_typed_dict"))
+    typed_set = JLExpr(_seg("jpy_typed_set"))
+    typed_list = JLExpr(_seg("jpy_typed_list"))
+
+    getiter = JLExpr(_seg("jpy_getiter"))
+    movenext = JLExpr(_seg("jpy_movenext"))
+    getcurrent = JLExpr(_seg("jpy_getcurrent"))
+    range = JLExpr(_seg("jpy_range"))
+
+    addlist = JLExpr(_seg("jpy_addlist"))
+    listcomp = JLExpr(_seg("jpy_listcomp"))
+    setcomp = JLExpr(_seg("jpy_setcomp"))
+    dictcomp = JLExpr(_seg("jpy_dictcomp"))
+    flatten = JLExpr(_seg("Iterators.flatten"))
+
+    joinstr = JLExpr(_seg("jpy_joinstr"))
+    str_ = JLExpr(_seg("jpy_str"))
+    format = JLExpr(_seg("jpy_format"))
+    strbuffer = JLExpr(_seg("jpy_strbuffer"))
+    strappend = JLExpr(_seg("jpy_strappend"))
+    strtake = JLExpr(_seg("jpy_strtake"))
+    # `!s`, `!r` and `!a` in f-strings
+    conversions : dict[int, JLExpr] = {
+        ord('s'): JLExpr(_seg("jpy_str")),
+        ord('r'): JLExpr(_seg("jpy_repr")),
+        ord('a'): JLExpr(_seg("jpy_ascii")),
+    }
+    # (builtin, number of arguments) -> the Julia function doing the same
+    builtins : dict[tuple[str, int], JLExpr] = {
+        ('len', 1): JLExpr(_seg("length")),
+        ('str', 1): str_,
+        ('repr', 1): conversions[ord('r')],
+        ('ascii', 1): conversions[ord('a')],
+        ('format', 1): str_,
+        ('format', 2): format,
+    }
+    slice = JLExpr(_seg("jpy_slice"))
+    view = JLExpr(_seg("jpy_view"))
+    getindex_inbounds = JLExpr(_seg("jpy_getindex_inbounds"))
+    setindex_inbounds = JLExpr(_seg("jpy_setindex_inbounds"))
+    simd_bounds = JLExpr(_seg("jpy_simd_bounds"))
+    uninit = JLExpr(_seg("jpy_uninit"))
+    new_class = JLExpr(_seg("jpy_class"))
+    super_ = JLExpr(_seg("jpy_super"))
+    dataclass = JLExpr(_seg("jpy_dataclass!"))
+    cache = JLExpr(_seg("jpy_cache"))
 
     binops : dict[object, JLExpr] = {
-        ast.Add: JLExpr(pd.seg("jpy_add")),
-        ast.Sub: JLExpr(pd.seg("jpy_sub")),
-        ast.Mult: JLExpr(pd.seg("jpy_mul")),
-        ast.MatMult: JLExpr(pd.seg("jpy_matmul")),
-        ast.Div: JLExpr(pd.seg("jpy_div")),
-        ast.Mod: JLExpr(pd.seg("jpy_mod")),
-        ast.Pow: JLExpr(pd.seg("jpy_pow")),
-        ast.LShift: JLExpr(pd.seg("jpy_lshift")),
-        ast.RShift: JLExpr(pd.seg("jpy_rshift")),
-        ast.BitOr: JLExpr(pd.seg("jpy_or")),
-        ast.BitXor: JLExpr(pd.seg("jpy_xor")),
-        ast.BitAnd: JLExpr(pd.seg("jpy_and")),
-        ast.FloorDiv: JLExpr(pd.seg("jpy_floordiv")),
+        ast.Add: JLExpr(_seg("jpy_add")),
+        ast.Sub: JLExpr(_seg("jpy_sub")),
+        ast.Mult: JLExpr(_seg("jpy_mul")),
+        ast.MatMult: JLExpr(_seg("jpy_matmul")),
+        ast.Div: JLExpr(_seg("jpy_div")),
+        ast.Mod: JLExpr(_seg("jpy_mod")),
+        ast.Pow: JLExpr(_seg("jpy_pow")),
+        ast.LShift: JLExpr(_seg("jpy_lshift")),
+        ast.RShift: JLExpr(_seg("jpy_rshift")),
+        ast.BitOr: JLExpr(_seg("jpy_or")),
+        ast.BitXor: JLExpr(_seg("jpy_xor")),
+        ast.BitAnd: JLExpr(_seg("jpy_and")),
+        ast.FloorDiv: JLExpr(_seg("jpy_floordiv")),
     }
 
     ibinops : dict[object, JLExpr] = {
-        ast.Add: JLExpr(pd.seg("jpy_iadd")),
-        ast.Sub: JLExpr(pd.seg("jpy_isub")),
-        ast.Mult: JLExpr(pd.seg("jpy_imul")),
-        ast.MatMult: JLExpr(pd.seg("jpy_imatmul")),
-        ast.Div: JLExpr(pd.seg("jpy_idiv")),
-        ast.Mod: JLExpr(pd.seg("jpy_imod")),
-        ast.Pow: JLExpr(pd.seg("jpy_ipow")),
-        ast.LShift: JLExpr(pd.seg("jpy_ilshift")),
-        ast.RShift: JLExpr(pd.seg("jpy_irshift")),
-        ast.BitOr: JLExpr(pd.seg("jpy_ior")),
-        ast.BitXor: JLExpr(pd.seg("jpy_ixor")),
-        ast.BitAnd: JLExpr(pd.seg("jpy_iand")),
-        ast.FloorDiv: JLExpr(pd.seg("jpy_ifloordiv")),
+        ast.Add: JLExpr(_seg("jpy_iadd")),
+        ast.Sub: JLExpr(_seg("jpy_isub")),
+        ast.Mult: JLExpr(_seg("jpy_imul")),
+        ast.MatMult: JLExpr(_seg("jpy_imatmul")),
+        ast.Div: JLExpr(_seg("jpy_idiv")),
+        ast.Mod: JLExpr(_seg("jpy_imod")),
+        ast.Pow: JLExpr(_seg("jpy_ipow")),
+        ast.LShift: JLExpr(_seg("jpy_ilshift")),
+        ast.RShift: JLExpr(_seg("jpy_irshift")),
+        ast.BitOr: JLExpr(_seg("jpy_ior")),
+        ast.BitXor: JLExpr(_seg("jpy_ixor")),
+        ast.BitAnd: JLExpr(_seg("jpy_iand")),
+        ast.FloorDiv: JLExpr(_seg("jpy_ifloordiv")),
     }
 
     uops : dict[object, JLExpr] = {
-        ast.UAdd: JLExpr(pd.seg("jpy_pos")),
-        ast.USub: JLExpr(pd.seg("jpy_neg")),
-        ast.Invert: JLExpr(pd.seg("jpy_invert")),
-        ast.Not: JLExpr(pd.seg("jpy_not")),
+        ast.UAdd: JLExpr(_seg("jpy_pos")),
+        ast.USub: JLExpr(_seg("jpy_neg")),
+        ast.Invert: JLExpr(_seg("jpy_invert")),
+        ast.Not: JLExpr(_seg("jpy_not")),
     }
 
-    conjunctive_compare = JLExpr(pd.seg("@jpy_conjunctive_cmp"))
+    conjunctive_compare = JLExpr(_seg("@jpy_conjunctive_cmp"))
+
+    # Julia operators with Python's semantics on `Int`/`Float64` operands
+    native_binops : dict[object, str | JLExpr] = {
+        ast.Add: "+",
+        ast.Sub: "-",
+        ast.Mult: "*",
+        ast.Div: "/",
+        ast.Pow: "^",
+        ast.LShift: "<<",
+        ast.RShift: ">>",
+        ast.BitOr: "|",
+        ast.BitAnd: "&",
+        ast.BitXor: JLExpr(_seg("xor")),
+        ast.FloorDiv: JLExpr(_seg("fld")),
+        ast.Mod: JLExpr(_seg("mod")),
+    }
+
+    native_compare_ops : dict[object, str] = {
+        ast.Eq: "==",
+        ast.NotEq: "!=",
+        ast.Lt: "<",
+        ast.LtE: "<=",
+        ast.Gt: ">",
+        ast.GtE: ">=",
+    }
 
     compare_ops : dict[object, JLExpr] = {
-        ast.Eq: JLExpr(pd.seg("jpy_eq")),
-        ast.NotEq: JLExpr(pd.seg("jpy_ne")),
-        ast.Lt: JLExpr(pd.seg("jpy_lt")),
-        ast.LtE: JLExpr(pd.seg("jpy_le")),
-        ast.Gt: JLExpr(pd.seg("jpy_gt")),
-        ast.GtE: JLExpr(pd.seg("jpy_ge")),
-        ast.Is: JLExpr(pd.seg("jpy_is")),
-        ast.IsNot: JLExpr(pd.seg("jpy_isnot")),
-        ast.In: JLExpr(pd.seg("jpy_in")),
-        ast.NotIn: JLExpr(pd.seg("jpy_notin")),
+        ast.Eq: JLExpr(_seg("jpy_eq")),
+        ast.NotEq: JLExpr(_seg("jpy_ne")),
+        ast.Lt: JLExpr(_seg("jpy_lt")),
+        ast.LtE: JLExpr(_seg("jpy_le")),
+        ast.Gt: JLExpr(_seg("jpy_gt")),
+        ast.GtE: JLExpr(_seg("jpy_ge")),
+        ast.Is: JLExpr(_seg("jpy_is")),
+        ast.IsNot: JLExpr(_seg("jpy_isnot")),
+        ast.In: JLExpr(_seg("jpy_in")),
+        ast.NotIn: JLExpr(_seg("jpy_notin")),
     }
 
 
@@ -342,32 +554,244 @@ class JLGenerator:
     def call(self, f, args):
         pass
 
+Handler = typing.Callable[['Compiler', typing.Any], typing.Any]
+
+
 class Compiler:
-    _static_lookup_tbl = {}
+    # node type -> handler, built once per class from the `transform_<NodeName>` methods
+    _dispatch: dict[type, Handler] = {}
+    # handlers added with `register`, inherited by subclasses
+    _custom_handlers: dict[type, Handler] = {}
 
-    def create_module(self):
-        return pd.vsep([arg.x for arg in self.transform_stmt_list(self.node.body)])
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._custom_handlers = dict(cls._custom_handlers)
+        cls._dispatch = cls._build_dispatch()
+
+    @classmethod
+    def _build_dispatch(cls) -> dict[type, Handler]:
+        table: dict[type, Handler] = {}
+        for attr in dir(cls):
+            node_name = attr[len("transform_"):]
+            # node classes are capitalized; `transform_expr` and friends are entry points
+            if attr.startswith("transform_") and node_name[:1].isupper():
+                node_type = getattr(ast, node_name, None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    table[node_type] = getattr(cls, attr)
+        table.update(cls._custom_handlers)
+        return table
 
-    def __init__(self, src, filename):
-        self.node: ast.Module = ast.parse(src)
+    @classmethod
+    def register(cls, node_type: type, handler: Handler | None = None):
+        """
+        use `handler(compiler, node)` for `node_type` in this class and its subclasses.
+        can be used as a decorator: `@Compiler.register(ast.Await)`.
+        """
+        def register(handler: Handler):
+            previous = cls._dispatch.get(node_type)
+            cls._custom_handlers[node_type] = handler
+            cls._dispatch[node_type] = handler
+            for sub in cls.__subclasses__():
+                # unless the subclass chose its own handler
+                if sub._dispatch.get(node_type) is previous:
+                    sub.register(node_type, handler)
+            return handler
+        if handler is None:
+            return register
+        return register(handler)
+
+    def create_module(self):
+        # the `JL*` wrappers build their documents with the backend of this compiler too
+        with doc_backend(self.backend):
+            declarations: list[JLStmt] = []
+            if self.typed_globals or self.loop_functions:
+                self.globals = find_globals(self.node, self.scopes, self.is_builtin, loops=self.loop_functions)
+            if self.typed_globals:
+                for name, binding in self.globals.slow.items():
+                    warnings.warn(
+                        f"{self.filename}, line {binding.lineno}: the global `{name}` is neither constant "  # type: ignore
+                        "nor of one type, functions and loops reading it are slow", GlobalWarning)
+                declarations = [
+                    JLStmt(self.pd.seg(f"global {to_ident(n)}::{t}")) for n, t in self.globals.types.items()]
+            # `x.m(...)` calls the method `m` of structs as `var".m"(x, ...)`, which falls back to `x.m(...)`
+            declarations.extend(
+                JLStmt(self.pd.seg(
+                    f"{method_ident(m)}(self, args...; kwargs...) = getproperty(self, :{m})(args...; kwargs...)"))
+                for m in self.method_names)
+            body = self.transform_stmt_list(self.node.body)
+            return self.pd.vsep([arg.x for arg in (*declarations, *self.constants, *body)])
+
+    def __init__(
+            self, src: str | ast.Module, filename, *,
+            backend: str = 'pretty_doc', profile: NodeProfile | None = None,
+            vector_report: VectorReport | None = None,
+            native_for: bool = True, native_range: bool = True,
+            resumable_generators: bool = True, direct_calls: bool = True,
+            compact: bool = False, fold_constants: bool = True, infer_types: bool = True,
+            typed_annotations: bool = False, typed_containers: bool = True,
+            inline_comprehensions: bool = True, string_builders: bool = True,
+            slice_views: bool = True, readonly_slices: bool = False, check_bounds: bool = False,
+            vectorize: bool = True, capture_analysis: bool = True,
+            typed_globals: bool = True, loop_functions: bool = True, struct_classes: bool = True,
+            hoist_constants: bool = True):
+        """
+        `src` is either Python source code or an already parsed module,
+        which is used as is (constants are folded in place):
+        the source is never parsed a second time.
+        `profile` records call counts and time per AST node type.
+        `vector_report` records which loops are vectorized, and why the others are not.
+        `native_for` lowers `for` loops in functions to Julia `for` loops
+        instead of the `jpy_getiter`/`jpy_movenext` protocol.
+        `native_range` iterates over Julia integer ranges where a loop
+        or comprehension iterates over the builtin `range`.
+        `resumable_generators` compiles generators to `PyGenerator` state machines,
+        falling back to `Channel` tasks where a yield cannot be resumed by a jump.
+        `direct_calls` emits `f(a; k = v)` for calls without `*args` and `**kwargs`
+        instead of packing the arguments for `jpy_call`.
+        `compact` leaves out unreachable statements, `jpy_none` block values nobody reads and
+        the re-binding of parameters that are never assigned; the `# file, line N` comments
+        are still emitted, `Py2Jl.linemap` moves them to a sidecar file.
+        `fold_constants` evaluates operators on constants at compile time (see `Py2Jl.fold`)
+        and emits constants without the `jpy_literal` wrapper.
+        `infer_types` infers the `Bool`/`Int`/`Float64` locals and expressions of functions
+        (see `Py2Jl.infer`), which get typed `local` declarations and native operators.
+        `typed_annotations` turns the annotations of functions into Julia types (see `Py2Jl.jltypes`):
+        parameters are declared with them in the signature, annotated locals get typed `local`
+        declarations, and annotated `list`/`set`/`dict` displays are built with their element types.
+        annotations without a Julia type are ignored with an `AnnotationWarning`.
+        `typed_containers` builds the `list`, `set` and `dict` displays of functions with the
+        element types inferred from their elements or from what the function stores in them
+        (see `Py2Jl.infer`, needs `infer_types`).
+        `inline_comprehensions` emits list, set and dict comprehensions as Julia generators
+        collected by the runtime, instead of closures filling an empty container.
+        generator expressions are always Julia generators.
+        `string_builders` turns `s += piece` on a string local in a loop into appends
+        to an `IOBuffer` (see `Py2Jl.strbuild`).
+        `slice_views` reads the slices of lists that a function only reads, and
+        that are themselves only read, as views instead of copies (see `Py2Jl.views`).
+        `readonly_slices` makes every slice read a view, for programs that change
+        no list while a slice of it is in use.
+        `check_bounds` keeps the bounds checks of indexing that loop ranges prove to be
+        in bounds (see `Py2Jl.bounds`), which is otherwise unchecked, for safety audits.
+        `vectorize` emits elementwise maps and reductions over a `range` in functions
+        as `@simd` loops (see `Py2Jl.vectorize`).
+        `capture_analysis` captures the variables of functions that closures refer to with `let`
+        or through typed `Ref`s where it can, so that Julia does not box them (see `Py2Jl.capture`);
+        the variables Julia still boxes are reported with a `BoxWarning`.
+        `typed_globals` makes the globals bound once `const`, and declares the globals
+        that only hold numbers of one type with that type (see `Py2Jl.toplevel`);
+        the other globals functions read are reported with a `GlobalWarning`.
+        `loop_functions` runs the loops of the module as functions.
+        `struct_classes` compiles the dataclasses, the classes with `__slots__` and the classes
+        annotating their attributes to concrete Julia structs, whose methods dispatch on them
+        (see `Py2Jl.classes`); the other classes are dynamic `PyClass` objects of the runtime.
+        `hoist_constants` builds the displays of constants in functions that nothing changes
+        once, as module-level constants (see `Py2Jl.hoist`).
+        """
+        if profile is not None:
+            self._dispatch = {t: profile.wrap(t.__name__, f) for t, f in self._dispatch.items()}
+        if isinstance(src, ast.Module):
+            self.node = src
+        else:
+            self.node = ast.parse(src, filename)
+        if fold_constants:
+            self.node = _fold_constants(self.node)
         self.filename = filename
+        self.backend = backend
+        # the module building the documents, see `DOC_BACKENDS`
+        self.pd = DOC_BACKENDS[backend]
+        self.native_for = native_for
+        self.native_range = native_range
+        self.resumable_generators = resumable_generators
+        self.generator: Resumable | None = None
+        self.direct_calls = direct_calls
+        self.compact = compact
+        self.fold_constants = fold_constants
+        self.infer_types = infer_types
+        self.typed_annotations = typed_annotations
+        self.typed_containers = typed_containers
+        self.inline_comprehensions = inline_comprehensions
+        self.string_builders = string_builders
+        self.slice_views = slice_views
+        self.readonly_slices = readonly_slices
+        # the slices read as views in the functions compiled so far
+        self.views: set[ast.Subscript] = set()
+        self.check_bounds = check_bounds
+        # the subscripts proven to be in bounds in the functions compiled so far
+        self.inbounds: set[ast.Subscript] = set()
+        self.vectorize = vectorize
+        self.vector_report = vector_report
+        self.capture_analysis = capture_analysis
+        # closures -> the variables they capture with `let`,
+        # and scopes -> their variables held in `Ref`s -> the types of the `Ref`s
+        self.lets: dict[ast.AST, list[str]] = {}
+        self.refs: dict[Scope, dict[str, str]] = {}
+        # the assignments binding those `Ref`s
+        self.ref_inits: set[ast.Assign] = set()
+        self.typed_globals = typed_globals
+        self.loop_functions = loop_functions
+        self.globals = ModuleGlobals()
+        # whether a loop of the module is compiled as a function
+        self.in_loop_function = False
+        # the names the module imports -> what they refer to
+        self.imported = imported_names(self.node)
+        # the classes compiled to structs by name, the method names of those classes,
+        # and their methods -> their class
+        self.struct_classes = struct_classes
+        self.layouts: dict[str, ClassLayout] = {}
+        self.method_names: list[str] = []
+        self.methods: dict[ast.FunctionDef, ClassLayout] = {}
+        # the structs compiled so far -> the scalar types of their fields
+        self.structs: dict[str, dict[str, str]] = {}
+        # the class scopes compiled as `PyClass` objects -> the variable holding the class
+        self.class_objects: dict[Scope, str] = {}
+        # loops building strings in the functions compiled so far -> the locals they build,
+        # and the appends in those loops -> their loop
+        self.string_loops: dict[ast.stmt, list[str]] = {}
+        self.string_appends: dict[ast.AugAssign, ast.stmt] = {}
+        # loop -> local -> the buffer it is built in
+        self.buffers: dict[ast.stmt, dict[str, str]] = {}
+        # inferred types of expressions in the functions compiled so far
+        self.types: dict[ast.AST, str] = {}
+        # inferred element types of the displays in those functions,
+        # and the comprehensions built with the element types Julia infers
+        self.elements: dict[ast.expr, tuple[str, ...]] = {}
+        self.comprehensions: set[ast.expr] = set()
+        self.hoist_constants = hoist_constants
+        # the displays of the functions compiled so far built once,
+        # those emitted so far -> their constants, and the bindings of the constants
+        self.hoistable: set[ast.expr] = set()
+        self.hoisted: dict[ast.expr, str] = {}
+        self.constants: list[JLStmt] = []
         self.is_gen = False
         self.gen_sym_cnt = 0
 
-        self.symtbl = symtable(src, filename, "exec")
-        self.cursor = 0
-        self.records = []
+        self.scopes = build_scope_index(self.node)
+        self.symtbl: Scope = self.scopes[self.node]
+        if struct_classes:
+            for layout in find_structs(self.node, self.scopes).values():
+                self.layouts[layout.name] = layout
+                self.methods.update((m, layout) for m in layout.methods)
+                self.method_names.extend(m.name for m in layout.methods if m.name not in self.method_names)
+        self.records: list[tuple[bool, Scope, Resumable | None]] = []
 
-    def parent(self) -> SymbolTable:
-        return self.records[-1][2]
+    def parent(self) -> Scope:
+        return self.records[-1][1]
 
     def gensym(self, s: str):
         self.gen_sym_cnt += 1
         return f'.{s}_{self.gen_sym_cnt}'
 
     
-    def forloop(self, target: JLTarget, iterable: JLExpr, *args: JLStmt):
+    def forloop(self, target: JLTarget, iterable: JLExpr, *args: JLStmt, native: bool = True):
+        if native and self.native_for and (self.symtbl.get_type() == 'function' or self.in_loop_function):
+            # function locals are declared up front, so a scoped Julia `for` assigns them as is
+            item = self.gensym("item")
+            return JLStmt.forloop(item, iterable, target.assign(JLExpr.name(item)), *args)
+        # at module level, a Julia `for` would make the globals it assigns local to the loop
         iterator = self.gensym("iter")
+        if self.generator:
+            self.generator.temporaries.append(iterator)
         xs = [
             JLTarget.name(iterator).assign(Intrinsic.getiter(iterable)),
             JLStmt.whileloop(
@@ -376,7 +800,71 @@ class Compiler:
                 *args,
             )
         ]
-        return JLStmt(pd.vsep([arg.x for arg in xs]))
+        return JLStmt(self.pd.vsep([arg.x for arg in xs]))
+
+    def is_builtin(self, name: str) -> bool:
+        """
+        whether `name` refers to the Python builtin in the current scope,
+        i.e. it is neither bound locally nor anywhere at module level.
+        """
+        try:
+            sym = self.symtbl.lookup(name)
+        except KeyError:
+            return False
+        if not sym.is_global():
+            return False
+        try:
+            sym = self.scopes[self.node].lookup(name)
+        except KeyError:
+            return True
+        # a function declaring it `global` may assign it
+        return not (sym.is_assigned() or sym.is_imported() or sym.is_namespace() or sym.is_declared_global())
+
+    def transform_iter(self, x: ast.expr) -> JLExpr:
+        """
+        the iterable of a `for` loop or a comprehension.
+        """
+        if (self.native_range
+                and isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id == 'range'
+                and 1 <= len(x.args) <= 3 and not x.keywords
+                and not any(isinstance(arg, ast.Starred) for arg in x.args)
+                and self.is_builtin('range')):
+            return self.range(*x.args)
+        return self.transform_expr(x)
+
+    def range(self, *args: ast.expr) -> JLExpr:
+        """
+        Python's `range` as a zero-based Julia `UnitRange` or `StepRange`.
+        """
+        def bound(x: ast.expr) -> int | pretty_doc.Doc:
+            v = _int_constant(x)
+            if v is not None:
+                return v
+            e = self.transform_expr(x).x
+            return e if isinstance(x, ast.Name) else self.pd.parens(e)
+
+        def shift(stop: int | pretty_doc.Doc, n: int):
+            if isinstance(stop, int):
+                return self.pd.seg(str(stop + n))
+            return stop + self.pd.seg("-" if n < 0 else "+") + self.pd.seg(str(abs(n)))
+
+        def doc(v: int | pretty_doc.Doc):
+            return self.pd.seg(str(v)) if isinstance(v, int) else v
+
+        start: int | pretty_doc.Doc
+        if len(args) == 1:
+            start, stop, step = 0, bound(args[0]), 1
+        elif len(args) == 2:
+            start, stop, step = bound(args[0]), bound(args[1]), 1
+        else:
+            start, stop, step = map(bound, args)
+
+        if not isinstance(step, int) or step == 0:
+            # the sign of the step decides which way the stop is excluded
+            return Intrinsic.range(*(JLExpr(doc(v)) for v in (start, stop, step)))
+        if step == 1:
+            return JLExpr(doc(start) * _d_colon * shift(stop, -1))
+        return JLExpr(doc(start) * _d_colon * doc(step) * _d_colon * shift(stop, -1 if step > 0 else 1))
 
     @typing.overload
     def lambdef(
@@ -385,7 +873,10 @@ class Compiler:
         is_generator: bool,
         posonlyargs: list[str], kwonlyargs: list[str],
         vararg: str | None, kwargs: str | None,
-        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt]) -> JLExpr: ...
+        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt],
+        *, annotations: dict[str, str] | None = None, returns: str | None = None,
+        const: bool = False, generic: bool = False,
+        wrap: typing.Callable[[JLExpr], JLExpr] | None = None) -> JLExpr: ...
 
     @typing.overload
     def lambdef(
@@ -394,7 +885,10 @@ class Compiler:
         is_generator: bool,
         posonlyargs: list[str], kwonlyargs: list[str],
         vararg: str | None, kwargs: str | None,
-        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt]) -> JLStmt: ...
+        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt],
+        *, annotations: dict[str, str] | None = None, returns: str | None = None,
+        const: bool = False, generic: bool = False,
+        wrap: typing.Callable[[JLExpr], JLExpr] | None = None) -> JLStmt: ...
 
     def lambdef(
         self,
@@ -402,109 +896,386 @@ class Compiler:
         is_generator: bool,
         posonlyargs: list[str], kwonlyargs: list[str],
         vararg: str | None, kwargs: str | None,
-        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt]):
-
+        defaults: list[JLExpr], kwdefaults: list[JLExpr | None], body: list[JLStmt],
+        *, annotations: dict[str, str] | None = None, returns: str | None = None,
+        const: bool = False, generic: bool = False,
+        wrap: typing.Callable[[JLExpr], JLExpr] | None = None):
+        """
+        `annotations` maps parameters to the types they are declared with in the signature;
+        `returns` is the declared return type; `const` binds a named function as a constant.
+        `generic` adds a method to the function of the methods of structs named `name` instead.
+        `wrap` makes the value the name is bound to from the function, as a decorator does.
+        """
+        annotations = annotations or {}
+        # annotated parameters are converted to the type of their local
+        kept = self.kept_params() - set(annotations)
         names_map: dict[str, str] = {}
         for i in range(len(posonlyargs)):
             old = posonlyargs[i]
+            if old in kept:
+                continue
             new = f"_{old}′"
             names_map[new] = old
             posonlyargs[i] = new
         
         for i in range(len(kwonlyargs)):
             old = kwonlyargs[i]
+            if old in kept:
+                continue
             new = f"_{old}′"
             names_map[new] = old
             kwonlyargs[i] = new
         
-        if vararg:
+        if vararg and vararg not in kept:
             new = f"_{vararg}′"
             names_map[new] = vararg
             vararg = new
-        if kwargs:
+        if kwargs and kwargs not in kept:
             new = f"_{kwargs}′"
             names_map[new] = kwargs
             kwargs = new
 
-        expr_posonlyargs = [JLExpr.name(arg) for arg in posonlyargs]
+        def param(arg: str):
+            e = JLExpr.name(arg)
+            t = annotations.get(names_map.get(arg, arg))
+            return e if t is None else JLExpr(e.x * self.pd.seg("::" + t))
+
+        expr_posonlyargs = [param(arg) for arg in posonlyargs]
+        # the defaults are those of the last positional parameters
         for i, e in enumerate(reversed(defaults)):
-            expr_posonlyargs[-i] = e.kw(expr_posonlyargs[-i])
+            expr_posonlyargs[-(i + 1)] = e.kw(expr_posonlyargs[-(i + 1)])
         
-        expr_kwonlyargs = [JLExpr.name(arg) for arg in kwonlyargs]
+        expr_kwonlyargs = [param(arg) for arg in kwonlyargs]
 
-        for i, e in enumerate(reversed(kwdefaults)):
+        # one default or None per keyword-only parameter
+        for i, e in enumerate(kwdefaults):
             if e:
-                expr_kwonlyargs[-i] = e.kw(expr_kwonlyargs[-i])
+                expr_kwonlyargs[i] = e.kw(expr_kwonlyargs[i])
         
         if vararg:
             expr_posonlyargs.append(JLExpr.name(vararg).star())
         if kwargs:
             expr_kwonlyargs.append(JLExpr.name(kwargs).star())
 
-        sig = pd.seplistof(_d_comma_space, [arg.x for arg in expr_posonlyargs])
+        sig = self.pd.seplistof(_d_comma_space, [arg.x for arg in expr_posonlyargs])
         if expr_kwonlyargs:
-            sig += _d_semicolon + pd.seplistof(_d_comma_space, [arg.x for arg in expr_kwonlyargs])
+            sig += _d_semicolon + self.pd.seplistof(_d_comma_space, [arg.x for arg in expr_kwonlyargs])
         
         
-        expr_body: list[pd.Doc] = []
+        expr_body: list[pretty_doc.Doc] = []
 
         for k, v in names_map.items():
             expr_body.append(JLTarget.name(v).assign(JLExpr.name(k)).x)
         
         if is_generator:  
             expr_body.extend(arg.x for arg in body)
-            expr_body = [pd.vsep([
-                pd.seg(f"Channel() do {PY_CONT}"),
-                pd.indent(2, pd.vsep(expr_body)),
-                pd.seg(f"end"),
+            expr_body = [self.pd.vsep([
+                self.pd.seg(f"Channel() do {PY_CONT}"),
+                self.pd.indent(2, self.pd.vsep(expr_body)),
+                self.pd.seg(f"end"),
             ])]
             
         else:
             expr_body.extend(arg.x for arg in body)
 
+        head = self.pd.parens(sig)
+        if returns is not None:
+            head = head * self.pd.seg("::" + returns)
+        if name is not None and generic:
+            return JLStmt(self.pd.vsep([
+                self.pd.seg("function") + self.pd.seg(method_ident(name)) * head,
+                self.pd.indent(4, self.pd.vsep(expr_body)),
+                self.pd.seg("end"),
+            ]))
         if name is not None:
-            n = self.parent().lookup(name)
             generated_name = to_ident(self.gensym(name))
-            return JLStmt(pd.vsep([
-                pd.seg("function") + pd.seg(generated_name) * pd.parens(sig),
-                pd.indent(4, pd.vsep(expr_body)),
-                pd.seg("end"),
-                JLTarget.name(name).assign(JLExpr.literal(generated_name), const=n.is_global()).x,
+            value = JLExpr.literal(generated_name)
+            return JLStmt(self.pd.vsep([
+                self.pd.seg("function") + self.pd.seg(generated_name) * head,
+                self.pd.indent(4, self.pd.vsep(expr_body)),
+                self.pd.seg("end"),
+                self.binding(name, self.parent()).assign(wrap(value) if wrap else value, const=const).x,
             ]))
         else:
-            return JLExpr(pd.vsep([
-                pd.seg("(function") + pd.parens(sig),
-                pd.indent(4, pd.vsep(expr_body)),
-                pd.seg("end)"),
+            return JLExpr(self.pd.vsep([
+                self.pd.seg("(function") + head,
+                self.pd.indent(4, self.pd.vsep(expr_body)),
+                self.pd.seg("end)"),
             ]))
 
     
 
+    def binding(self, name: str, scope: Scope) -> JLTarget:
+        """
+        the target binding `name` in `scope`: an attribute of the class object in a class body.
+        """
+        obj = self.class_objects.get(scope)
+        if obj is not None and scope.lookup(name).is_local():
+            return JLExpr.name(obj).attr_setter(name)
+        return JLTarget.name(name)
+
+    def kept_params(self) -> set[str]:
+        """
+        parameters of the current function that are used as is instead of being
+        re-bound to locals: in compact mode, those the function never assigns.
+        """
+        if not self.compact:
+            return set()
+        return {
+            sym.get_name() for sym in self.symtbl.get_symbols()
+            if sym.is_parameter() and not sym.is_assigned() and not sym.is_cell()
+        }
+
+    def is_const(self, x: ast.stmt) -> bool:
+        """
+        whether `x` binds a constant global.
+        """
+        return self.typed_globals and x in self.globals.const_bindings
+
+    def let_captures(self, x: ast.AST, doc: pretty_doc.Doc) -> pretty_doc.Doc:
+        """
+        the code making the closure `x` in a `let` binding the variables it captures with `let`.
+        """
+        names = self.lets.get(x)
+        if not names:
+            return doc
+        bindings = ", ".join(f"{to_ident(n)} = {to_ident(n)}" for n in names)
+        return self.pd.vsep([self.pd.seg(f"let {bindings}"), self.pd.indent(4, doc), self.pd.seg("end")])
+
+    def captured(self, x: ast.AST, e: JLExpr) -> JLExpr:
+        if x not in self.lets:
+            return e
+        return JLExpr(self.pd.parens(self.let_captures(x, e.x)))
+
+    def ref_type(self, name: str) -> str | None:
+        """
+        the type of the `Ref` holding the variable `name` refers to in the current scope, if any.
+        """
+        scope: Scope | None = self.symtbl
+        while scope is not None:
+            sym = scope.symbols.get(name)
+            if sym is None and scope.kind == 'class' or sym is not None and sym.is_free():
+                scope = scope.parent
+            elif sym is not None and sym.is_cell():
+                return self.refs.get(scope, {}).get(name)
+            else:
+                return None
+        return None
+
+    def find_captures(self, x: ast.FunctionDef, local_types: dict[str, str]):
+        """
+        decide how the closures of `x` capture its variables, and report those Julia boxes.
+        the variables held in `Ref`s are declared with the type of their `Ref` in `local_types`.
+        """
+        if self.symtbl.is_generator:
+            boxed = list(self.symtbl.get_cells())
+        else:
+            captures = find_captures(x, self.symtbl, self.scopes)
+            self.lets.update(captures.lets)
+            if captures.refs:
+                self.refs[self.symtbl] = captures.refs
+            self.ref_inits.update(captures.inits)
+            local_types.update((n, f"Base.RefValue{{{t}}}") for n, t in captures.refs.items())
+            boxed = captures.boxed
+        if boxed:
+            names = ", ".join(f"`{n}`" for n in boxed)
+            warnings.warn(
+                f"{self.filename}, line {x.lineno}: Julia boxes the captured "
+                f"variable{'s' if len(boxed) > 1 else ''} {names} of `{x.name}`", BoxWarning)
+
+    def annotation(self, x: ast.expr, what: str) -> JLType | None:
+        """
+        the Julia type of an annotation, or None, after a diagnostic, if it has none.
+        """
+        try:
+            return julia_type(x, self.structs)
+        except Unmappable as e:
+            warnings.warn(
+                f"{self.filename}, line {x.lineno}: ignored the annotation of {what}, {e} has no Julia type",
+                AnnotationWarning, stacklevel=2)
+            return None
+
+    def declared_types(self, x: ast.FunctionDef) -> tuple[dict[str, JLType], dict[str, JLType]]:
+        """
+        the types of the annotated parameters of `x` in its signature, and the types
+        the annotated parameters and locals are declared with in its body.
+        """
+        params: dict[str, JLType] = {}
+        for a in (*x.args.posonlyargs, *x.args.args, *x.args.kwonlyargs):
+            if a.annotation:
+                t = self.annotation(a.annotation, f"parameter `{a.arg}`")
+                if t is not None:
+                    params[a.arg] = t
+        for a in (x.args.vararg, x.args.kwarg):
+            if a and a.annotation:
+                warnings.warn(
+                    f"{self.filename}, line {a.lineno}: ignored the annotation of `{a.arg}`, "
+                    "variadic parameters are not typed", AnnotationWarning)
+
+        declared = dict(params)
+        conflicts: set[str] = set()
+        local_names = set(self.symtbl.get_locals())
+        for stmt in _annotated(x.body):
+            target = stmt.target
+            if not isinstance(target, ast.Name) or target.id not in local_names:
+                continue
+            if self.symtbl.lookup(target.id).is_parameter():
+                # the signature gives the type of a parameter
+                continue
+            t = self.annotation(stmt.annotation, f"`{target.id}`")
+            if t is None:
+                continue
+            if declared.setdefault(target.id, t) != t:
+                conflicts.add(target.id)
+        for n in conflicts:
+            warnings.warn(
+                f"{self.filename}, line {x.lineno}: `{n}` is annotated with different types in `{x.name}`, "
+                "its local is not typed", AnnotationWarning)
+            del declared[n]
+        for n, t in declared.items():
+            if n not in params and all(self.is_fresh(t, v, p) for v, p in stores(x, n)):
+                # only ever a display built with its element types, which may hold shared containers
+                declared[n] = JLType(t.name, tuple(map(shared_type, t.params)))
+            else:
+                declared[n] = shared_type(t)
+        return {n: argument_type(t) for n, t in params.items()}, declared
+
+    def is_fresh(self, t: JLType, x: ast.AST, parent: ast.AST | None) -> bool:
+        """
+        whether the binding `x` of a local declared with `t` is an annotated assignment
+        of a display built with the element types of `t` (see `annotated_container`), if any.
+        """
+        if not (isinstance(parent, ast.AnnAssign) and parent.target is x):
+            return False
+        if parent.value is None:
+            return True
+        kind = container_kind(parent.value, self.is_builtin)
+        return kind is not None and bool(t.params) and t.name == _DISPLAY_TYPES[kind]
+
+    def annotated_container(self, annotation: ast.expr, x: ast.expr) -> JLExpr | None:
+        """
+        a `list`, `set` or `dict` display, or an empty `list()`, `set()` or `dict()`,
+        built with the element types of its annotation.
+        """
+        kind = container_kind(x, self.is_builtin)
+        if kind is None:
+            return None
+        try:
+            t = julia_type(annotation)
+        except Unmappable:
+            return None
+        if t.params and t.name == _DISPLAY_TYPES[kind]:
+            return self.typed_container(x, tuple(str(shared_type(p)) for p in t.params))
+        return None
+
+    def typed_container(self, x: ast.expr, params: tuple[str, ...]) -> JLExpr:
+        """
+        a display or an empty `list()`, `set()` or `dict()` (see `container_kind`),
+        built with the given element types.
+        """
+        types = [JLExpr.literal(t) for t in params]
+        if isinstance(x, ast.Dict):
+            return Intrinsic.typed_dict(*types, *self.dict_items(x))
+        elts = self.transform_expr_list(x.elts) if isinstance(x, (ast.List, ast.Set)) else []
+        kind = container_kind(x, self.is_builtin)
+        if kind == 'dict':
+            return Intrinsic.typed_dict(*types)
+        return (Intrinsic.typed_list if kind == 'list' else Intrinsic.typed_set)(*types, *elts)
+
+    def resumable(self, body: list[ast.stmt]) -> list[JLStmt]:
+        """
+        a generator body as a closure wrapped in `PyGenerator`: each call runs to the next yield
+        and returns `Some(value)`, or `nothing` once the body is done.
+        `@goto` dispatches to the resume point stored in the state variable,
+        so loops containing yields must not open Julia scopes.
+        """
+        gen = self.generator = Resumable(self.gensym("state"))
+        stmts = self.transform_stmt_list(body)
+        state = to_ident(gen.state)
+        dispatch = [
+            JLStmt(self.pd.seg(f"{state} == {k} && @goto {to_ident(label)}"))
+            for k, label in enumerate(gen.labels, 1)
+        ]
+        dispatch.append(JLStmt(self.pd.seg(f"{state} == -1 && return nothing")))
+        return [
+            *JLStmt.declare_locals(*map(to_ident, gen.temporaries)),
+            JLTarget.name(gen.state).assign(JLExpr.literal("0")),
+            JLStmt(self.pd.vsep([
+                self.pd.seg("return PyGenerator() do"),
+                self.pd.indent(4, self.pd.vsep([arg.x for arg in dispatch])),
+                self.pd.indent(4, self.pd.vsep([arg.x for arg in stmts])),
+                self.pd.indent(4, self.finish_generator().x),
+                self.pd.seg("end"),
+            ])),
+        ]
+
+    def finish_generator(self) -> JLStmt:
+        assert self.generator
+        return JLStmt(self.pd.vsep([
+            JLTarget.name(self.generator.state).assign(JLExpr.literal("-1")).x,
+            self.pd.seg("return nothing"),
+        ]))
+
+    def resume_point(self, value: JLExpr) -> JLStmt:
+        assert self.generator
+        gen = self.generator
+        label = self.gensym("resume")
+        gen.labels.append(label)
+        return JLStmt(self.pd.vsep([
+            JLTarget.name(gen.state).assign(JLExpr.literal(str(len(gen.labels)))).x,
+            self.pd.seg("return") + self.pd.seg("Some") * self.pd.parens(value.x),
+            self.pd.seg("@label") + self.pd.seg(to_ident(label)),
+        ]))
+
+    def resumable_yield(self, x: ast.Yield | ast.YieldFrom) -> JLStmt:
+        assert self.generator
+        if isinstance(x, ast.Yield):
+            return self.resume_point(self.transform_expr_or_none(x.value))
+        iterator = self.gensym("iter")
+        self.generator.temporaries.append(iterator)
+        return JLStmt(self.pd.vsep([
+            JLTarget.name(iterator).assign(Intrinsic.getiter(self.transform_expr(x.value))).x,
+            JLStmt.whileloop(
+                Intrinsic.movenext(JLExpr.name(iterator)),
+                self.resume_point(Intrinsic.getcurrent(JLExpr.name(iterator))),
+            ).x,
+        ]))
+
     @contextmanager
-    def enter(self):
-        self.records.append((self.cursor, self.is_gen, self.symtbl))
+    def enter(self, node: ast.AST):
+        self.records.append((self.is_gen, self.symtbl, self.generator))
         try:
-            self.symtbl = self.symtbl.get_children()[self.cursor]
-            self.cursor = 0
+            self.symtbl = self.scopes[node]
             self.is_gen = False
+            self.generator = None
             yield
         finally:
-            (self.cursor, self.is_gen, self.symtbl) = self.records.pop()
-            self.cursor += 1
-    
-    def _static_lookup_method(self, n: str):
-        if f := self._static_lookup_tbl.get(n):
-            return f
-        if f := getattr(self.__class__, "transform_" + n):
-            self._static_lookup_tbl[n] = f
-            return f
-        raise LookupError(n)
+            (self.is_gen, self.symtbl, self.generator) = self.records.pop()
     
+    def _unsupported(self, x: ast.AST):
+        line = getattr(x, 'lineno', None)
+        where = f" at {self.filename}, line {line}" if line else ""
+        return NotImplementedError(f"{x.__class__.__name__}{where}")
+
     def transform_expr(self, x: ast.expr) -> JLExpr:
-        assert isinstance(x, ast.expr)
-        f = self._static_lookup_method(x.__class__.__name__)
+        if x in self.hoistable:
+            return self.hoist(x)
+        try:
+            f = self._dispatch[x.__class__]
+        except KeyError:
+            raise self._unsupported(x) from None
         return f(self, x)
 
+    def hoist(self, x: ast.expr) -> JLExpr:
+        """
+        the module-level constant `x` is built in once.
+        """
+        name = self.hoisted.get(x)
+        if name is None:
+            name = self.hoisted[x] = self.gensym("const")
+            self.constants.append(JLTarget.name(name).assign(self._dispatch[x.__class__](self, x), const=True))
+        return JLExpr.name(name)
+
     def transform_expr_or_none(self, x: ast.expr | None) -> JLExpr:
         if x is None:
             return Intrinsic.nonevalue
@@ -512,13 +1283,17 @@ class Compiler:
 
     
     def transform_stmt(self, x: ast.stmt) -> JLStmt:
-        assert isinstance(x, ast.stmt)
-        f = self._static_lookup_method(x.__class__.__name__)
+        try:
+            f = self._dispatch[x.__class__]
+        except KeyError:
+            raise self._unsupported(x) from None
         return f(self, x)
     
     def transform_lhs(self, x: ast.expr) -> JLTarget:
-        assert isinstance(x, ast.expr)
-        f = self._static_lookup_method(x.__class__.__name__)
+        try:
+            f = self._dispatch[x.__class__]
+        except KeyError:
+            raise self._unsupported(x) from None
         return f(self, x)
 
     def transform_lhs_list(self, x: list[ast.expr]) -> list[JLTarget]:
@@ -527,18 +1302,54 @@ class Compiler:
     def transform_expr_list(self, xs: typing.List[ast.expr]):
         return [self.transform_expr(e) for e in xs]
     
-    def transform_stmt_list(self, xs: typing.List[ast.stmt]):
+    def transform_stmt_list(self, xs: typing.List[ast.stmt], *, value: bool = False):
+        """
+        `value`: the value of the block is read, as in function bodies, which return it.
+        """
         result : list[JLStmt] = []
         for x in xs:
             result.append(JLStmt.ln(self.filename, x.lineno))
             result.append(self.transform_stmt(x))
+            if self.compact and isinstance(x, _TERMINATORS):
+                return result
         
-        result.append(Intrinsic.nonevalue.to_stmt())
+        if value or not self.compact:
+            result.append(Intrinsic.nonevalue.to_stmt())
         return result
     
 
+    def condition(self, x: ast.expr) -> JLExpr:
+        """
+        the truth of `x` as a `Bool`.
+        """
+        e = self.transform_expr(x)
+        t = self.types.get(x)
+        if t == BOOL:
+            return e
+        if t in (INT, FLOAT):
+            return e.infix("!=", JLExpr.literal("0"))
+        return Intrinsic.bool(e)
+
+    def native_binop(self, op: ast.operator, l: str | None, r: str | None, lhs: JLExpr, rhs: JLExpr) -> JLExpr | None:
+        numeric = (INT, FLOAT)
+        if isinstance(op, (ast.BitAnd, ast.BitOr, ast.BitXor)):
+            ok = l == r == INT or l == r == BOOL
+        elif isinstance(op, (ast.LShift, ast.RShift)):
+            ok = l == r == INT
+        else:
+            ok = l in numeric and r in numeric
+        if not ok:
+            return None
+        f = Intrinsic.native_binops[type(op)]
+        if isinstance(f, str):
+            return lhs.infix(f, rhs)
+        return f(lhs, rhs)
+
     def transform_BoolOp(self, x: ast.BoolOp):
         xs = list(map(self.transform_expr, x.values))
+        if all(self.types.get(v) == BOOL for v in x.values):
+            op = "&&" if isinstance(x.op, ast.And) else "||"
+            return JLExpr(self.pd.parens(self.pd.seplistof(self.pd.seg(f" {op} "), [e.x for e in xs])))
         if isinstance(x.op, ast.And):
             return JLExpr.and_seq(*xs)
         elif isinstance(x.op, ast.Or):
@@ -550,44 +1361,63 @@ class Compiler:
         return self.transform_expr(x.value).assign_to(self.transform_lhs(x.target))
         
     def transform_BinOp(self, x: ast.BinOp) -> JLExpr:
+        lhs = self.transform_expr(x.left)
+        rhs = self.transform_expr(x.right)
+        if x in self.types:
+            native = self.native_binop(x.op, self.types.get(x.left), self.types.get(x.right), lhs, rhs)
+            if native:
+                return native
         f = Intrinsic.binops[type(x.op)]    
-        return f(self.transform_expr(x.left), self.transform_expr(x.right))
+        return f(lhs, rhs)
 
     def transform_UnaryOp(self, x: ast.UnaryOp) -> JLExpr:
+        operand = self.transform_expr(x.operand)
+        t = self.types.get(x.operand)
+        if isinstance(x.op, (ast.USub, ast.UAdd)) and t in (INT, FLOAT):
+            return JLExpr(self.pd.parens(self.pd.seg("-" if isinstance(x.op, ast.USub) else "+") * operand.x))
+        if isinstance(x.op, ast.Not) and t == BOOL:
+            return JLExpr(self.pd.parens(self.pd.seg("!") * operand.x))
+        if isinstance(x.op, ast.Invert) and t == INT:
+            return JLExpr(self.pd.parens(self.pd.seg("~") * operand.x))
         f = Intrinsic.uops[type(x.op)]
-        return f(self.transform_expr(x.operand))
+        return f(operand)
 
     def transform_IfExp(self, x: ast.IfExp) -> JLExpr:
-        test = Intrinsic.bool(self.transform_expr(x.test)).x
+        test = self.condition(x.test).x
         body = self.transform_expr(x.body).x
         orelse = self.transform_expr(x.orelse).x
         return JLExpr(
-            pd.vsep(
+            self.pd.vsep(
                 [
-                    pd.seg("if") + test,
-                    pd.indent(4, body),
-                    pd.seg("else"),
-                    pd.indent(4, orelse),
-                    pd.seg("end")
+                    self.pd.seg("if") + test,
+                    self.pd.indent(4, body),
+                    self.pd.seg("else"),
+                    self.pd.indent(4, orelse),
+                    self.pd.seg("end")
                 ]
         ))
 
-    def transform_Dict(self, x: ast.Dict) -> JLExpr:
-        args: list[pd.Doc] = []
+    def dict_items(self, x: ast.Dict) -> list[JLExpr]:
+        args: list[pretty_doc.Doc] = []
         for (k, v) in zip(x.keys, x.values):
             if k is None:
                 v = self.transform_expr(v)
-                args.append(v.x * pd.seg("..."))
+                args.append(v.x * self.pd.seg("..."))
             else:
                 k = self.transform_expr(k).x
                 v = self.transform_expr(v).x
-                args.append(k * pd.seg("=>") * v)
-        return Intrinsic.dict(*map(JLExpr, args))
+                args.append(k * self.pd.seg("=>") * v)
+        return list(map(JLExpr, args))
+
+    def transform_Dict(self, x: ast.Dict) -> JLExpr:
+        if x in self.elements:
+            return self.typed_container(x, self.elements[x])
+        return Intrinsic.dict(*self.dict_items(x))
 
     def transform_Lambda(self, x: ast.Lambda) -> JLExpr:
         defaults = [self.transform_expr(d) for d in x.args.defaults]
         kwdefaults = [d and self.transform_expr(d) for d in x.args.kw_defaults]
-        with self.enter():
+        with self.enter(x):
             if x.args.args:
                 raise NotImplementedError("so far only positional only args and keyword only args are supported")
             args = [a.arg for a in x.args.posonlyargs]
@@ -604,11 +1434,12 @@ class Compiler:
                 vararg = None
             
             block : list[JLStmt] = []
-            assert isinstance(self.symtbl, FunctionSymtable)
-            block.extend(JLStmt.declare_locals(*self.symtbl.get_locals()))
+            assert self.symtbl.get_type() == 'function'
+            kept = self.kept_params()
+            block.extend(JLStmt.declare_locals(*(n for n in self.symtbl.get_locals() if n not in kept)))
             block.append(JLStmt.ret(self.transform_expr(x.body)))                
             
-            return self.lambdef(
+            return self.captured(x, self.lambdef(
                 None,
                 self.is_gen,
                 args,
@@ -618,20 +1449,21 @@ class Compiler:
                 defaults,
                 kwdefaults,
                 block,
-            )
+            ))
 
     def transform_Set(self, x: ast.Set) -> JLExpr:
+        if x in self.elements:
+            return self.typed_container(x, self.elements[x])
         return Intrinsic.set(*map(self.transform_expr, x.elts))
 
     def _build_comp(self, xs: list[ast.comprehension], i: int, first_iter: JLExpr, result: JLStmt):
         x = xs[i]
-        self.transform_expr(x.iter)
         cond = Intrinsic.bool(Intrinsic.and_seq(*map(self.transform_expr, x.ifs)))
         target = self.transform_lhs(x.target)
         if i == 0:
             iter = first_iter
         else:
-            iter = self.transform_expr(x.iter)
+            iter = self.transform_iter(x.iter)
         i += 1
         if i == len(xs):
             ret = result
@@ -639,18 +1471,20 @@ class Compiler:
             ret = self._build_comp(xs, i, first_iter, result)
         return self.forloop(target, iter, JLStmt.if_else((cond, [ret])))
 
-        
-    def transform_ListComp(self, x: ast.ListComp) -> JLExpr:
-        x.generators
-        first_iter = self.transform_expr(x.generators[0].iter)
-
-        with self.enter():
+    def comp_closure(self, x: ast.ListComp | ast.SetComp | ast.DictComp, first_iter: JLExpr, empty: JLExpr):
+        """
+        a comprehension as a closure filling the container `empty` with loops, called on the first iterable.
+        """
+        with self.enter(x):
             arg = JLExpr.name(".0")
             rhs_list = JLExpr.name(".1")
             lhs_list = JLTarget.name(".1")
-            result = self.transform_expr(x.elt)
-            result_action = Intrinsic.addlist(rhs_list, result).to_stmt()
-            
+            if isinstance(x, ast.DictComp):
+                key = self.transform_expr(x.key)
+                result_action = rhs_list.subscript_setter(key).assign(self.transform_expr(x.value))
+            else:
+                result_action = Intrinsic.addlist(rhs_list, self.transform_expr(x.elt)).to_stmt()
+
             return self.lambdef(
                 None,
                 False,
@@ -661,22 +1495,101 @@ class Compiler:
                 [],
                 [],
                 [
-                    lhs_list.assign(Intrinsic.list()),
+                    # the targets and the result must not assign variables of an enclosing function
+                    *JLStmt.declare_locals(*map(to_ident, [
+                        *(n for n in self.symtbl.get_locals() if n not in self.kept_params()), ".1"])),
+                    lhs_list.assign(empty),
                     self._build_comp(x.generators, 0, arg, result_action),
                     JLStmt.ret(rhs_list)
                 ]
             )(first_iter)
 
+    def comp_target(self, x: ast.expr) -> pretty_doc.Doc | None:
+        """
+        the target of a Julia generator: a name or nested tuples of names.
+        """
+        if isinstance(x, ast.Name):
+            return JLTarget.name(x.id).x
+        if isinstance(x, (ast.Tuple, ast.List)) and x.elts:
+            elts = [self.comp_target(e) for e in x.elts]
+            if any(e is None for e in elts):
+                return None
+            doc = self.pd.seplistof(_d_comma_space, elts)
+            return self.pd.parens(doc * self.pd.seg(",") if len(elts) == 1 else doc)
+        return None
+
+    def julia_generator(self, x: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp, first_iter: JLExpr) -> JLExpr | None:
+        """
+        a comprehension as a Julia generator `elt for target in iter if cond`,
+        or None if it assigns a variable of the enclosing scope (`:=`) or a target that is not a name.
+        """
+        if any(isinstance(e, ast.NamedExpr) for e in ast.walk(x)):
+            return None
+        with self.enter(x):
+            targets = [self.comp_target(g.target) for g in x.generators]
+            if any(t is None for t in targets):
+                return None
+            if isinstance(x, ast.DictComp):
+                elt = self.transform_expr(x.key).x * self.pd.seg(" => ") * self.transform_expr(x.value).x
+            else:
+                elt = self.transform_expr(x.elt).x
+            clauses: list[pretty_doc.Doc] = []
+            for i, (g, target) in enumerate(zip(x.generators, targets)):
+                iter = first_iter if i == 0 else self.transform_iter(g.iter)
+                clause = self.pd.seg("for") + target + _d_in + iter.x  # type: ignore
+                if g.ifs:
+                    cond = self.pd.seplistof(self.pd.seg(" && "), [self.condition(e).x for e in g.ifs])
+                    clause = clause + _d_if + cond
+                clauses.append(clause)
+        if all(not g.ifs for g in x.generators[:-1]):
+            # Julia nests the `for` clauses of a generator the way Python does
+            doc = elt
+            for clause in clauses:
+                doc = doc + clause
+            return JLExpr(doc)
+        # a filter on an outer loop: flatten the generators of the inner loops
+        doc = elt + clauses[-1]
+        for clause in reversed(clauses[:-1]):
+            doc = Intrinsic.flatten.x * self.pd.parens(self.pd.parens(doc) + clause)
+        return JLExpr(doc)
+
+    def comprehension(self, collect: JLExpr, x: ast.expr, n: int, gen: JLExpr) -> JLExpr:
+        """
+        collects a comprehension with the `n` element types Julia infers when its elements
+        stay in sight (see `Py2Jl.infer`), and with `Any` ones otherwise,
+        since storing other values in the container later would fail to convert them.
+        """
+        if x in self.comprehensions:
+            return collect(gen)
+        return collect(*[JLExpr.literal("Any")] * n, JLExpr(self.pd.parens(gen.x)))
+
+    def transform_ListComp(self, x: ast.ListComp) -> JLExpr:
+        first_iter = self.transform_iter(x.generators[0].iter)
+        gen = self.inline_comprehensions and self.julia_generator(x, first_iter)
+        if gen:
+            return self.captured(x, self.comprehension(Intrinsic.listcomp, x, 1, gen))
+        return self.captured(x, self.comp_closure(x, first_iter, Intrinsic.list()))
 
     def transform_SetComp(self, x: ast.SetComp) -> JLExpr:
-        raise NotImplementedError
-    
+        first_iter = self.transform_iter(x.generators[0].iter)
+        gen = self.inline_comprehensions and self.julia_generator(x, first_iter)
+        if gen:
+            return self.captured(x, self.comprehension(Intrinsic.setcomp, x, 1, gen))
+        return self.captured(x, self.comp_closure(x, first_iter, Intrinsic.set()))
+
     def transform_DictComp(self, x: ast.DictComp) -> JLExpr:
-        raise NotImplementedError
-    
+        first_iter = self.transform_iter(x.generators[0].iter)
+        gen = self.inline_comprehensions and self.julia_generator(x, first_iter)
+        if gen:
+            return self.captured(x, self.comprehension(Intrinsic.dictcomp, x, 2, gen))
+        return self.captured(x, self.comp_closure(x, first_iter, Intrinsic.dict()))
+
     def transform_GeneratorExp(self, x: ast.GeneratorExp) -> JLExpr:
-        raise NotImplementedError
-    
+        gen = self.julia_generator(x, self.transform_iter(x.generators[0].iter))
+        if not gen:
+            raise self._unsupported(x)
+        return self.captured(x, JLExpr(self.pd.parens(gen.x)))
+
     def transform_Yield(self, x: ast.Yield) -> JLExpr:
         self.is_gen = True
         if not x.value:
@@ -690,9 +1603,21 @@ class Compiler:
         return Intrinsic.yieldfrom(self.transform_expr(x.value))
     
     def transform_Await(self, x: ast.Await) -> JLExpr:
-        raise NotImplementedError
+        raise self._unsupported(x)
 
     def transform_Compare(self, x: ast.Compare) -> JLExpr:
+        operands = [x.left, *x.comparators]
+        if (all(type(op) in Intrinsic.native_compare_ops for op in x.ops)
+                and all(self.types.get(e) in (INT, FLOAT) for e in operands)):
+            # Julia chains comparisons the way Python does
+            docs = [self.transform_expr(x.left).x]
+            for op, e in zip(x.ops, x.comparators):
+                docs.append(self.pd.seg(Intrinsic.native_compare_ops[type(op)]))
+                docs.append(self.transform_expr(e).x)
+            doc = docs[0]
+            for d in docs[1:]:
+                doc = doc + d
+            return JLExpr(self.pd.parens(doc))
         last = self.transform_expr(x.left)
         args = []
         for i, op in enumerate(x.ops):
@@ -706,34 +1631,126 @@ class Compiler:
         def mk_kwarg(k: ast.keyword):
             if k.arg is None:
                 return self.transform_expr(k.value).star()
-            return self.transform_expr(k.value).assign_to(JLTarget.name(k.arg))
-        
+            return self.transform_expr(k.value).kw(JLExpr.name(k.arg))
+
+        if x in self.elements:
+            # an empty `list()`, `set()` or `dict()`
+            return self.typed_container(x, self.elements[x])
+        if (isinstance(x.func, ast.Name) and not x.keywords
+                and (x.func.id, len(x.args)) in Intrinsic.builtins
+                and not any(isinstance(arg, ast.Starred) for arg in x.args)
+                and self.is_builtin(x.func.id)):
+            return Intrinsic.builtins[x.func.id, len(x.args)](*map(self.transform_expr, x.args))
+        if isinstance(x.func, ast.Name) and x.func.id == 'super' and not x.args and not x.keywords:
+            owner = self.super_owner()
+            if owner is not None:
+                return Intrinsic.super_(*owner)
+        if isinstance(x.func, ast.Attribute) and x.func.attr in self.method_names:
+            return self.method_call(x)
+        if isinstance(x.func, ast.Name) and x.func.id in self.layouts and x.keywords:
+            call = self.struct_call(x, self.layouts[x.func.id])
+            if call is not None:
+                return call
         f = self.transform_expr(x.func)
+        if (self.direct_calls
+                and not any(isinstance(arg, ast.Starred) for arg in x.args)
+                and all(k.arg is not None for k in x.keywords)):
+            if not isinstance(x.func, (ast.Name, ast.Attribute, ast.Call, ast.Subscript, ast.Lambda)):
+                f = JLExpr(self.pd.parens(f.x))
+            return f(
+                *map(self.transform_expr, x.args),
+                **{k.arg: self.transform_expr(k.value) for k in x.keywords if k.arg})
         kwargs = JLExpr.namedtuple2(*map(mk_kwarg, x.keywords))
         args = JLExpr.tuple(*map(self.transform_expr, x.args))
         return Intrinsic.pycall(f, args, kwargs)
 
+    def super_owner(self) -> tuple[JLExpr, JLExpr] | None:
+        """
+        the class and the instance `super()` refers to in a method of a `PyClass`.
+        """
+        scope = self.symtbl
+        if not (self.is_builtin('super') and scope.kind == 'function' and scope.parent in self.class_objects):
+            return None
+        params = method_params(scope.node)  # type: ignore
+        if not params:
+            return None
+        return JLExpr.name(self.class_objects[scope.parent]), JLExpr.name(params[0].arg)  # type: ignore
+
+    def method_call(self, x: ast.Call) -> JLExpr:
+        """
+        `obj.m(...)` as `var".m"(obj, ...)`, which is the method of the struct when `obj` is one.
+        """
+        func: ast.Attribute = x.func  # type: ignore
+        args = [self.transform_expr(func.value), *map(self.transform_expr, x.args)]
+        kwargs = [
+            self.transform_expr(k.value).star() if k.arg is None
+            else JLExpr(self.pd.seg(k.arg + " = ") * self.transform_expr(k.value).x)
+            for k in x.keywords]
+        sig = self.pd.seplistof(_d_comma_space, [arg.x for arg in args])
+        if kwargs:
+            sig += _d_semicolon + self.pd.seplistof(_d_comma_space, [arg.x for arg in kwargs])
+        return JLExpr(self.pd.seg(method_ident(func.attr)) * self.pd.parens(sig))
+
+    def struct_call(self, x: ast.Call, layout: ClassLayout) -> JLExpr | None:
+        """
+        a dataclass struct made with keywords, by its positional constructor.
+        """
+        try:
+            if not self.symtbl.lookup(layout.name).is_global():
+                return None
+        except KeyError:
+            return None
+        fields = list(layout.fields)
+        if (not layout.dataclass or layout.method('__init__') or len(x.args) > len(fields)
+                or any(isinstance(arg, ast.Starred) for arg in x.args) or any(k.arg is None for k in x.keywords)):
+            return None
+        keywords = {k.arg: k.value for k in x.keywords}
+        args = list(x.args)
+        for f in fields[len(args):]:
+            value = keywords.pop(f, None) or layout.defaults.get(f)
+            if value is None:
+                return None
+            args.append(value)
+        if keywords:
+            return None
+        return JLExpr.name(layout.name)(*map(self.transform_expr, args))
+
     def transform_FormattedValue(self, x: ast.FormattedValue) -> JLExpr:
-        raise NotImplementedError
-    
+        value = self.transform_expr(x.value)
+        convert = Intrinsic.conversions.get(x.conversion)
+        if x.format_spec is None:
+            # `format(x, '')` is `str(x)`
+            return (convert or Intrinsic.str_)(value)
+        if convert:
+            value = convert(value)
+        return Intrinsic.format(value, self.transform_expr(x.format_spec))
+
     def transform_JoinedStr(self, x: ast.JoinedStr) -> JLExpr:
-        raise NotImplementedError
+        # every part is a `String`: `jpy_joinstr` allocates the result once
+        parts = self.transform_expr_list(x.values)
+        if not parts:
+            return self._const("")
+        if len(parts) == 1:
+            return parts[0]
+        return Intrinsic.joinstr(*parts)
 
     def _const(self, v):
+        # `jpy_literal` is the identity
+        wrap = (lambda e: e) if self.fold_constants else Intrinsic.literal
         if isinstance(v, str):
-            return Intrinsic.literal(JLExpr.literal(escape_string(v)))
+            return wrap(JLExpr.literal(escape_string(v)))
+        elif isinstance(v, bool):
+            return wrap(JLExpr.bool(v))
         elif isinstance(v, int):
-            return Intrinsic.literal(JLExpr.literal(str(v)))
+            return wrap(JLExpr.literal(str(v)))
         elif isinstance(v, float):
-            return Intrinsic.literal(JLExpr.literal(str(v)))
-        elif isinstance(v, bool):
-            return Intrinsic.literal(JLExpr.bool(v))
+            return wrap(JLExpr.literal(str(v)))
         elif v is None:
             return Intrinsic.nonevalue
         elif isinstance(v, bytes):
-            return Intrinsic.literal(JLExpr.typed_list(JLExpr.literal("UInt8"), *map(JLExpr.literal, map(str, v))))
+            return wrap(JLExpr.literal(_bytes_literal(v)))
         elif isinstance(v, tuple):
-            return Intrinsic.literal(JLExpr.tuple(*map(self._const, v)))
+            return wrap(JLExpr.tuple(*map(self._const, v)))
         else:
             raise NotImplementedError(type(v))
             
@@ -748,17 +1765,21 @@ class Compiler:
         elif isinstance(x.ctx, ast.Store):
             return JLExpr.attr_setter(value, x.attr)
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
 
     def transform_Subscript(self, x: ast.Subscript) -> JLExpr | JLTarget:
         value = self.transform_expr(x.value)
         slice = self.transform_expr(x.slice)
         if isinstance(x.ctx, ast.Load):
+            if isinstance(x.slice, ast.Slice) and (self.readonly_slices or x in self.views):
+                return Intrinsic.view(value, slice)
+            if x in self.inbounds:
+                return Intrinsic.getindex_inbounds(value, slice)
             return JLExpr.subscript(value, slice)
         elif isinstance(x.ctx, ast.Store):
             return JLExpr.subscript_setter(value, slice)
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
 
     def transform_Starred(self, x: ast.Starred) -> JLExpr | JLTarget:
         if isinstance(x.ctx, ast.Load):
@@ -766,23 +1787,39 @@ class Compiler:
         elif isinstance(x.ctx, ast.Store):
             return self.transform_lhs(x.value).star()
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
     
     def transform_Name(self, x: ast.Name) -> JLExpr | JLTarget:
+        if self.refs and self.ref_type(x.id):
+            # the variable is held in a `Ref`
+            ref = self.pd.seg(to_ident(x.id) + "[]")
+            if isinstance(x.ctx, ast.Load):
+                return JLExpr(ref)
+            elif isinstance(x.ctx, ast.Store):
+                return JLTarget(ref)
+        obj = self.class_objects.get(self.symtbl) if self.class_objects else None
+        if obj is not None and self.symtbl.lookup(x.id).is_local():
+            # a name of a class body is an attribute of the class
+            if isinstance(x.ctx, ast.Load):
+                return JLExpr.name(obj).attr(x.id)
+            elif isinstance(x.ctx, ast.Store):
+                return JLExpr.name(obj).attr_setter(x.id)
         if isinstance(x.ctx, ast.Load):
             return JLExpr.name(x.id)
         elif isinstance(x.ctx, ast.Store):
             return JLTarget.name(x.id)
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
 
     def transform_List(self, x: ast.List) -> JLExpr | JLTarget:
         if isinstance(x.ctx, ast.Load):
+            if x in self.elements:
+                return self.typed_container(x, self.elements[x])
             return Intrinsic.list(*map(self.transform_expr, x.elts))
         elif isinstance(x.ctx, ast.Store):
             return JLTarget.tuple(*map(self.transform_lhs, x.elts))
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
 
     def transform_Tuple(self, x: ast.Tuple) -> JLExpr | JLTarget:
         if isinstance(x.ctx, ast.Load):
@@ -790,7 +1827,7 @@ class Compiler:
         elif isinstance(x.ctx, ast.Store):
             return JLTarget.tuple(*map(self.transform_lhs, x.elts))
         else:
-            raise NotImplementedError
+            raise self._unsupported(x)
     
     def transform_Slice(self, x: ast.Slice) -> JLExpr:
         lower = self.transform_expr_or_none(x.lower)
@@ -802,10 +1839,15 @@ class Compiler:
     def transform_FunctionDef(self, x: ast.FunctionDef) -> JLStmt:
         defaults = [self.transform_expr(d) for d in x.args.defaults]
         kwdefaults = [d and self.transform_expr(d) for d in x.args.kw_defaults]
-        with self.enter():
-            if x.args.args:
+        # the struct `x` is a method of
+        layout = self.methods.get(x)
+        memoized = cache_decorator(x, self.imported)
+        maxsize = memoized and self.transform_expr(memoized.maxsize)
+        with self.enter(x):
+            # the `self` of a method may be an ordinary parameter
+            if x.args.args and not (self.parent().get_type() == 'class' and x.args.args == method_params(x)):
                 raise NotImplementedError("so far only positional only args and keyword only args are supported")
-            args = [a.arg for a in x.args.posonlyargs]
+            args = [a.arg for a in (*x.args.posonlyargs, *x.args.args)]
             kwonlyargs =  [a.arg for a in x.args.kwonlyargs]
 
             if x.args.kwarg:
@@ -819,13 +1861,74 @@ class Compiler:
                 vararg = None
             
             block : list[JLStmt] = []
-            assert isinstance(self.symtbl, FunctionSymtable)
-            block.extend(JLStmt.declare_locals(*self.symtbl.get_locals()))
-            block.extend(self.transform_stmt_list(x.body))
+            assert self.symtbl.get_type() == 'function'
+            is_gen = self.symtbl.is_generator
+            arg_types: dict[str, JLType] = {}
+            declared: dict[str, JLType] = {}
+            returns = None
+            if self.typed_annotations:
+                arg_types, declared = self.declared_types(x)
+                if x.returns and not is_gen:
+                    returns = self.annotation(x.returns, f"the return value of `{x.name}`")
+                    # a function may return a container it was given
+                    returns = returns and shared_type(returns)
+            if layout is not None:
+                # methods dispatch on the struct
+                arg_types[args[0]] = declared[args[0]] = JLType(to_ident(layout.name))
+            local_types: dict[str, str] = {}
+            if self.infer_types:
+                inferred = infer_function(
+                    x, self.symtbl, self.is_builtin,
+                    declared={n: str(t) for n, t in declared.items()}, fields=self.structs)
+                self.types.update(inferred.exprs)
+                if self.typed_containers:
+                    self.elements.update(inferred.elements)
+                    self.comprehensions.update(inferred.comprehensions)
+                local_types = inferred.locals
+            local_types.update((n, str(t)) for n, t in declared.items())
+            if self.string_builders:
+                builders = find_string_builders(
+                    x.body,
+                    [n for n in self.symtbl.get_locals()
+                     if not self.symtbl.lookup(n).is_cell() and not self.symtbl.lookup(n).is_parameter()],
+                    self.is_builtin,
+                    {n: str(t) for n, t in declared.items()})
+                self.string_loops.update(builders.loops)
+                self.string_appends.update(builders.appends)
+            if self.slice_views and not is_gen:
+                names = [
+                    n for n in self.symtbl.get_locals()
+                    if n not in declared and n not in arg_types and not self.symtbl.lookup(n).is_cell()]
+                self.views.update(find_views(
+                    x.body,
+                    [n for n in names if not self.symtbl.lookup(n).is_parameter()],
+                    [n for n in names if self.symtbl.lookup(n).is_parameter()],
+                    self.is_builtin))
+            if self.hoist_constants:
+                self.hoistable.update(find_hoisted(
+                    x.body,
+                    [n for n in self.symtbl.get_locals()
+                     if not self.symtbl.lookup(n).is_cell() and not self.symtbl.lookup(n).is_parameter()],
+                    self.is_builtin))
+            if not self.check_bounds and not is_gen:
+                self.inbounds.update(find_inbounds(
+                    x.body,
+                    [n for n in self.symtbl.get_locals() if not self.symtbl.lookup(n).is_cell()],
+                    self.is_builtin))
+            if self.capture_analysis:
+                self.find_captures(x, local_types)
+            kept = self.kept_params() - set(arg_types)
+            block.extend(JLStmt.declare_locals(
+                *(n for n in self.symtbl.get_locals() if n not in kept), types=local_types))
+            if is_gen and self.resumable_generators and _resumable(x.body):
+                block.extend(self.resumable(x.body))
+                is_gen = False
+            else:
+                block.extend(self.transform_stmt_list(x.body, value=not is_gen))
             
-            return self.lambdef(
+            f = self.lambdef(
                 x.name,
-                self.is_gen,
+                is_gen,
                 args,
                 kwonlyargs,
                 vararg,
@@ -833,69 +1936,358 @@ class Compiler:
                 defaults,
                 kwdefaults,
                 block,
+                annotations={n: str(t) for n, t in arg_types.items()},
+                returns=None if returns is None else str(returns),
+                const=self.is_const(x) if self.typed_globals else self.parent().lookup(x.name).is_global(),
+                generic=layout is not None,
+                wrap=memoized and (lambda f: Intrinsic.cache(
+                    f, maxsize, JLExpr.bool(memoized.typed),
+                    JLExpr.literal(self.cache_key(x, declared, memoized.typed)),
+                    JLExpr.literal("Any" if returns is None else str(returns)))),
             )
+            return JLStmt(self.let_captures(x, f.x))
+
+    def transform_ClassDef(self, x: ast.ClassDef) -> JLStmt:
+        layout = self.layouts.get(x.name)
+        if layout is not None and layout.node is x:
+            return self.struct_class(layout)
+        return self.class_object(x)
+
+    def struct_class(self, layout: ClassLayout) -> JLStmt:
+        """
+        a class as a struct, its constructors, its methods, and how it is printed and compared.
+        """
+        x = layout.node
+        name = to_ident(x.name)
+        types: dict[str, str] = {}
+        # the struct is a type in its own fields
+        self.structs[x.name] = {}
+        for f, annotation in layout.fields.items():
+            t = None if annotation is None else self.annotation(annotation, f"the field `{f}` of `{x.name}`")
+            types[f] = str(shared_type(t)) if t else 'Any'
+        self.structs[x.name] = {f: t for f, t in types.items() if t in NUMERIC}
+
+        init = layout.method('__init__')
+        fields = [self.pd.seg(f"{to_ident(f)}::{t}") for f, t in types.items()]
+        if init or not layout.dataclass:
+            # an instance whose fields `__init__` or the program assign
+            fields.append(self.pd.seg(f"{name}(::PyUninit) = new()"))
+        docs = [self.pd.vsep([
+            self.pd.seg("mutable struct" if layout.mutable else "struct") + self.pd.seg(name),
+            self.pd.indent(4, self.pd.vsep(fields)),
+            self.pd.seg("end"),
+        ])]
+        if init:
+            docs.append(self.pd.vsep([
+                self.pd.seg(f"function {name}(args...; kwargs...)"),
+                self.pd.indent(4, self.pd.vsep([
+                    JLTarget.name("self").assign(JLExpr.name(x.name)(Intrinsic.uninit)).x,
+                    self.pd.seg(f"{method_ident('__init__')}(self, args...; kwargs...)"),
+                    self.pd.seg("return self"),
+                ])),
+                self.pd.seg("end"),
+            ]))
+        elif not layout.dataclass:
+            docs.append(self.pd.seg(f"{name}() =") + JLExpr.name(x.name)(Intrinsic.uninit).x)
+        else:
+            docs.extend(self.dataclass_constructors(layout))
+
+        with self.enter(x):
+            for m in layout.methods:
+                docs.append(JLStmt.ln(self.filename, m.lineno).x)
+                docs.append(self.transform_stmt(m).x)
+        docs.extend(self.struct_protocols(layout))
+        return JLStmt(self.pd.vsep(docs))
+
+    def dataclass_constructors(self, layout: ClassLayout) -> list[pretty_doc.Doc]:
+        """
+        the constructors of a dataclass leaving out the fields with defaults, and the one taking keywords.
+        """
+        name = JLExpr.name(layout.name)
+        fields = list(layout.fields)
+        defaults = {f: self.transform_expr(d) for f, d in layout.defaults.items()}
+        docs: list[pretty_doc.Doc] = []
+        # no fields is the keyword constructor
+        for n in range(max(len(fields) - len(defaults), 1), len(fields)):
+            head = name(*map(JLExpr.name, fields[:n]))
+            docs.append(head.x + self.pd.seg("=") + name(*map(JLExpr.name, fields[:n]), *(defaults[f] for f in fields[n:])).x)
+        if fields:
+            params = self.pd.seplistof(_d_comma_space, [
+                defaults[f].kw(JLExpr.name(f)).x if f in defaults else JLExpr.name(f).x for f in fields])
+            docs.append(
+                name.x * self.pd.parens(_d_semicolon + params) + self.pd.seg("=") + name(*map(JLExpr.name, fields)).x)
+        return docs
+
+    def struct_protocols(self, layout: ClassLayout) -> list[pretty_doc.Doc]:
+        """
+        `repr`, `str`, `==` and `hash` of a struct from its methods, or as a dataclass defines them.
+        """
+        name = to_ident(layout.name)
+        fields = list(layout.fields)
+        this = JLExpr.name("self")
+        docs: list[pretty_doc.Doc] = []
+        if layout.method('__repr__'):
+            repr_ = JLExpr.literal(method_ident('__repr__'))(this)
+        elif layout.dataclass and layout.repr:
+            parts: list[JLExpr] = []
+            for i, f in enumerate(fields):
+                prefix = f"{layout.name}(" if i == 0 else ", "
+                parts.append(self._const(f"{prefix}{f}="))
+                parts.append(Intrinsic.conversions[ord('r')](this.attr(to_ident(f))))
+            parts.append(self._const(")"))
+            repr_ = Intrinsic.joinstr(*parts) if fields else self._const(f"{layout.name}()")
+        else:
+            repr_ = self._const(f"<{layout.name} object>")
+        docs.append(self.pd.seg(f"Py2JlRuntime.jpy_repr(self::{name}) =") + repr_.x)
+        if layout.method('__str__'):
+            docs.append(self.pd.seg(f"Py2JlRuntime.jpy_str(self::{name}) = {method_ident('__str__')}(self)"))
+        if layout.method('__eq__'):
+            docs.append(self.pd.seg(
+                f"Base.:(==)(self::{name}, other::{name}) = jpy_bool({method_ident('__eq__')}(self, other))"))
+        elif layout.dataclass and layout.eq:
+            equal = " && ".join(f"self.{to_ident(f)} == other.{to_ident(f)}" for f in fields) or "true"
+            docs.append(self.pd.seg(f"Base.:(==)(self::{name}, other::{name}) = {equal}"))
+            if layout.frozen:
+                values = "".join(f"self.{to_ident(f)}, " for f in fields)
+                docs.append(self.pd.seg(f"Base.hash(self::{name}, h::UInt) = hash(({values}), h)"))
+        docs.append(self.pd.seg(f"Base.show(io::IO, self::{name}) = print(io, jpy_str(self))"))
+        return docs
+
+    def class_object(self, x: ast.ClassDef) -> JLStmt:
+        """
+        a class as a `PyClass` of the runtime, whose body assigns its attributes.
+        """
+        if x.keywords:
+            raise NotImplementedError(f"keywords of the class `{x.name}`")
+        obj = self.gensym("class")
+        docs = [JLTarget.name(obj).assign(Intrinsic.new_class(
+            self._const(x.name), JLExpr.tuple(*self.transform_expr_list(x.bases)))).x]
+        dataclass = None
+        decorators = list(x.decorator_list)
+        if decorators and is_dataclass(decorators[-1], self.imported):
+            dataclass = decorators.pop()
+            if getattr(dataclass, 'args', None) or getattr(dataclass, 'keywords', None):
+                raise NotImplementedError(f"options of `@dataclass` on `{x.name}`, which is not a struct")
+        fields: list[str] = []
+        defaults: dict[str, JLExpr] = {}
+        body = x.body
+        if dataclass is not None:
+            for stmt in x.body:
+                if not (isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name)
+                        and not is_classvar(stmt.annotation)):
+                    continue
+                fields.append(stmt.target.id)
+                if stmt.value is not None:
+                    default = field_default(stmt.value, self.imported)
+                    if not isinstance(default, ast.Constant):
+                        raise NotImplementedError(
+                            f"the default of `{x.name}.{stmt.target.id}`, `{x.name}` is not a struct")
+                    defaults[stmt.target.id] = self._const(default.value)
+            # the defaults made with `field` are not class attributes
+            body = [s for s in x.body if not (isinstance(s, ast.AnnAssign) and s.value is not None
+                                              and not isinstance(s.value, ast.Constant))]
+
+        self.class_objects[self.scopes[x]] = obj
+        with self.enter(x):
+            docs.extend(arg.x for arg in self.transform_stmt_list(body))
+        if dataclass is not None:
+            docs.append(Intrinsic.dataclass(
+                JLExpr.name(obj), JLExpr.tuple(*map(JLExpr.symbol, fields)), JLExpr.namedtuple(**defaults)).to_stmt().x)
+        value = JLExpr.name(obj)
+        for d in reversed(decorators):
+            value = self.transform_expr(d)(value)
+        docs.append(self.binding(x.name, self.symtbl).assign(value, const=self.is_const(x)).x)
+        return JLStmt(self.pd.vsep(docs))
+
+    def cache_key(self, x: ast.FunctionDef, declared: dict[str, JLType], typed: bool) -> str:
+        """
+        the type of the keys of the memoization table of `x`, see `Py2Jl.memoize`.
+        """
+        if x.args.vararg or x.args.kwonlyargs or x.args.kwarg or typed:
+            return "Any"
+        if x.args.defaults:
+            # calls leaving out defaulted arguments make shorter keys
+            return "Tuple"
+        params = [a.arg for a in (*x.args.posonlyargs, *x.args.args)]
+        if all(p in declared for p in params):
+            return f"Tuple{{{', '.join(str(declared[p]) for p in params)}}}"
+        return "Tuple"
 
     def transform_Delete(self, x: ast.Delete) -> JLStmt:
-        raise NotImplementedError
+        raise self._unsupported(x)
 
     def transform_Assign(self, x: ast.Assign) -> JLStmt:
+        if x in self.ref_inits:
+            name: str = x.targets[0].id  # type: ignore
+            ref = JLExpr(self.pd.seg(f"Ref{{{self.refs[self.symtbl][name]}}}"))
+            return JLTarget.name(name).assign(ref(self.transform_expr(x.value)))
+        if x.targets[0] in self.inbounds:
+            sub: ast.Subscript = x.targets[0]  # type: ignore
+            return Intrinsic.setindex_inbounds(
+                self.transform_expr(sub.value), self.transform_expr(x.value), self.transform_expr(sub.slice)
+            ).to_stmt()
         targets = self.transform_lhs_list(x.targets)
         value = self.transform_expr(x.value)
+        if self.is_const(x):
+            return targets[0].assign(value, const=True)
         return JLStmt.chanining_assign(value, *targets)
     
     def transform_AugAssign(self, x: ast.AugAssign) -> JLStmt:
-        target = self.transform_lhs(x.target)
-        rhs = self.transform_expr(x.target)
+        if x in self.string_appends:
+            buffer = self.buffers[self.string_appends[x]][x.target.id]  # type: ignore
+            return Intrinsic.strappend(JLExpr.name(buffer), self.transform_expr(x.value)).to_stmt()
+        if x.target in self.inbounds:
+            sub: ast.Subscript = x.target  # type: ignore
+            seq, index = self.transform_expr(sub.value), self.transform_expr(sub.slice)
+            rhs = Intrinsic.getindex_inbounds(seq, index)
+            store = lambda v: Intrinsic.setindex_inbounds(seq, v, index).to_stmt()
+        else:
+            target = self.transform_lhs(x.target)
+            # the target read back as an expression
+            rhs = JLExpr(target.x)
+            store = target.assign
         value = self.transform_expr(x.value)
+        if x in self.types:
+            native = self.native_binop(x.op, self.types.get(x.target), self.types.get(x.value), rhs, value)
+            if native:
+                return store(native)
         op = Intrinsic.ibinops[type(x.op)]
-        return target.assign(op(rhs, value))
+        return store(op(rhs, value))
 
     def transform_AnnAssign(self, x: ast.AnnAssign) -> JLStmt:
         if x.value:
             target = self.transform_lhs(x.target)
-            value = self.transform_expr(x.value)
-            return target.assign(value)
+            value = self.typed_annotations and self.annotated_container(x.annotation, x.value)
+            if not value:
+                value = self.transform_expr(x.value)
+            return target.assign(value, const=self.is_const(x))
         else:
-            return JLStmt(pd.empty)
+            return JLStmt(self.pd.empty)
     
     def transform_For(self, x: ast.For) -> JLStmt:
+        if x.orelse:
+            raise NotImplementedError("else clause in for loop")
+        if x in self.globals.loops and not self.in_loop_function:
+            return self.loop_function(x)
+
+        if (self.vectorize and self.native_for and self.native_range and self.generator is None
+                and self.symtbl.get_type() == 'function'):
+            vectorized = self.vectorized_loop(x)
+            if vectorized is not None:
+                return vectorized
+        buffers = self.string_buffers(x)
+        return self.build_strings(buffers, self.plain_loop(x))
+
+    def loop_function(self, x: ast.For | ast.While) -> JLStmt:
+        """
+        a loop of the module as a function declaring the globals it assigns, called once.
+        """
+        name = to_ident(self.gensym("loop"))
+        self.in_loop_function = True
+        try:
+            loop = self.transform_stmt(x)
+        finally:
+            self.in_loop_function = False
+        return JLStmt(self.pd.vsep([
+            self.pd.seg("function") + self.pd.seg(name) * self.pd.seg("()"),
+            self.pd.indent(4, self.pd.vsep([
+                *(arg.x for arg in JLStmt.declare_globals(*map(to_ident, self.globals.loops[x]))),
+                loop.x,
+            ])),
+            self.pd.seg("end"),
+            self.pd.seg(name) * self.pd.seg("();"),
+        ]))
+
+    def plain_loop(self, x: ast.For) -> JLStmt:
         target = self.transform_lhs(x.target)
-        iter = self.transform_expr(x.iter)
+        iter = self.transform_iter(x.iter)
         block = self.transform_stmt_list(x.body)
-        return self.forloop(target, iter, *block)
+        # a Julia `for` is a scope, which `@goto` cannot jump into
+        native = not (self.generator and _contains_yield(x))
+        return self.forloop(target, iter, *block, native=native)
+
+    def vectorized_loop(self, x: ast.For) -> JLStmt | None:
+        """
+        an elementwise loop as a `@simd` loop, see `Py2Jl.vectorize`.
+        """
+        try:
+            if x in self.string_loops:
+                raise NotVectorizable("it builds a string")
+            loop = elementwise_loop(x, self.is_builtin)
+        except NotVectorizable as e:
+            self.report_loop(x, False, str(e))
+            return None
+        self.report_loop(x, True, loop.describe())
+        # the items indexed unchecked in the `@simd` loop only
+        unproven = set() if self.check_bounds else loop.items - self.inbounds
+        self.inbounds |= unproven
+        try:
+            simd = JLStmt(self.pd.seg("@simd") + self.plain_loop(x).x)
+        finally:
+            self.inbounds -= unproven
+        if not unproven:
+            return simd
+        test = Intrinsic.simd_bounds(
+            self.transform_expr(loop.start) if loop.start else self._const(0),
+            self.transform_expr(loop.stop),
+            *map(JLExpr.name, loop.lists))
+        return JLStmt.if_else((test, [simd]), orelse=[self.plain_loop(x)])
+
+    def report_loop(self, x: ast.For, vectorized: bool, detail: str):
+        if self.vector_report is not None:
+            self.vector_report.add(self.filename, x.lineno, vectorized, detail)
     
     def transform_While(self, x: ast.While) -> JLStmt:
         if x.orelse:
             raise NotImplementedError("else clause in while loop")
+        if x in self.globals.loops and not self.in_loop_function:
+            return self.loop_function(x)
 
-        test = self.transform_expr(x.test)
+        buffers = self.string_buffers(x)
+        test = self.condition(x.test)
         block = self.transform_stmt_list(x.body)
-        return JLStmt.whileloop(test, *block)
+        return self.build_strings(buffers, JLStmt.whileloop(test, *block))
+
+    def string_buffers(self, x: ast.For | ast.While) -> list[tuple[str, str]]:
+        """
+        the locals a loop builds, each with a new buffer.
+        """
+        buffers = [(name, self.gensym("buffer")) for name in self.string_loops.get(x, ())]
+        self.buffers[x] = dict(buffers)
+        return buffers
+
+    def build_strings(self, buffers: list[tuple[str, str]], loop: JLStmt) -> JLStmt:
+        if not buffers:
+            return loop
+        return JLStmt(self.pd.vsep([
+            *(JLTarget.name(b).assign(Intrinsic.strbuffer(JLExpr.name(n))).x for n, b in buffers),
+            loop.x,
+            *(JLTarget.name(n).assign(Intrinsic.strtake(JLExpr.name(b))).x for n, b in buffers),
+        ]))
 
     def _extract_if(self, x: ast.If):
         ifs : list[tuple[ast.expr, list[ast.stmt]]]= []
         xs: list[ast.stmt] = [x]
-        while len(xs) == 1 and isinstance(xs[1], ast.If):
-            node = xs[1]
-            if isinstance(node, ast.If):
-                xs = node.orelse
-                ifs.append((node.test, node.body))
-        return ifs, xs            
+        while len(xs) == 1 and isinstance(xs[0], ast.If):
+            node = xs[0]
+            xs = node.orelse
+            ifs.append((node.test, node.body))
+        return ifs, xs
 
     def transform_If(self, x: ast.If) -> JLStmt:
         ifs, xs = self._extract_if(x)
-        ifs = [(Intrinsic.bool(self.transform_expr(t)), self.transform_stmt_list(b)) for t, b in ifs]
+        ifs = [(self.condition(t), self.transform_stmt_list(b)) for t, b in ifs]
         xs = self.transform_stmt_list(xs)
         return JLStmt.if_else(*ifs, orelse=xs)
 
     def transform_With(self, x: ast.With) -> JLStmt:
-        raise NotImplementedError
+        raise self._unsupported(x)
     
     def transform_Match(self, x: ast.Match) -> JLStmt:
-        raise NotImplementedError
+        raise self._unsupported(x)
     
     def transform_AsyncWith(self, x: ast.AsyncWith) -> JLStmt:
-        raise NotImplementedError
+        raise self._unsupported(x)
 
     def transform_Raise(self, x: ast.Raise) -> JLStmt:
         if x.cause:
@@ -925,7 +2317,7 @@ class Compiler:
     def transform_Try(self, x: ast.Try) -> JLStmt:
         body = self.transform_stmt_list(x.body)
         if x.orelse:
-            raise NotImplementedError
+            raise self._unsupported(x)
         
         catch = None
         if x.handlers:
@@ -938,31 +2330,45 @@ class Compiler:
         return JLStmt.try_catch(body, catch, finalbody)
 
     def transform_Assert(self, x: ast.Assert) -> JLStmt:
-        raise NotImplementedError
+        raise self._unsupported(x)
     
     def transform_Import(self, x: ast.Import) -> JLStmt:
-        raise NotImplementedError
+        if all(a.name in _COMPILE_TIME_MODULES for a in x.names):
+            return JLStmt(self.pd.empty)
+        raise self._unsupported(x)
     
     def transform_ImportFrom(self, x: ast.ImportFrom) -> JLStmt:
-        raise NotImplementedError
+        if not x.level and x.module in _COMPILE_TIME_MODULES:
+            return JLStmt(self.pd.empty)
+        raise self._unsupported(x)
     
     def transform_Global(self, x: ast.Global) -> JLStmt:
-        return JLStmt(pd.vsep([arg.x for arg in JLStmt.declare_globals(*x.names)]))
+        return JLStmt(self.pd.vsep([arg.x for arg in JLStmt.declare_globals(*x.names)]))
     
     def transform_Nonlocal(self, x: ast.Nonlocal) -> JLStmt:
-        return JLStmt(pd.empty)
+        return JLStmt(self.pd.empty)
     
     def transform_Expr(self, x: ast.Expr) -> JLStmt:
+        if self.generator and isinstance(x.value, (ast.Yield, ast.YieldFrom)):
+            return self.resumable_yield(x.value)
         return self.transform_expr(x.value).to_stmt()
     
     def transform_Pass(self, x: ast.Pass) -> JLStmt:
-        return JLStmt(pd.empty)
+        return JLStmt(self.pd.empty)
     
     def transform_Break(self, x: ast.Break) -> JLStmt:
-        return JLStmt(pd.seg("break"))
+        return JLStmt(self.pd.seg("break"))
     
     def transform_Continue(self, x: ast.Continue) -> JLStmt:
-        return JLStmt(pd.seg("continue"))
+        return JLStmt(self.pd.seg("continue"))
     
     def transform_Return(self, x: ast.Return) -> JLStmt:
+        if self.generator:
+            if x.value is None:
+                return self.finish_generator()
+            # the value would only be seen through `StopIteration`
+            return JLStmt(self.pd.vsep([self.transform_expr(x.value).to_stmt().x, self.finish_generator().x]))
         return JLStmt.ret(self.transform_expr_or_none(x.value))
+
+
+Compiler._dispatch = Compiler._build_dispatch()
@@ -1,14 +1,62 @@
 from wisepy2 import wise
-from Py2Jl import Compiler
+from Py2Jl.project import transpile_file, transpile_project
+from Py2Jl.cache import Cache, DEFAULT_MAX_SIZE
+from Py2Jl.profiling import NodeProfile
+from Py2Jl.vectorize import VectorReport
+import os
 import sys
 
-def py2jl(filename: str, out: str):
-    with open(filename, 'r', encoding='utf-8') as f:
-        code = f.read()
-    with open(out, 'w', encoding='utf-8') as f:
-        f.write("using Py2JlRuntime\n")
-        doc = Compiler(code, out).create_module()
-        doc.render(f.write)  # type: ignore
+def py2jl(
+        *paths: str, jobs: int = 0,
+        no_cache: bool = False, clear_cache: bool = False,
+        cache_dir: str = '', cache_size: int = DEFAULT_MAX_SIZE // (1024 * 1024),
+        backend: str = 'pretty_doc', profile: bool = False, compact: bool = False,
+        no_fold: bool = False, typed: bool = False, views: bool = False,
+        check_bounds: bool = False, vector_report: bool = False):
+    """
+    py2jl input.py output.jl, or py2jl input_dir output_dir to transpile a whole directory/package.
+    `--jobs` sets the number of worker processes in project mode (default: cpu count).
+    transpiled files are cached on disk (`--cache_dir`, `--cache_size` in MiB);
+    `--no_cache` bypasses the cache and `--clear_cache` empties it first.
+    `--backend text` emits through the string builder instead of pretty_doc (same output, faster).
+    `--profile` reports call counts and time per AST node type.
+    `--no_fold` disables constant folding (see Py2Jl.fold).
+    `--compact` emits smaller code and moves the line comments to a `.jl.map` sidecar.
+    `--typed` turns the type annotations of functions into Julia types (see Py2Jl.jltypes).
+    `--views` reads every slice as a view, for programs that change no list while a slice of it is in use.
+    `--vector_report` lists the loops vectorized as `@simd` loops and why the others were not.
+    `--check_bounds` keeps the bounds checks of indexing proven in bounds (see Py2Jl.bounds).
+    """
+    node_profile = NodeProfile() if profile else None
+    loops = VectorReport() if vector_report else None
+    options = dict(backend=backend, compact=compact, fold_constants=not no_fold, typed_annotations=typed, readonly_slices=views, check_bounds=check_bounds)
+    cache = Cache(cache_dir or None, cache_size * 1024 * 1024)
+    if clear_cache:
+        print(f"removed {cache.clear()} cache entries from {cache.directory}", file=sys.stderr)
+        if not paths:
+            return
+    if no_cache:
+        cache = None
+    if len(paths) != 2:
+        sys.exit("usage: python -m Py2Jl input output")
+    filename, out = paths
+    if os.path.isdir(filename) or not os.path.exists(filename):
+        try:
+            failed = transpile_project(
+                filename, out, jobs=jobs, cache=cache, options=options, profile=node_profile, vector_report=loops)
+        except FileNotFoundError as e:
+            sys.exit(f"py2jl: {e}")
+    else:
+        failed = 0
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        transpile_file(filename, out, cache, options, node_profile, loops)
+        if cache is not None:
+            cache.evict()
+    if node_profile is not None:
+        print(node_profile.report(), file=sys.stderr)
+    if loops is not None:
+        print(loops.report(), file=sys.stderr)
+    sys.exit(1 if failed else 0)
     
 if __name__ == '__main__':
-    wise(py2jl)()  # type: ignore
\ No newline at end of file
+    wise(py2jl)()  # type: ignore
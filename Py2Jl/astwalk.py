@@ -0,0 +1,116 @@
+"""
+Walks over the nodes of a scope, shared by the analyses.
+
+The body of a function is evaluated in its own scope, apart from the bodies
+of the functions, lambdas, classes and comprehensions nested in it, of which
+it only evaluates the defaults, decorators, bases and first iterables.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['scope_nodes', 'bound_names', 'stores', 'all_stores', 'is_read']
+
+Store = typing.Tuple[ast.AST, typing.Optional[ast.AST]]
+
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# builtins that read their arguments without keeping them
+_READERS = frozenset({
+    'len', 'sum', 'min', 'max', 'any', 'all', 'sorted',
+    'list', 'tuple', 'set', 'frozenset', 'str', 'repr',
+})
+
+
+def scope_nodes(body: list[ast.stmt]) -> typing.Iterator[Store]:
+    """
+    the nodes evaluated in the scope of a function body, with their parents.
+    """
+    stack: list[Store] = [(x, None) for x in reversed(body)]
+    while stack:
+        x, parent = stack.pop()
+        yield x, parent
+        if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            children: list[ast.AST] = [
+                *x.args.defaults, *filter(None, x.args.kw_defaults), *getattr(x, 'decorator_list', ())]
+        elif isinstance(x, ast.ClassDef):
+            children = [*x.bases, *(k.value for k in x.keywords), *x.decorator_list]
+        elif isinstance(x, _COMPREHENSIONS):
+            children = [x.generators[0].iter]
+        else:
+            children = list(ast.iter_child_nodes(x))
+        stack.extend((c, x) for c in reversed(children))
+
+
+def bound_names(x: ast.AST) -> typing.Iterator[str]:
+    """
+    the names `x` binds other than by a `Name` target.
+    """
+    if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        yield x.name
+    elif isinstance(x, (ast.Import, ast.ImportFrom)):
+        yield from ((a.asname or a.name).split('.')[0] for a in x.names)
+    elif isinstance(x, ast.ExceptHandler) and x.name:
+        yield x.name
+    elif type(x).__name__ in ('MatchAs', 'MatchStar', 'MatchMapping'):
+        name = getattr(x, 'name', None) or getattr(x, 'rest', None)
+        if name:
+            yield name
+
+
+def _bindings(node: ast.AST) -> typing.Iterator[tuple[str, ast.AST, ast.AST | None]]:
+    body = node.body if isinstance(node.body, list) else [node.body]  # type: ignore
+    if isinstance(node, _COMPREHENSIONS):
+        # a `:=` in a comprehension
+        nodes: typing.Iterable[Store] = ((n, p) for p in ast.walk(node) for n in ast.iter_child_nodes(p))
+    else:
+        nodes = scope_nodes(body)
+    for x, parent in nodes:
+        if isinstance(x, ast.Name):
+            if not isinstance(x.ctx, ast.Load):
+                yield x.id, x, parent
+        else:
+            for name in bound_names(x):
+                yield name, x, None
+
+
+def stores(node: ast.AST, name: str) -> typing.Iterator[Store]:
+    """
+    the bindings of `name` in the scope of `node`, a `Name` target with its parent or another binding node.
+    """
+    return ((x, parent) for n, x, parent in _bindings(node) if n == name)
+
+
+def all_stores(node: ast.AST) -> dict[str, list[Store]]:
+    """
+    the bindings of every name in the scope of `node`, as `stores` gives them, in one walk.
+    """
+    result: dict[str, list[Store]] = {}
+    for name, x, parent in _bindings(node):
+        result.setdefault(name, []).append((x, parent))
+    return result
+
+
+def is_read(x: ast.expr, parent: ast.AST | None, is_builtin: typing.Callable[[str], bool]) -> bool:
+    """
+    whether `parent` only reads `x` while it evaluates.
+    """
+    if isinstance(parent, ast.Subscript):
+        return parent.value is x and isinstance(parent.ctx, ast.Load)
+    if isinstance(parent, ast.For):
+        return parent.iter is x
+    if isinstance(parent, (ast.ListComp, ast.SetComp, ast.DictComp)):
+        # the first iterable, which is evaluated before the comprehension runs
+        return True
+    if isinstance(parent, ast.Compare):
+        return True
+    if isinstance(parent, (ast.If, ast.While, ast.IfExp, ast.Assert)):
+        return parent.test is x
+    if isinstance(parent, ast.UnaryOp):
+        return isinstance(parent.op, ast.Not)
+    if isinstance(parent, ast.Call):
+        f = parent.func
+        return (
+            isinstance(f, ast.Name) and f.id in _READERS and is_builtin(f.id)
+            and any(arg is x for arg in parent.args))
+    return False
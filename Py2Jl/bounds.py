@@ -0,0 +1,152 @@
+"""
+Indexing that loop ranges prove to be in bounds.
+
+In a function, `for i in range(a, len(xs) - b, step)` with constant
+`0 <= a`, `b` and `step > 0` only visits `a <= i < len(xs) - b`, so
+`xs[i + c]` is in bounds whenever `a + c >= 0` and `c <= b`, as long as
+nothing in the loop changes the length of `xs` or the values of `xs` and `i`.
+The loop must then:
+
+- bind neither `xs` nor `i`, which are non-cell locals or parameters;
+- use `xs` only for indexing with an integer, reading or assigning an item;
+- call no functions other than the builtins in `_PURE`, which could change
+  `xs` through another reference;
+- not yield, since whoever resumes a generator can change `xs` in between.
+
+Stores are proven only as the target of a single-target assignment or an
+augmented assignment.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.astwalk import scope_nodes
+
+__all__ = ['find_inbounds']
+
+# builtins that change no list
+_PURE = frozenset({
+    'len', 'range', 'abs', 'min', 'max', 'int', 'float', 'bool',
+    'round', 'divmod', 'pow', 'sum', 'any', 'all',
+})
+
+
+def _int(x: ast.expr) -> int | None:
+    if isinstance(x, ast.Constant) and type(x.value) is int:
+        return x.value
+    if isinstance(x, ast.UnaryOp) and isinstance(x.op, ast.USub):
+        v = _int(x.operand)
+        return None if v is None else -v
+    return None
+
+
+def _offset(x: ast.expr, name: str) -> int | None:
+    """
+    `c` when `x` is `name + c` (`name`, `name - c`, `c + name`).
+    """
+    if isinstance(x, ast.Name):
+        return 0 if x.id == name else None
+    if not (isinstance(x, ast.BinOp) and isinstance(x.op, (ast.Add, ast.Sub))):
+        return None
+    if isinstance(x.left, ast.Name) and x.left.id == name:
+        c = _int(x.right)
+        if c is not None:
+            return c if isinstance(x.op, ast.Add) else -c
+    elif isinstance(x.right, ast.Name) and x.right.id == name and isinstance(x.op, ast.Add):
+        return _int(x.left)
+    return None
+
+
+class _Range:
+    def __init__(self, var: str, seq: str, start: int, end: int):
+        # `var` runs over `start <= var < len(seq) - end`
+        self.var = var
+        self.seq = seq
+        self.start = start
+        self.end = end
+
+
+def _len_of(x: ast.expr, is_builtin: typing.Callable[[str], bool]) -> str | None:
+    if (isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id == 'len'
+            and len(x.args) == 1 and not x.keywords and isinstance(x.args[0], ast.Name)
+            and is_builtin('len')):
+        return x.args[0].id
+    return None
+
+
+def _loop_range(loop: ast.For, is_builtin: typing.Callable[[str], bool]) -> _Range | None:
+    it = loop.iter
+    if not (isinstance(loop.target, ast.Name) and isinstance(it, ast.Call)
+            and isinstance(it.func, ast.Name) and it.func.id == 'range' and is_builtin('range')
+            and 1 <= len(it.args) <= 3 and not it.keywords):
+        return None
+    args = it.args
+    start = 0 if len(args) == 1 else _int(args[0])
+    step = 1 if len(args) < 3 else _int(args[2])
+    if start is None or start < 0 or step is None or step <= 0:
+        return None
+    stop = args[0] if len(args) == 1 else args[1]
+    end = 0
+    if isinstance(stop, ast.BinOp) and isinstance(stop.op, ast.Sub):
+        end = _int(stop.right)  # type: ignore
+        stop = stop.left
+    seq = _len_of(stop, is_builtin)
+    if seq is None or end is None:
+        return None
+    return _Range(loop.target.id, seq, start, end)
+
+
+def _unchanged(loop: ast.For, r: _Range, is_builtin: typing.Callable[[str], bool]) -> bool:
+    """
+    whether the body of the loop keeps the length of `r.seq` and the values of `r.seq` and `r.var`.
+    """
+    for x, parent in scope_nodes(loop.body):
+        if isinstance(x, (ast.Yield, ast.YieldFrom, ast.Await, ast.Lambda,
+                          ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return False
+        if isinstance(x, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            # the rest of a comprehension may call functions, or read `xs` through a cell
+            return False
+        if isinstance(x, ast.Call):
+            f = x.func
+            if not (isinstance(f, ast.Name) and f.id in _PURE and is_builtin(f.id)):
+                return False
+        if isinstance(x, ast.Name):
+            if x.id == r.var and not isinstance(x.ctx, ast.Load):
+                return False
+            if x.id == r.seq:
+                if isinstance(x.ctx, ast.Load) and isinstance(parent, ast.Subscript) and parent.value is x:
+                    if isinstance(parent.slice, ast.Slice) and not isinstance(parent.ctx, ast.Load):
+                        return False
+                    if isinstance(parent.ctx, ast.Del):
+                        return False
+                elif not (isinstance(parent, ast.Call) and _len_of(parent, is_builtin) == r.seq):
+                    return False
+    return True
+
+
+def find_inbounds(
+        body: list[ast.stmt], names: typing.Iterable[str],
+        is_builtin: typing.Callable[[str], bool]) -> set[ast.Subscript]:
+    """
+    the subscripts in a function body that are in bounds.
+    `names` are the locals and parameters of the function that are not cells.
+    """
+    names = set(names)
+    result: set[ast.Subscript] = set()
+    for loop, _ in scope_nodes(body):
+        if not isinstance(loop, ast.For):
+            continue
+        r = _loop_range(loop, is_builtin)
+        if r is None or r.var not in names or r.seq not in names or not _unchanged(loop, r, is_builtin):
+            continue
+        for x, parent in scope_nodes(loop.body):
+            if not (isinstance(x, ast.Subscript) and isinstance(x.value, ast.Name) and x.value.id == r.seq):
+                continue
+            c = _offset(x.slice, r.var)
+            if c is None or r.start + c < 0 or c > r.end:
+                continue
+            if isinstance(x.ctx, ast.Load) or (
+                    isinstance(x.ctx, ast.Store)
+                    and (isinstance(parent, ast.AugAssign) or isinstance(parent, ast.Assign) and parent.targets == [x])):
+                result.add(x)
+    return result
@@ -0,0 +1,153 @@
+"""
+Content-addressed on-disk cache of transpiled Julia code.
+
+An entry is keyed on the source bytes, the filename embedded in the
+`# file, line N` comments and the version of Py2Jl, and holds the complete
+`.jl` text. Recency is tracked through file modification times, which gives
+an LRU order for eviction without any index file to keep consistent across
+worker processes.
+"""
+from __future__ import annotations
+import os
+import hashlib
+import tempfile
+import typing
+from pathlib import Path
+
+__all__ = ['Cache', 'default_cache_dir', 'DEFAULT_MAX_SIZE']
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# compiler options that cannot change the generated code
+OUTPUT_NEUTRAL_OPTIONS = {'backend'}
+
+_fingerprint: bytes | None = None
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'py2jl')
+
+
+def compiler_fingerprint() -> bytes:
+    """
+    the version string alone does not change between development commits,
+    so the sources of the package itself are hashed into the key as well.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        from Py2Jl import __version__
+        h = hashlib.sha256(__version__.encode())
+        for p in sorted(Path(__file__).parent.glob('*.py')):
+            h.update(p.read_bytes())
+        _fingerprint = h.digest()
+    return _fingerprint
+
+
+class Cache:
+    def __init__(self, directory: str | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    def key(self, source: bytes, filename: str, options: dict | None = None) -> str:
+        h = hashlib.sha256(compiler_fingerprint())
+        h.update(filename.encode('utf-8'))
+        h.update(b'\0')
+        if options:
+            h.update(repr(sorted(
+                (k, v) for k, v in options.items() if k not in OUTPUT_NEUTRAL_OPTIONS
+            )).encode('utf-8'))
+        h.update(b'\0')
+        h.update(source)
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.jl')
+
+    def load(self, key: str) -> str | None:
+        """
+        the cached text, or None on a miss.
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data.decode('utf-8')
+
+    def fetch(self, key: str, out: str) -> bool:
+        """
+        copy the cached entry to `out`; returns False on a miss.
+        """
+        text = self.load(key)
+        if text is None:
+            return False
+        with open(out, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        return True
+
+    def store(self, key: str, text: str):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # workers may store the same key concurrently, so write-then-rename
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(text.encode('utf-8'))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _entries(self) -> typing.Iterator[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith('.jl'):
+                        yield entry
+
+    def evict(self) -> int:
+        """
+        remove the least recently used entries until the cache fits in `max_size`.
+        returns the number of removed entries.
+        """
+        entries = []
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                # removed by another worker in the meantime
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total <= self.max_size:
+            return removed
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for entry in list(self._entries()):
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
@@ -0,0 +1,201 @@
+"""
+Variables captured by closures.
+
+Julia boxes a captured local unless it is assigned once, before the closure
+is made: every read and write then goes through a `Core.Box` of unknown
+type. For each cell variable of a function, a local that nested functions,
+lambdas or comprehensions refer to, the compiler picks
+
+- a `let` capture, when the variable is a parameter the function never
+  assigns, or a local assigned once, by a top-level statement before every
+  closure capturing it, and never by the closures: each closure is made in
+  `let x = x ... end`, which captures a binding that is never assigned again;
+- a typed `Ref`, when the first top-level statement mentioning the variable
+  assigns it, and all assignments, in the function or in closures through
+  `nonlocal`, store an `int`, a `float` or a `bool` of one type:
+  `x = Ref{Int}(0)` binds the `Ref` once, and the variable is read and
+  assigned through `x[]`;
+- nothing otherwise: Julia boxes the variable, and the compiler reports it
+  with a `BoxWarning`.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.astwalk import scope_nodes, bound_names, stores
+from Py2Jl.scope import Scope
+
+__all__ = ['BoxWarning', 'Captures', 'find_captures']
+
+_CLOSURES = (
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+class BoxWarning(UserWarning):
+    pass
+
+
+class Captures:
+    def __init__(self):
+        # closure -> the cells it captures with `let`
+        self.lets: dict[ast.AST, list[str]] = {}
+        # cell -> the type of its `Ref`
+        self.refs: dict[str, str] = {}
+        # the assignments binding the `Ref`s
+        self.inits: set[ast.Assign] = set()
+        # the cells Julia boxes
+        self.boxed: list[str] = []
+
+
+def _scalar(x: ast.expr, name: str, t: str | None) -> str | None:
+    """
+    the Julia type of `x` when it is an `int`, a `float` or a `bool` computed from
+    constants and `name`, which has type `t`.
+    """
+    if isinstance(x, ast.Constant):
+        v = x.value
+        return {bool: 'Bool', int: 'Int', float: 'Float64'}.get(type(v))
+    if isinstance(x, ast.Name):
+        return t if x.id == name else None
+    if isinstance(x, ast.UnaryOp) and isinstance(x.op, (ast.USub, ast.UAdd)):
+        o = _scalar(x.operand, name, t)
+        return None if o == 'Bool' else o
+    if isinstance(x, ast.BinOp):
+        return _binop(x.op, _scalar(x.left, name, t), _scalar(x.right, name, t))
+    return None
+
+
+def _binop(op: ast.operator, l: str | None, r: str | None) -> str | None:
+    if l is None or r is None or 'Bool' in (l, r):
+        return None
+    if isinstance(op, ast.Div):
+        return 'Float64'
+    if isinstance(op, (ast.Add, ast.Sub, ast.Mult)):
+        return 'Float64' if 'Float64' in (l, r) else 'Int'
+    if isinstance(op, (ast.FloorDiv, ast.Mod)) and l == r == 'Int':
+        return 'Int'
+    return None
+
+
+def _mentions(x: ast.AST, name: str) -> bool:
+    return any(isinstance(n, ast.Name) and n.id == name for n in ast.walk(x))
+
+
+def _referring(scope: Scope, name: str) -> typing.Iterator[Scope]:
+    """
+    the scopes nested in `scope` in which `name` is the variable of `scope`.
+    """
+    for child in scope.children:
+        sym = child.symbols.get(name)
+        if sym is None and child.kind == 'class':
+            # a class body does not bind the names its methods refer to
+            yield from _referring(child, name)
+        elif sym is not None and sym.is_free():
+            yield child
+            yield from _referring(child, name)
+
+
+def _in_class(scope: Scope, outer: Scope) -> bool:
+    while scope is not outer:
+        if scope.kind == 'class':
+            return True
+        scope = scope.parent  # type: ignore
+    return False
+
+
+def find_captures(node: ast.FunctionDef, scope: Scope, scopes: dict[ast.AST, Scope]) -> Captures:
+    """
+    how the cells of a function are captured; `scopes` indexes the scopes by their nodes.
+    """
+    result = Captures()
+    cells = scope.get_cells()
+    if not cells:
+        return result
+    # the closures made by each top-level statement, and the names each one binds
+    closures: list[list[ast.AST]] = []
+    binds: list[set[str]] = []
+    for stmt in node.body:
+        made, bound = [], set()
+        for x, _ in scope_nodes([stmt]):
+            if isinstance(x, _CLOSURES):
+                made.append(x)
+            if isinstance(x, ast.Name) and not isinstance(x.ctx, ast.Load):
+                bound.add(x.id)
+            else:
+                bound.update(bound_names(x))
+        closures.append(made)
+        binds.append(bound)
+
+    for name in cells:
+        sym = scope.lookup(name)
+        inner = list(_referring(scope, name))
+        # the closures made by the function that capture `name`, with the index of their statement
+        capturing = [
+            (i, c) for i, made in enumerate(closures) for c in made
+            if c in scopes and scopes[c] in inner]
+        by_class = any(_in_class(s, scope) for s in inner)
+        assigned_inside = any(s.lookup(name).is_assigned() for s in inner if name in s.symbols)
+        if not by_class and not assigned_inside:
+            if sym.is_parameter():
+                first = -1 if not any(name in b for b in binds) else None
+            else:
+                binders = [i for i, b in enumerate(binds) if name in b]
+                first = binders[0] if len(binders) == 1 and _single_store(node.body[binders[0]], name) else None
+            if first is not None and all(i > first for i, _ in capturing):
+                for _, c in capturing:
+                    result.lets.setdefault(c, []).append(name)
+                continue
+        if not by_class and not sym.is_parameter():
+            t = _ref_type(node, name, inner)
+            if t is not None:
+                result.refs[name] = t
+                result.inits.add(_first_mention(node, name))  # type: ignore
+                continue
+        result.boxed.append(name)
+    return result
+
+
+def _single_store(stmt: ast.stmt, name: str) -> bool:
+    """
+    whether `stmt` is `name = value`, the one binding of `name` in the statement.
+    """
+    return (
+        isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+        and isinstance(stmt.targets[0], ast.Name) and stmt.targets[0].id == name
+        and not any(
+            isinstance(x, ast.Name) and x.id == name and not isinstance(x.ctx, ast.Load)
+            for x, _ in scope_nodes([ast.Expr(stmt.value)])))
+
+
+def _first_mention(node: ast.FunctionDef, name: str) -> ast.stmt | None:
+    for stmt in node.body:
+        if _mentions(stmt, name):
+            return stmt
+    return None
+
+
+def _ref_type(node: ast.FunctionDef, name: str, inner: list[Scope]) -> str | None:
+    first = _first_mention(node, name)
+    if not (isinstance(first, ast.Assign) and len(first.targets) == 1
+            and isinstance(first.targets[0], ast.Name) and first.targets[0].id == name
+            and not _mentions(first.value, name)):
+        return None
+    t = _scalar(first.value, name, None)
+    if t is None:
+        return None
+    owners = [node, *(s.node for s in inner if s.lookup(name).is_assigned())]
+    for owner in owners:
+        for x, parent in stores(owner, name):
+            if not isinstance(x, ast.Name) or isinstance(x.ctx, ast.Del):
+                return None
+            if isinstance(parent, ast.Assign) and parent.targets == [x]:
+                stored = _scalar(parent.value, name, t)
+            elif isinstance(parent, ast.AugAssign):
+                stored = _binop(parent.op, t, _scalar(parent.value, name, t))
+            elif isinstance(parent, ast.NamedExpr):
+                stored = _scalar(parent.value, name, t)
+            else:
+                stored = None
+            if stored != t:
+                return None
+    return t
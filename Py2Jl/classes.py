@@ -0,0 +1,249 @@
+"""
+Classes as Julia structs.
+
+A class of the module body with a fixed set of attributes is compiled to a
+concrete Julia `struct`: a `@dataclass`, whose fields are its annotated
+attributes, a class with `__slots__`, or a class annotating its attributes
+in its body. Its fields are typed with their annotations (see
+`Py2Jl.jltypes`; the struct itself and the structs before it are types
+too), and are `Any` without one. It is a `mutable struct` unless it is a frozen
+dataclass.
+
+The body of such a class may only hold a docstring, `pass`, the
+annotations, `__slots__` and methods without decorators; a dataclass field
+defaults to a constant or `field(default=...)`/`field(default_factory=...)`.
+A class is left dynamic when it has bases or a metaclass, is a base, when a method
+assigns an attribute of `self` other than a field, reads an attribute of
+`self` that is neither a field nor a method, or when a frozen dataclass
+defines `__init__`.
+
+Methods become methods of one Julia function per method name, dispatching
+on the type of `self`, so `p.norm()` is `var".norm"(p)` and resolves
+statically when the type of `p` is known. Dynamic classes are `PyClass`
+objects of the runtime, whose instances keep their attributes in a dict.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.astwalk import all_stores
+from Py2Jl.scope import Scope
+
+__all__ = [
+    'ClassLayout', 'class_layout', 'find_structs', 'method_params', 'imported_names',
+    'is_dataclass', 'is_classvar', 'field_default']
+
+# the keywords of `@dataclass` that structs support
+_DATACLASS_OPTIONS = frozenset({'frozen', 'eq', 'repr', 'slots'})
+# `default_factory`s making empty containers -> their displays
+_DISPLAYS: dict[str, typing.Callable[[], ast.expr]] = {
+    'list': lambda: ast.List([], ast.Load()),
+    'dict': lambda: ast.Dict([], []),
+    'set': lambda: ast.Set([]),
+}
+
+
+class ClassLayout:
+    def __init__(self, node: ast.ClassDef, dataclass: bool):
+        self.node = node
+        self.name = node.name
+        self.dataclass = dataclass
+        self.frozen = False
+        self.eq = dataclass
+        self.repr = dataclass
+        # field -> its annotation, or None
+        self.fields: dict[str, ast.expr | None] = {}
+        # dataclass field -> the expression of its default, called for a `default_factory`
+        self.defaults: dict[str, ast.expr] = {}
+        self.methods: list[ast.FunctionDef] = []
+
+    @property
+    def mutable(self) -> bool:
+        return not self.frozen
+
+    def method(self, name: str) -> ast.FunctionDef | None:
+        for m in self.methods:
+            if m.name == name:
+                return m
+        return None
+
+
+def method_params(x: ast.FunctionDef) -> list[ast.arg]:
+    """
+    the positional parameters of a method: `self` may be an ordinary parameter.
+    """
+    if not x.args.posonlyargs and x.args.args:
+        return x.args.args[:1]
+    return x.args.posonlyargs
+
+
+def is_dataclass(x: ast.expr, imported: typing.Mapping[str, str]) -> bool:
+    if isinstance(x, ast.Call):
+        x = x.func
+    if isinstance(x, ast.Name):
+        return imported.get(x.id) == 'dataclasses.dataclass'
+    return (isinstance(x, ast.Attribute) and x.attr == 'dataclass' and isinstance(x.value, ast.Name)
+            and imported.get(x.value.id) == 'dataclasses')
+
+
+def _is_field(x: ast.expr, imported: typing.Mapping[str, str]) -> bool:
+    f = x.func if isinstance(x, ast.Call) else None
+    if isinstance(f, ast.Name):
+        return imported.get(f.id) == 'dataclasses.field'
+    return (isinstance(f, ast.Attribute) and f.attr == 'field' and isinstance(f.value, ast.Name)
+            and imported.get(f.value.id) == 'dataclasses')
+
+
+def is_classvar(annotation: ast.expr) -> bool:
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    name = annotation.attr if isinstance(annotation, ast.Attribute) else getattr(annotation, 'id', None)
+    return name in ('ClassVar', 'InitVar')
+
+
+def field_default(x: ast.expr, imported: typing.Mapping[str, str]) -> ast.expr | None:
+    """
+    the default of a dataclass field, or None if a struct cannot have it.
+    """
+    if isinstance(x, ast.Constant):
+        return x
+    if not (_is_field(x, imported) and isinstance(x, ast.Call) and not x.args):
+        return None
+    kw = {k.arg: k.value for k in x.keywords}
+    if set(kw) == {'default'} and isinstance(kw['default'], ast.Constant):
+        return kw['default']
+    if set(kw) == {'default_factory'}:
+        factory = kw['default_factory']
+        if isinstance(factory, ast.Name) and factory.id in _DISPLAYS and factory.id not in imported:
+            return _DISPLAYS[factory.id]()
+        return ast.Call(factory, [], [])
+    return None
+
+
+def class_layout(x: ast.ClassDef, imported: typing.Mapping[str, str]) -> ClassLayout | None:
+    """
+    the struct a class of the module body is compiled to, or None if it stays dynamic.
+    `imported` maps the names the module imports to what they refer to (`dataclasses.dataclass`).
+    """
+    if x.bases or x.keywords or len(x.decorator_list) > 1:
+        return None
+    dataclass = False
+    layout = ClassLayout(x, False)
+    if x.decorator_list:
+        decorator = x.decorator_list[0]
+        if not is_dataclass(decorator, imported):
+            return None
+        dataclass = True
+        layout = ClassLayout(x, True)
+        for k in getattr(decorator, 'keywords', ()):
+            if k.arg not in _DATACLASS_OPTIONS or not isinstance(k.value, ast.Constant):
+                return None
+            if k.arg in ('frozen', 'eq', 'repr'):
+                setattr(layout, k.arg, bool(k.value.value))
+        if getattr(decorator, 'args', None):
+            return None
+
+    slots: list[str] | None = None
+    for stmt in x.body:
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant) and isinstance(stmt.value.value, str):
+            continue
+        if isinstance(stmt, ast.Pass):
+            continue
+        if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            if is_classvar(stmt.annotation):
+                return None
+            name = stmt.target.id
+            layout.fields[name] = stmt.annotation
+            if stmt.value is not None:
+                if not dataclass:
+                    return None
+                default = field_default(stmt.value, imported)
+                if default is None:
+                    return None
+                layout.defaults[name] = default
+            elif layout.defaults and dataclass:
+                # a field without a default after one with a default
+                return None
+            continue
+        if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)
+                and stmt.targets[0].id == '__slots__' and slots is None):
+            value = stmt.value
+            elts = value.elts if isinstance(value, (ast.Tuple, ast.List)) else [value]
+            if not all(isinstance(e, ast.Constant) and isinstance(e.value, str) for e in elts):
+                return None
+            slots = [e.value for e in elts]  # type: ignore
+            continue
+        if isinstance(stmt, ast.FunctionDef) and not stmt.decorator_list:
+            params = method_params(stmt)
+            if not params or len(stmt.args.posonlyargs) + len(stmt.args.args) > len(params):
+                return None
+            layout.methods.append(stmt)
+            continue
+        return None
+
+    if slots is not None and not dataclass:
+        annotations = layout.fields
+        if any(name not in slots for name in annotations):
+            return None
+        layout.fields = {name: annotations.get(name) for name in slots}
+    elif not dataclass and not layout.fields:
+        return None
+    if layout.frozen and layout.method('__init__'):
+        return None
+
+    methods = {m.name for m in layout.methods}
+    if methods & set(layout.fields):
+        return None
+    for m in layout.methods:
+        self_name = method_params(m)[0].arg
+        called = {n.func for n in ast.walk(m) if isinstance(n, ast.Call)}
+        for node in ast.walk(m):
+            if isinstance(node, ast.Name) and node.id == 'super':
+                return None
+            if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                    and node.value.id == self_name):
+                continue
+            if node.attr in layout.fields or node.attr in methods and node in called:
+                continue
+            return None
+    return layout
+
+
+def imported_names(module: ast.Module) -> dict[str, str]:
+    """
+    the names the module body imports -> the qualified names they refer to.
+    """
+    result: dict[str, str] = {}
+    for stmt in module.body:
+        if isinstance(stmt, ast.Import):
+            for a in stmt.names:
+                if a.asname:
+                    result[a.asname] = a.name
+                else:
+                    result[a.name.split('.')[0]] = a.name.split('.')[0]
+        elif isinstance(stmt, ast.ImportFrom) and stmt.module and not stmt.level:
+            for a in stmt.names:
+                result[a.asname or a.name] = f"{stmt.module}.{a.name}"
+    return result
+
+
+def find_structs(module: ast.Module, scopes: dict[ast.AST, Scope]) -> dict[ast.ClassDef, ClassLayout]:
+    """
+    the classes of the module body compiled to structs: a struct is a constant,
+    so the module must bind its name once, by the class.
+    """
+    imported = imported_names(module)
+    # a base of a `PyClass` is one too
+    bases = {b.id for x in ast.walk(module) if isinstance(x, ast.ClassDef) for b in x.bases if isinstance(b, ast.Name)}
+    declared = {
+        name for scope in scopes.values()
+        for name, sym in scope.symbols.items() if scope.kind != 'module' and sym.is_declared_global()}
+    stores = all_stores(module)
+    result: dict[ast.ClassDef, ClassLayout] = {}
+    for x in module.body:
+        if (not isinstance(x, ast.ClassDef) or x.name in declared or x.name in bases
+                or len(stores[x.name]) != 1):
+            continue
+        layout = class_layout(x, imported)
+        if layout is not None:
+            result[x] = layout
+    return result
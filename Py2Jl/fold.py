@@ -0,0 +1,180 @@
+"""
+Constant folding on the Python AST, run before scope analysis and emission.
+
+Operators applied to constants are evaluated with Python's own semantics.
+A result is only kept when it is a constant the compiler can emit and stays
+within the limits below (close to CPython's AST optimizer), so folding never
+turns a small expression into a huge literal, and integers stay within the
+`Int64` arithmetic the generated code uses at run time.
+"""
+from __future__ import annotations
+import ast
+import math
+import operator
+import typing
+
+__all__ = ['ConstantFolder', 'fold_constants']
+
+MAX_STR_SIZE = 4096
+# -2 ** 63 itself has no Julia literal: `-9223372036854775808` negates an Int128
+INT_MIN, INT_MAX = -2 ** 63 + 1, 2 ** 63 - 1
+
+_binops: dict[type, typing.Callable[[typing.Any, typing.Any], typing.Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+    ast.BitAnd: operator.and_,
+}
+
+_unaryops: dict[type, typing.Callable[[typing.Any], typing.Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Invert: operator.invert,
+    ast.Not: operator.not_,
+}
+
+# `is` and `is not` depend on object identity, which constants do not promise
+_cmpops: dict[type, typing.Callable[[typing.Any, typing.Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_operand_types = (bool, int, float, str, bytes)
+
+
+def _is_const(x: ast.expr) -> bool:
+    return isinstance(x, ast.Constant) and (x.value is None or type(x.value) in _operand_types)
+
+
+def _is_operand(x: ast.expr) -> bool:
+    return isinstance(x, ast.Constant) and type(x.value) in _operand_types
+
+
+def _safe_power(a, b):
+    # bound the work done by `**` before doing it
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and (abs(a).bit_length() - 1) * b > 64:
+        raise OverflowError
+    return a ** b
+
+
+def _safe_lshift(a, b):
+    if isinstance(a, int) and isinstance(b, int) and b > 64:
+        raise OverflowError
+    return a << b
+
+
+def _safe_mult(a, b):
+    for seq, n in ((a, b), (b, a)):
+        if isinstance(seq, (str, bytes)) and isinstance(n, int) and len(seq) * n > MAX_STR_SIZE:
+            raise OverflowError
+    return a * b
+
+
+_binops[ast.Pow] = _safe_power
+_binops[ast.LShift] = _safe_lshift
+_binops[ast.Mult] = _safe_mult
+
+
+def _emittable(v) -> bool:
+    if isinstance(v, bool):
+        return True
+    if isinstance(v, int):
+        return INT_MIN <= v <= INT_MAX
+    if isinstance(v, float):
+        return math.isfinite(v)
+    if isinstance(v, (str, bytes)):
+        return len(v) <= MAX_STR_SIZE
+    return False
+
+
+class ConstantFolder(ast.NodeTransformer):
+    """
+    folds unary, binary and comparison operators on constants,
+    and the constant operands of `and`/`or`.
+    """
+
+    def _constant(self, value, node: ast.expr) -> ast.expr:
+        if not _emittable(value):
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        self.generic_visit(node)
+        if not _is_operand(node.operand):
+            return node
+        try:
+            value = _unaryops[type(node.op)](node.operand.value)  # type: ignore
+        except Exception:
+            return node
+        return self._constant(value, node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+        if not (_is_operand(node.left) and _is_operand(node.right)):
+            return node
+        f = _binops.get(type(node.op))
+        if f is None:
+            return node
+        try:
+            value = f(node.left.value, node.right.value)  # type: ignore
+        except Exception:
+            return node
+        return self._constant(value, node)
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        if not all(map(_is_const, operands)):
+            return node
+        try:
+            value = True
+            for op, l, r in zip(node.ops, operands, operands[1:]):
+                value = _cmpops[type(op)](l.value, r.value)  # type: ignore
+                if not value:
+                    break
+        except Exception:
+            return node
+        return self._constant(value, node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        self.generic_visit(node)
+        # `a and b` is `a` if `a` is falsy, else `b`; `or` is the other way around
+        stop_on = not isinstance(node.op, ast.And)
+        values: list[ast.expr] = []
+        for i, x in enumerate(node.values):
+            last = i == len(node.values) - 1
+            if not _is_const(x):
+                values.append(x)
+                continue
+            if bool(x.value) is stop_on:  # type: ignore
+                if not values:
+                    return x
+                values.append(x)
+                break
+            if last:
+                values.append(x)
+        if len(values) == 1:
+            return values[0]
+        node.values = values
+        return node
+
+
+def fold_constants(module: ast.Module) -> ast.Module:
+    """
+    fold `module` in place.
+    """
+    return ConstantFolder().visit(module)
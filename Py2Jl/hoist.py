@@ -0,0 +1,108 @@
+"""
+Constant displays built once.
+
+A display in a function is built again each time the function evaluates it,
+so a lookup table in a hot function allocates on every call. A display whose
+elements are constants, or tuples of constants, is hoisted to a module-level
+`const` built once when nothing can change it:
+
+- a tuple, other than the index of a subscript or the value unpacked by
+  `a, b = 1, 2`;
+- `frozenset(...)` of such a display;
+- a `list`, `set` or `dict` display only read where it is made (iterated,
+  indexed, compared, ... as in `Py2Jl.views`), or assigned to a local, other
+  than a cell, that the function only reads and assigns nothing but such
+  displays.
+
+A display is hoisted as a whole, with the tuples it holds. `bytes` constants
+need no hoisting: they are `b"..."` literals, which Julia builds once.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.astwalk import scope_nodes, is_read
+
+__all__ = ['find_hoisted']
+
+_DISPLAYS = (ast.List, ast.Set, ast.Dict)
+
+
+def _is_constant(x: ast.expr | None) -> bool:
+    if isinstance(x, ast.Constant):
+        return True
+    return isinstance(x, ast.Tuple) and isinstance(x.ctx, ast.Load) and all(map(_is_constant, x.elts))
+
+
+def _is_constant_display(x: ast.AST | None) -> bool:
+    """
+    whether `x` is a non-empty `list`, `set` or `dict` display of constants.
+    """
+    if isinstance(x, ast.Dict):
+        return bool(x.keys) and all(map(_is_constant, x.keys)) and all(map(_is_constant, x.values))
+    if isinstance(x, (ast.List, ast.Set)):
+        return (
+            bool(x.elts) and not isinstance(getattr(x, 'ctx', None), ast.Store)
+            and all(map(_is_constant, x.elts)))
+    return False
+
+
+def _is_frozenset(x: ast.AST, is_builtin: typing.Callable[[str], bool]) -> bool:
+    return (
+        isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id == 'frozenset'
+        and is_builtin('frozenset') and len(x.args) == 1 and not x.keywords
+        and (_is_constant_display(x.args[0]) and not isinstance(x.args[0], ast.Dict)
+             or isinstance(x.args[0], ast.Tuple) and _is_constant(x.args[0])))
+
+
+def _is_hoisted_tuple(x: ast.AST, parent: ast.AST | None) -> bool:
+    if not (isinstance(x, ast.Tuple) and x.elts and _is_constant(x)):
+        return False
+    if isinstance(parent, (ast.Tuple, *_DISPLAYS)):
+        # hoisted with the display holding it, if any
+        return False
+    if isinstance(parent, ast.Subscript):
+        return parent.slice is not x
+    if isinstance(parent, ast.Assign):
+        return not any(isinstance(t, (ast.Tuple, ast.List)) for t in parent.targets)
+    return True
+
+
+def find_hoisted(
+        body: list[ast.stmt], locals: typing.Iterable[str],
+        is_builtin: typing.Callable[[str], bool]) -> set[ast.expr]:
+    """
+    the displays and `frozenset(...)` calls of a function body built once, as module-level constants.
+    `locals` are the locals of the function that are neither parameters nor cells.
+    """
+    nodes = list(scope_nodes(body))
+    names = set(locals)
+    # the locals that only hold constant displays and are only read
+    holders = set(names)
+    for x, parent in nodes:
+        if isinstance(x, ast.Name) and x.id in names:
+            if isinstance(x.ctx, ast.Load):
+                if not is_read(x, parent, is_builtin):
+                    holders.discard(x.id)
+            elif not (isinstance(parent, ast.Assign) and parent.targets == [x]
+                      and _is_constant_display(parent.value)):
+                holders.discard(x.id)
+        elif isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            holders.discard(x.name)
+        elif isinstance(x, (ast.Import, ast.ImportFrom)):
+            holders.difference_update((a.asname or a.name).split('.')[0] for a in x.names)
+        elif isinstance(x, ast.ExceptHandler) and x.name:
+            holders.discard(x.name)
+
+    hoisted: set[ast.expr] = set()
+    # parents come before their children
+    for x, parent in nodes:
+        if parent in hoisted:
+            continue
+        if _is_frozenset(x, is_builtin) or _is_hoisted_tuple(x, parent):
+            hoisted.add(x)  # type: ignore
+        elif _is_constant_display(x) and (
+                is_read(x, parent, is_builtin)  # type: ignore
+                or isinstance(parent, ast.Assign) and parent.value is x
+                and isinstance(parent.targets[0], ast.Name) and parent.targets[0].id in holders):
+            hoisted.add(x)  # type: ignore
+    return hoisted
@@ -0,0 +1,651 @@
+"""
+Flow-sensitive inference of scalar types in function bodies.
+
+Types are the Julia names of the scalar types Python's `bool`, `int` and
+`float` are lowered to, or None when nothing is known. Each expression of a
+function body is annotated with the type of its value at that point of the
+control flow, and each local with the join of everything assigned to it,
+which is the type of its `local` declaration.
+
+Only locals of the function itself are tracked: cell variables may be
+assigned by nested functions, and globals by anyone. The fields of a local
+declared with a struct type (see `Py2Jl.classes`) have the types of the
+struct.
+
+The element types of `list`, `set` and `dict` displays are inferred from
+their elements and, for a local that only ever holds displays, from what the
+function puts into it (`append`, `add`, item assignment, ...). Such a local is
+left untyped if it is used in any way that could add elements out of sight,
+such as passing it to a function or aliasing it; returning it is allowed, so
+the caller gets a container of the element type the function filled it with.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.scope import Scope
+from Py2Jl.astwalk import scope_nodes
+
+__all__ = ['BOOL', 'INT', 'FLOAT', 'NUMERIC', 'STR', 'FunctionTypes', 'infer_function', 'container_kind']
+
+BOOL = 'Bool'
+INT = 'Int'
+FLOAT = 'Float64'
+NUMERIC = (BOOL, INT, FLOAT)
+# element types only: strings are not tracked as locals
+STR = 'String'
+
+Type = typing.Optional[str]
+# a variable missing from an environment is unbound there;
+# an environment of None is unreachable
+Env = typing.Optional[typing.Dict[str, Type]]
+
+_ARITH = (ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod)
+_BITWISE = (ast.BitAnd, ast.BitOr, ast.BitXor)
+_SHIFT = (ast.LShift, ast.RShift)
+_ORDER = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_ALWAYS_BOOL = (ast.Is, ast.IsNot, ast.In, ast.NotIn)
+
+
+def join(a: Type, b: Type) -> Type:
+    return a if a == b else None
+
+
+def join_envs(envs: typing.Iterable[Env]) -> Env:
+    result: Env = None
+    for env in envs:
+        if env is None:
+            continue
+        if result is None:
+            result = dict(env)
+            continue
+        for k, t in env.items():
+            result[k] = join(result[k], t) if k in result else t
+    return result
+
+
+def binop_type(op: ast.operator, l: Type, r: Type, right: ast.expr | None = None) -> Type:
+    if l not in NUMERIC or r not in NUMERIC:
+        return None
+    if FLOAT in (l, r):
+        if isinstance(op, (*_ARITH, ast.Div)):
+            return FLOAT
+        # a negative base to a fractional power is a complex number
+        if isinstance(op, ast.Pow) and r != FLOAT:
+            return FLOAT
+        return None
+    if isinstance(op, _BITWISE):
+        return BOOL if l == r == BOOL else INT
+    if isinstance(op, (*_ARITH, *_SHIFT)):
+        return INT
+    if isinstance(op, ast.Div):
+        return FLOAT
+    if isinstance(op, ast.Pow):
+        # only a non-negative exponent keeps the result an int
+        if isinstance(right, ast.Constant) and type(right.value) is int and right.value >= 0:
+            return INT
+    return None
+
+
+class FunctionTypes:
+    def __init__(self):
+        self.exprs: dict[ast.AST, str] = {}
+        self.locals: dict[str, str] = {}
+        # element types of displays: (element,) for lists and sets, (key, value) for dicts
+        self.elements: dict[ast.expr, tuple[str, ...]] = {}
+        # the list, set and dict comprehensions that keep the element types Julia infers for them
+        self.comprehensions: set[ast.expr] = set()
+
+
+class _Inference:
+    def __init__(
+            self, scope: Scope, is_builtin: typing.Callable[[str], bool], declared: dict[str, str],
+            fields: dict[str, dict[str, str]]):
+        self.is_builtin = is_builtin
+        # variables with a typed declaration hold a value of that type whatever is assigned
+        self.declared = declared
+        self.fields = fields
+        self.tracked = {
+            name for name in scope.get_locals()
+            if not scope.lookup(name).is_cell()
+        }
+        # expression types, None once an expression was seen with different types
+        self.exprs: dict[ast.AST, Type] = {}
+        self.assigned: dict[str, Type] = {}
+        # environments at `break`/`continue`, per enclosing loop
+        self.breaks: list[list[Env]] = []
+        self.continues: list[list[Env]] = []
+
+    def record(self, x: ast.AST, t: Type) -> Type:
+        self.exprs[x] = join(self.exprs[x], t) if x in self.exprs else t
+        return t
+
+    def bind(self, env: dict[str, Type], name: str, t: Type):
+        if name in self.tracked:
+            if name in self.declared:
+                t = self.declared[name] if self.declared[name] in NUMERIC else None
+            env[name] = t
+            self.assigned[name] = join(self.assigned[name], t) if name in self.assigned else t
+
+    def bind_target(self, env: dict[str, Type], target: ast.expr, t: Type):
+        if isinstance(target, ast.Name):
+            self.bind(env, target.id, t)
+            return
+        # unpacking, attributes and subscripts
+        for x in ast.walk(target):
+            if isinstance(x, ast.Name) and isinstance(x.ctx, ast.Store):
+                self.bind(env, x.id, None)
+            elif isinstance(x, ast.expr) and x is not target:
+                self.expr(env, x)
+
+    def widen(self, env: dict[str, Type], node: ast.AST):
+        """
+        forget the type of every variable `node` may assign.
+        """
+        for x in ast.walk(node):
+            if isinstance(x, ast.Name) and isinstance(x.ctx, (ast.Store, ast.Del)):
+                self.bind(env, x.id, None)
+            elif isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.bind(env, x.name, None)
+            elif isinstance(x, ast.ExceptHandler) and x.name:
+                self.bind(env, x.name, None)
+
+    # expressions
+
+    def expr(self, env: dict[str, Type], x: ast.expr) -> Type:
+        method = getattr(self, 'expr_' + x.__class__.__name__, None)
+        if method is None:
+            for child in ast.iter_child_nodes(x):
+                if isinstance(child, ast.expr):
+                    self.expr(env, child)
+            return None
+        return self.record(x, method(env, x))
+
+    def expr_Constant(self, env, x: ast.Constant) -> Type:
+        return {bool: BOOL, int: INT, float: FLOAT}.get(type(x.value))
+
+    def expr_Name(self, env, x: ast.Name) -> Type:
+        return env.get(x.id)
+
+    def expr_Attribute(self, env, x: ast.Attribute) -> Type:
+        self.expr(env, x.value)
+        if isinstance(x.value, ast.Name) and x.value.id in self.tracked:
+            return self.fields.get(self.declared.get(x.value.id, ''), {}).get(x.attr)
+        return None
+
+    def expr_NamedExpr(self, env, x: ast.NamedExpr) -> Type:
+        t = self.expr(env, x.value)
+        self.bind_target(env, x.target, t)
+        return t
+
+    def expr_BinOp(self, env, x: ast.BinOp) -> Type:
+        l = self.expr(env, x.left)
+        r = self.expr(env, x.right)
+        return binop_type(x.op, l, r, x.right)
+
+    def expr_UnaryOp(self, env, x: ast.UnaryOp) -> Type:
+        t = self.expr(env, x.operand)
+        if isinstance(x.op, ast.Not):
+            return BOOL
+        if t not in NUMERIC:
+            return None
+        if isinstance(x.op, ast.Invert):
+            return INT if t != FLOAT else None
+        return INT if t == BOOL else t
+
+    def expr_Compare(self, env, x: ast.Compare) -> Type:
+        ts = [self.expr(env, e) for e in (x.left, *x.comparators)]
+        for op, l, r in zip(x.ops, ts, ts[1:]):
+            if isinstance(op, _ALWAYS_BOOL):
+                continue
+            if not (isinstance(op, _ORDER) and l in NUMERIC and r in NUMERIC):
+                return None
+        return BOOL
+
+    def branches(self, env: dict[str, Type], xs: list[ast.expr], always: bool) -> list[Type]:
+        """
+        the types of expressions of which only some are evaluated;
+        `always` tells if one of them is evaluated in any case.
+        """
+        envs: list[Env] = [] if always else [dict(env)]
+        ts = []
+        for e in xs:
+            branch = dict(env)
+            ts.append(self.expr(branch, e))
+            envs.append(branch)
+        env.update(join_envs(envs) or {})
+        return ts
+
+    def expr_BoolOp(self, env, x: ast.BoolOp) -> Type:
+        # only the first operand is always evaluated
+        ts = [self.expr(env, x.values[0]), *self.branches(env, x.values[1:], always=False)]
+        return ts[0] if all(t == ts[0] for t in ts) else None
+
+    def expr_IfExp(self, env, x: ast.IfExp) -> Type:
+        self.expr(env, x.test)
+        body, orelse = self.branches(env, [x.body, x.orelse], always=True)
+        return join(body, orelse)
+
+    def expr_Call(self, env, x: ast.Call) -> Type:
+        self.expr(env, x.func)
+        ts = [self.expr(env, e) for e in x.args]
+        for k in x.keywords:
+            self.expr(env, k.value)
+        if not isinstance(x.func, ast.Name) or x.keywords or not self.is_builtin(x.func.id):
+            return None
+        name = x.func.id
+        if name == 'len':
+            return INT
+        if name in ('int', 'float', 'bool') and len(x.args) <= 1:
+            if x.args and name == 'int' and ts[0] not in NUMERIC:
+                return None  # `int(s)` of a string may not fit
+            return {'int': INT, 'float': FLOAT, 'bool': BOOL}[name]
+        if name == 'abs' and len(ts) == 1 and ts[0] in NUMERIC:
+            return INT if ts[0] == BOOL else ts[0]
+        return None
+
+    def expr_Lambda(self, env, x: ast.Lambda) -> Type:
+        for e in (*x.args.defaults, *filter(None, x.args.kw_defaults)):
+            self.expr(env, e)
+        return None
+
+    def comprehension(self, env, x: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp) -> Type:
+        # the rest of a comprehension is evaluated in its own scope
+        self.expr(env, x.generators[0].iter)
+        return None
+
+    expr_ListComp = expr_SetComp = expr_DictComp = expr_GeneratorExp = comprehension
+
+    def element_type(self, x: ast.expr) -> Type:
+        if (isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id == 'range'
+                and not x.keywords and self.is_builtin('range')):
+            return INT
+        return None
+
+    # statements
+
+    def block(self, env: Env, body: list[ast.stmt]) -> Env:
+        for x in body:
+            if env is None:
+                break
+            env = self.stmt(env, x)
+        return env
+
+    def stmt(self, env: dict[str, Type], x: ast.stmt) -> Env:
+        method = getattr(self, 'stmt_' + x.__class__.__name__, None)
+        if method is None:
+            self.widen(env, x)
+            return env
+        return method(env, x)
+
+    def stmt_Expr(self, env, x: ast.Expr) -> Env:
+        self.expr(env, x.value)
+        return env
+
+    def stmt_Assign(self, env, x: ast.Assign) -> Env:
+        t = self.expr(env, x.value)
+        for target in x.targets:
+            self.bind_target(env, target, t)
+        return env
+
+    def stmt_AnnAssign(self, env, x: ast.AnnAssign) -> Env:
+        if x.value is not None:
+            self.bind_target(env, x.target, self.expr(env, x.value))
+        return env
+
+    def stmt_AugAssign(self, env, x: ast.AugAssign) -> Env:
+        if isinstance(x.target, ast.Attribute):
+            # a field keeps the type of the struct whatever is stored
+            l = self.expr(env, x.target)
+            self.record(x, binop_type(x.op, l, self.expr(env, x.value), x.value))
+            return env
+        if not isinstance(x.target, ast.Name):
+            self.bind_target(env, x.target, None)
+            self.expr(env, x.value)
+            return env
+        l = self.record(x.target, env.get(x.target.id))
+        r = self.expr(env, x.value)
+        t = self.record(x, binop_type(x.op, l, r, x.value))
+        self.bind(env, x.target.id, t)
+        return env
+
+    def stmt_If(self, env, x: ast.If) -> Env:
+        self.expr(env, x.test)
+        return join_envs([self.block(dict(env), x.body), self.block(dict(env), x.orelse)])
+
+    def loop(self, env: dict[str, Type], run: typing.Callable[[dict[str, Type]], Env]) -> Env:
+        """
+        iterate `run`, one pass over the loop, to a fixpoint of the environment at the loop head.
+        returns the environment after the loop.
+        """
+        head = env
+        while True:
+            self.breaks.append([])
+            self.continues.append([])
+            end = run(dict(head))
+            breaks = self.breaks.pop()
+            continues = self.continues.pop()
+            new_head = join_envs([head, end, *continues])
+            assert new_head is not None
+            if new_head == head:
+                return join_envs([head, *breaks])
+            head = new_head
+
+    def stmt_While(self, env, x: ast.While) -> Env:
+        def run(env: dict[str, Type]) -> Env:
+            self.expr(env, x.test)
+            return self.block(env, x.body)
+        after = self.loop(env, run)
+        if after is not None:
+            after = self.block(after, x.orelse)
+        return after
+
+    def stmt_For(self, env, x: ast.For) -> Env:
+        self.expr(env, x.iter)
+        t = self.element_type(x.iter)
+
+        def run(env: dict[str, Type]) -> Env:
+            self.bind_target(env, x.target, t)
+            return self.block(env, x.body)
+        after = self.loop(env, run)
+        if after is not None:
+            after = self.block(after, x.orelse)
+        return after
+
+    def stmt_Break(self, env, x: ast.Break) -> Env:
+        self.breaks[-1].append(env)
+        return None
+
+    def stmt_Continue(self, env, x: ast.Continue) -> Env:
+        self.continues[-1].append(env)
+        return None
+
+    def stmt_Return(self, env, x: ast.Return) -> Env:
+        if x.value is not None:
+            self.expr(env, x.value)
+        return None
+
+    def stmt_Raise(self, env, x: ast.Raise) -> Env:
+        for e in (x.exc, x.cause):
+            if e is not None:
+                self.expr(env, e)
+        return None
+
+    def stmt_Try(self, env, x: ast.Try) -> Env:
+        # a handler may start anywhere in the body
+        handler_env = dict(env)
+        for stmt in x.body:
+            self.widen(handler_env, stmt)
+        ends = [self.block(self.block(dict(env), x.body), x.orelse)]
+        for h in x.handlers:
+            henv = dict(handler_env)
+            if h.name:
+                self.bind(henv, h.name, None)
+            ends.append(self.block(henv, h.body))
+        after = join_envs(ends)
+        if x.finalbody:
+            # `finally` also runs on the way out of a return or an exception
+            self.block(join_envs([after, handler_env]), x.finalbody)
+            after = self.block(after, x.finalbody)
+        return after
+
+    def stmt_FunctionDef(self, env, x: ast.FunctionDef) -> Env:
+        for e in (*x.decorator_list, *x.args.defaults, *filter(None, x.args.kw_defaults)):
+            self.expr(env, e)
+        self.bind(env, x.name, None)
+        return env
+
+    def stmt_Pass(self, env, x: ast.Pass) -> Env:
+        return env
+
+    def stmt_Global(self, env, x: ast.Global) -> Env:
+        return env
+
+    stmt_Nonlocal = stmt_Global
+
+
+_CONTAINERS = {ast.List: 'list', ast.Set: 'set', ast.Dict: 'dict'}
+
+# container methods adding elements -> the positions of the arguments stored (the key and value for dicts)
+_ADDS: dict[str, dict[str, tuple[int, ...]]] = {
+    'list': {'append': (0,), 'insert': (1,)},
+    'set': {'add': (0,)},
+    'dict': {'setdefault': (0, 1)},
+}
+
+# container methods that neither add elements nor keep a reference to the container
+_READS: dict[str, frozenset[str]] = {
+    'list': frozenset({'pop', 'index', 'count', 'remove', 'clear', 'reverse', 'sort', 'copy'}),
+    'set': frozenset({
+        'pop', 'remove', 'discard', 'clear', 'copy', 'issubset', 'issuperset', 'isdisjoint',
+        'union', 'intersection', 'difference', 'symmetric_difference'}),
+    'dict': frozenset({'get', 'pop', 'keys', 'values', 'items', 'clear', 'copy'}),
+}
+
+# builtins that read their arguments without keeping them
+_READERS = frozenset({
+    'len', 'sorted', 'sum', 'min', 'max', 'any', 'all', 'enumerate', 'zip', 'reversed',
+    'list', 'set', 'frozenset', 'tuple', 'print', 'str', 'repr', 'bool', 'isinstance'})
+
+
+def container_kind(x: ast.expr, is_builtin: typing.Callable[[str], bool]) -> str | None:
+    """
+    'list', 'set' or 'dict' for a display or an empty `list()`, `set()` or `dict()`.
+    """
+    kind = _CONTAINERS.get(type(x))
+    if kind is not None:
+        return kind
+    if (isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id in _ADDS
+            and not x.args and not x.keywords and is_builtin(x.func.id)):
+        return x.func.id
+    return None
+
+
+class _Containers:
+    """
+    element types of the displays of a function body, given the types of its expressions.
+    """
+    def __init__(self, exprs: dict[ast.AST, Type], is_builtin: typing.Callable[[str], bool]):
+        self.exprs = exprs
+        self.is_builtin = is_builtin
+        self.elements: dict[ast.expr, tuple[str, ...]] = {}
+        self.comprehensions: set[ast.expr] = set()
+
+    def element(self, x: ast.expr) -> Type:
+        if isinstance(x, ast.JoinedStr) or isinstance(x, ast.Constant) and type(x.value) is str:
+            return STR
+        return self.exprs.get(x)
+
+    def display_types(self, x: ast.expr) -> list[list[ast.expr]] | None:
+        """
+        the elements of a display, per type parameter; None if some are unpacked.
+        """
+        if isinstance(x, (ast.List, ast.Set)):
+            if any(isinstance(e, ast.Starred) for e in x.elts):
+                return None
+            return [x.elts]
+        if isinstance(x, ast.Dict):
+            if any(k is None for k in x.keys):
+                return None
+            return [x.keys, x.values]  # type: ignore
+        # an empty `list()`, `set()` or `dict()`
+        assert isinstance(x, ast.Call) and isinstance(x.func, ast.Name)
+        return [[], []] if x.func.id == 'dict' else [[]]
+
+    def unify(self, slots: list[list[ast.expr]]) -> tuple[str, ...] | None:
+        result = []
+        for xs in slots:
+            ts = {self.element(e) for e in xs}
+            if len(ts) != 1 or None in ts:
+                return None
+            result.append(ts.pop())
+        return tuple(result)
+
+    def run(self, body: list[ast.stmt], candidates: set[str]):
+        displays: dict[str, list[ast.expr]] = {}
+        kinds: dict[str, set[str]] = {}
+        uses: list[tuple[ast.Name, ast.AST, ast.AST | None]] = []
+        parents: dict[ast.AST, ast.AST | None] = {}
+        dropped: set[str] = set()
+        for x, parent in scope_nodes(body):
+            parents[x] = parent
+            if isinstance(x, ast.Name) and x.id in candidates:
+                if isinstance(x.ctx, ast.Store):
+                    value = None
+                    if isinstance(parent, ast.Assign) and parent.targets == [x]:
+                        value = parent.value
+                    elif isinstance(parent, ast.AnnAssign) and parent.target is x:
+                        value = parent.value
+                    kind = value and container_kind(value, self.is_builtin)
+                    if kind is None:
+                        dropped.add(x.id)
+                    else:
+                        displays.setdefault(x.id, []).append(value)  # type: ignore
+                        kinds.setdefault(x.id, set()).add(kind)
+                elif isinstance(x.ctx, ast.Load) and parent is not None:
+                    uses.append((x, parent, parents.get(parent)))
+                else:
+                    dropped.add(x.id)
+
+        # the expressions stored in each container, per type parameter
+        stored: dict[str, list[list[ast.expr]]] = {}
+        # `c[k] op= v`, which keeps the value type if `op` does
+        updates: dict[str, list[ast.AugAssign]] = {}
+        for name, xs in displays.items():
+            if name in dropped or len(kinds[name]) != 1:
+                dropped.add(name)
+                continue
+            slots = [self.display_types(x) for x in xs]
+            if None in slots:
+                dropped.add(name)
+                continue
+            stored[name] = [sum(ys, []) for ys in zip(*slots)]  # type: ignore
+
+        for x, parent, grandparent in uses:
+            name = x.id
+            if name not in stored:
+                continue
+            kind, = kinds[name]
+            ok = self.use(kind, x, parent, grandparent, stored[name], updates.setdefault(name, []))
+            if not ok:
+                dropped.add(name)
+
+        for name, slots in stored.items():
+            if name in dropped:
+                continue
+            ts = self.unify(slots)
+            if ts is None:
+                continue
+            if any(binop_type(u.op, ts[-1], self.exprs.get(u.value), u.value) != ts[-1] for u in updates.get(name, ())):
+                continue
+            for x in displays[name]:
+                self.elements[x] = ts
+
+        # the other displays and the comprehensions that are not bound or passed on,
+        # typed by their elements
+        for x, parent in scope_nodes(body):
+            if isinstance(x, (ast.ListComp, ast.SetComp, ast.DictComp)) and self.kept(x, parent):
+                self.comprehensions.add(x)
+            if isinstance(x, (ast.List, ast.Set, ast.Dict)) and x not in self.elements:
+                if isinstance(x, ast.List) and not isinstance(x.ctx, ast.Load):
+                    continue
+                if not self.kept(x, parent):
+                    continue
+                slots = self.display_types(x)
+                ts = slots and slots[0] and self.unify(slots)
+                if ts:
+                    self.elements[x] = ts
+
+    def kept(self, x: ast.expr, parent: ast.AST | None) -> bool:
+        """
+        whether a display that no local holds keeps its elements in sight: it is neither
+        bound, where what the binding later stores is unknown, nor passed to a function
+        other than a builtin reading it.
+        """
+        if isinstance(parent, (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.NamedExpr, ast.keyword)):
+            return False
+        if isinstance(parent, ast.Call):
+            f = parent.func
+            return f is x or isinstance(f, ast.Name) and f.id in _READERS and self.is_builtin(f.id)
+        return True
+
+    def use(
+            self, kind: str, x: ast.Name, parent: ast.AST, grandparent: ast.AST | None,
+            stored: list[list[ast.expr]], updates: list[ast.AugAssign]) -> bool:
+        """
+        whether a read of a container keeps its elements in sight; the elements it adds go to `stored`.
+        """
+        if isinstance(parent, ast.Attribute):
+            if not (isinstance(grandparent, ast.Call) and grandparent.func is parent):
+                return False
+            method = parent.attr
+            if method in _READS[kind]:
+                return True
+            positions = _ADDS[kind].get(method)
+            args = grandparent.args
+            if (positions is None or grandparent.keywords or len(args) <= max(positions)
+                    or any(isinstance(a, ast.Starred) for a in args)):
+                return False
+            for slot, i in zip(stored, positions):
+                slot.append(args[i])
+            return True
+        if isinstance(parent, ast.Subscript):
+            if isinstance(parent.ctx, (ast.Load, ast.Del)):
+                return True
+            if isinstance(parent.slice, ast.Slice):
+                return False
+            if isinstance(grandparent, ast.Assign) and grandparent.targets == [parent]:
+                if kind == 'dict':
+                    stored[0].append(parent.slice)
+                stored[-1].append(grandparent.value)
+                return True
+            if isinstance(grandparent, ast.AugAssign) and kind != 'set':
+                updates.append(grandparent)
+                return True
+            return False
+        if isinstance(parent, ast.For):
+            return parent.iter is x
+        if isinstance(parent, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            # the iterable of the first generator
+            return True
+        if isinstance(parent, ast.Compare):
+            return any(e is x for e in parent.comparators)
+        if isinstance(parent, ast.Call):
+            f = parent.func
+            return (
+                isinstance(f, ast.Name) and f.id in _READERS and self.is_builtin(f.id)
+                and any(e is x for e in parent.args))
+        if isinstance(parent, (ast.If, ast.While, ast.IfExp, ast.Assert)):
+            return parent.test is x
+        if isinstance(parent, ast.UnaryOp):
+            return isinstance(parent.op, ast.Not)
+        return isinstance(parent, (ast.Return, ast.Expr))
+
+
+def infer_function(
+        node: ast.FunctionDef, scope: Scope,
+        is_builtin: typing.Callable[[str], bool],
+        declared: dict[str, str] | None = None,
+        fields: dict[str, dict[str, str]] | None = None) -> FunctionTypes:
+    """
+    `declared` holds the types parameters and locals are declared with;
+    the other parameters are unknown. `fields` maps structs to the scalar types of their fields.
+    """
+    inference = _Inference(scope, is_builtin, declared or {}, fields or {})
+    env: dict[str, Type] = {}
+    for name in scope.get_parameters():
+        inference.bind(env, name, None)
+    inference.block(env, node.body)
+    result = FunctionTypes()
+    result.exprs = {x: t for x, t in inference.exprs.items() if t is not None}
+    result.locals = {
+        name: t for name, t in inference.assigned.items()
+        if t is not None and not scope.lookup(name).is_parameter()
+    }
+    containers = _Containers(inference.exprs, is_builtin)
+    containers.run(node.body, {
+        name for name in inference.tracked
+        if name not in inference.declared and not scope.lookup(name).is_parameter()
+    })
+    result.elements = containers.elements
+    result.comprehensions = containers.comprehensions
+    return result
@@ -0,0 +1,167 @@
+"""
+Python type annotations as Julia types.
+
+`julia_type` maps the builtin scalar types, `list`/`dict`/`set`/`tuple` and
+their `typing` aliases, `Optional` and unions, and the classes compiled to structs (see
+`Py2Jl.classes`) to those structs; anything else raises `Unmappable`, which the compiler reports as an `AnnotationWarning` before
+ignoring the annotation.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['JLType', 'Unmappable', 'AnnotationWarning', 'julia_type', 'argument_type', 'shared_type']
+
+
+class AnnotationWarning(UserWarning):
+    pass
+
+
+class Unmappable(Exception):
+    pass
+
+
+class JLType:
+    def __init__(self, name: str, params: tuple[JLType, ...] = ()):
+        self.name = name
+        self.params = params
+
+    def __str__(self):
+        if not self.params:
+            return self.name
+        return f"{self.name}{{{', '.join(map(str, self.params))}}}"
+
+    def __eq__(self, other):
+        return isinstance(other, JLType) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+SCALARS = {
+    'int': 'Int',
+    'float': 'Float64',
+    'bool': 'Bool',
+    'str': 'String',
+    # `b"..."` literals are `Base.CodeUnits`, other bytes `Vector{UInt8}`
+    'bytes': 'AbstractVector{UInt8}',
+    'None': 'Nothing',
+    'object': 'Any',
+    'Any': 'Any',
+}
+
+# container -> (Julia type, number of type parameters)
+CONTAINERS: dict[str, tuple[str, int]] = {
+    'list': ('PyVector', 1),
+    'List': ('PyVector', 1),
+    'set': ('Set', 1),
+    'Set': ('Set', 1),
+    'frozenset': ('Set', 1),
+    'FrozenSet': ('Set', 1),
+    'dict': ('Dict', 2),
+    'Dict': ('Dict', 2),
+}
+
+_CONTAINER_TYPES = frozenset(jl for jl, _ in CONTAINERS.values())
+
+# what a parameter of the given type accepts: Python passes ints for floats, and bools for ints
+_ARGUMENT_TYPES = {
+    'Int': 'Integer',
+    'Float64': 'Real',
+}
+
+
+def _name(x: ast.expr) -> str | None:
+    if isinstance(x, ast.Name):
+        return x.id
+    # typing.List, t.Optional, ...
+    if isinstance(x, ast.Attribute):
+        return x.attr
+    return None
+
+
+def _subscript_args(x: ast.Subscript) -> list[ast.expr]:
+    s = x.slice
+    return list(s.elts) if isinstance(s, ast.Tuple) else [s]
+
+
+def julia_type(x: ast.expr, classes: typing.Container[str] = ()) -> JLType:
+    """
+    `classes` holds the names of the classes compiled to structs, which are their own types.
+    """
+    if isinstance(x, ast.Constant):
+        if x.value is None:
+            return JLType('Nothing')
+        if isinstance(x.value, str):
+            # a string annotation
+            try:
+                return julia_type(ast.parse(x.value, mode='eval').body, classes)
+            except SyntaxError:
+                raise Unmappable(repr(x.value))
+    if isinstance(x, ast.BinOp) and isinstance(x.op, ast.BitOr):
+        return _union([julia_type(x.left, classes), julia_type(x.right, classes)])
+    if isinstance(x, ast.Name) and x.id in classes:
+        return JLType(x.id)
+    name = _name(x)
+    if name is not None:
+        if name in SCALARS:
+            return JLType(SCALARS[name])
+        if name in CONTAINERS:
+            return JLType(CONTAINERS[name][0])
+        if name in ('tuple', 'Tuple'):
+            return JLType('Tuple')
+    if isinstance(x, ast.Subscript):
+        name = _name(x.value)
+        args = _subscript_args(x)
+        if name in CONTAINERS:
+            jl, arity = CONTAINERS[name]
+            if len(args) != arity:
+                raise Unmappable(ast.unparse(x))
+            return JLType(jl, tuple(julia_type(a, classes) for a in args))
+        if name in ('tuple', 'Tuple'):
+            if len(args) == 2 and isinstance(args[1], ast.Constant) and args[1].value is Ellipsis:
+                return JLType('Tuple', (JLType('Vararg', (julia_type(args[0], classes),)),))
+            return JLType('Tuple', tuple(julia_type(a, classes) for a in args))
+        if name == 'Optional' and len(args) == 1:
+            return _union([julia_type(args[0], classes), JLType('Nothing')])
+        if name == 'Union':
+            return _union([julia_type(a, classes) for a in args])
+    raise Unmappable(ast.unparse(x))
+
+
+def _union(ts: list[JLType]) -> JLType:
+    flat: list[JLType] = []
+    for t in ts:
+        for u in (t.params if t.name == 'Union' else (t,)):
+            if u not in flat:
+                flat.append(u)
+    if len(flat) == 1:
+        return flat[0]
+    return JLType('Union', tuple(flat))
+
+
+def argument_type(t: JLType) -> JLType:
+    """
+    the type a parameter annotated with `t` is declared with in the signature.
+    the parameter itself is re-bound to a local of type `shared_type(t)`, which converts it.
+    containers are invariant in their element types, so they are declared without them:
+    `list[float]` accepts a `PyVector{Int}`.
+    """
+    if t.name in ('Union', 'Tuple', 'Vararg'):
+        return JLType(t.name, tuple(map(argument_type, t.params)))
+    if t.name in _CONTAINER_TYPES:
+        return JLType(t.name)
+    return JLType(_ARGUMENT_TYPES.get(t.name, t.name), t.params)
+
+
+def shared_type(t: JLType) -> JLType:
+    """
+    the type of a local or field annotated with `t` that may hold a container made elsewhere.
+    converting a container to other element types would copy it, and the caller would
+    no longer see the changes made through the local, so containers are declared without them.
+    """
+    if t.name in ('Union', 'Tuple', 'Vararg'):
+        return JLType(t.name, tuple(map(shared_type, t.params)))
+    if t.name in _CONTAINER_TYPES:
+        return JLType(t.name)
+    return t
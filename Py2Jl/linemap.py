@@ -0,0 +1,46 @@
+"""
+Line maps for compact output.
+
+The `# file, line N` comments are taken out of the generated code and kept in a
+JSON sidecar next to it (`out.jl.map`), holding for every line of the `.jl` file the
+line of the Python source it was generated from, or 0 for generated boilerplate.
+"""
+from __future__ import annotations
+import json
+import re
+
+SUFFIX = '.map'
+
+
+def sidecar_path(out: str) -> str:
+    return out + SUFFIX
+
+
+def split_line_markers(text: str, filename: str) -> tuple[str, list[int]]:
+    """
+    remove the line comments emitted for `filename`, and the blank lines, from `text`.
+    returns the remaining code and the Python line of each of its lines.
+    """
+    marker = re.compile(r'[ \t]*# ' + re.escape(filename) + r', line (\d+)')
+    code: list[str] = []
+    lines: list[int] = []
+    current = 0
+    for line in text.splitlines(keepends=True):
+        m = marker.fullmatch(line.rstrip('\r\n'))
+        if m:
+            current = int(m.group(1))
+        elif line.strip():
+            code.append(line)
+            lines.append(current)
+    return "".join(code), lines
+
+
+def write_sidecar(out: str, source: str, lines: list[int]):
+    with open(sidecar_path(out), 'w', encoding='utf-8') as f:
+        json.dump({'source': source, 'lines': lines}, f, separators=(',', ':'))
+
+
+def load_sidecar(out: str) -> tuple[str, list[int]]:
+    with open(sidecar_path(out), encoding='utf-8') as f:
+        data = json.load(f)
+    return data['source'], data['lines']
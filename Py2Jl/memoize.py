@@ -0,0 +1,67 @@
+"""
+`functools.cache` and `functools.lru_cache` as memoization tables.
+
+A function decorated with `@cache`, `@lru_cache`, `@lru_cache(n)` or
+`@lru_cache(maxsize=n, typed=...)` is bound to a `PyCache` of the runtime
+wrapping it: a `Dict` from the arguments to the results, and a list of the
+results from the most to the least recently used, which evicts the least
+recently used result beyond `maxsize` as CPython does. `f.cache_info()` and
+`f.cache_clear()` work as in Python.
+
+The keys are the `Tuple`s of the arguments. With `typed_annotations`, the
+table of a function whose parameters are all positional and annotated is
+typed with their types, and with the annotated return type.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['Memoized', 'cache_decorator']
+
+# the `maxsize` of `@lru_cache` without one
+DEFAULT_MAXSIZE = 128
+
+
+class Memoized:
+    def __init__(self, maxsize: ast.expr, typed: bool):
+        # `None` for unbounded
+        self.maxsize = maxsize
+        self.typed = typed
+
+
+def _functools(x: ast.expr, imported: typing.Mapping[str, str]) -> str | None:
+    """
+    the name of the function of `functools` that `x` refers to, if any.
+    """
+    if isinstance(x, ast.Name):
+        qualified = imported.get(x.id, '')
+        return qualified[len('functools.'):] if qualified.startswith('functools.') else None
+    if isinstance(x, ast.Attribute) and isinstance(x.value, ast.Name) and imported.get(x.value.id) == 'functools':
+        return x.attr
+    return None
+
+
+def cache_decorator(x: ast.FunctionDef, imported: typing.Mapping[str, str]) -> Memoized | None:
+    """
+    how `x` is memoized, if it is decorated with `functools.cache` or `functools.lru_cache`.
+    `imported` maps the names the module imports to what they refer to (see `Py2Jl.classes`).
+    """
+    for d in x.decorator_list:
+        call = d if isinstance(d, ast.Call) else None
+        name = _functools(d if call is None else call.func, imported)
+        if name == 'cache' and call is None:
+            return Memoized(ast.Constant(None), False)
+        if name != 'lru_cache':
+            continue
+        if call is None:
+            return Memoized(ast.Constant(DEFAULT_MAXSIZE), False)
+        options = dict(zip(('maxsize', 'typed'), call.args))
+        options.update((k.arg, k.value) for k in call.keywords if k.arg)
+        if (len(call.args) > 2 or len(options) != len(call.args) + len(call.keywords)
+                or not set(options) <= {'maxsize', 'typed'}):
+            raise NotImplementedError(f"the arguments of `lru_cache` on `{x.name}`")
+        typed = options.get('typed', ast.Constant(False))
+        if not isinstance(typed, ast.Constant):
+            raise NotImplementedError(f"`typed` of `lru_cache` on `{x.name}` is not a constant")
+        return Memoized(options.get('maxsize', ast.Constant(DEFAULT_MAXSIZE)), bool(typed.value))
+    return None
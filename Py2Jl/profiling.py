@@ -0,0 +1,65 @@
+"""
+Per-node-type profiling of the compiler, enabled with `Compiler(..., profile=NodeProfile())`.
+"""
+from __future__ import annotations
+import typing
+from time import perf_counter
+
+Handler = typing.Callable[[typing.Any, typing.Any], typing.Any]
+
+
+class NodeProfile:
+    """
+    call counts, cumulative time and own time (children excluded) per AST node type.
+    """
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.cumulative: dict[str, float] = {}
+        self.own: dict[str, float] = {}
+        # time spent in nested handlers, one slot per active handler
+        self._children: list[float] = []
+
+    def wrap(self, node_name: str, f: Handler) -> Handler:
+        counts, cumulative, own, children = self.counts, self.cumulative, self.own, self._children
+
+        def profiled(compiler, x):
+            children.append(0.0)
+            start = perf_counter()
+            try:
+                return f(compiler, x)
+            finally:
+                elapsed = perf_counter() - start
+                nested = children.pop()
+                if children:
+                    children[-1] += elapsed
+                counts[node_name] = counts.get(node_name, 0) + 1
+                cumulative[node_name] = cumulative.get(node_name, 0.0) + elapsed
+                own[node_name] = own.get(node_name, 0.0) + elapsed - nested
+
+        return profiled
+
+    def merge(self, other: NodeProfile):
+        for k, v in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + v
+        for k, t in other.cumulative.items():
+            self.cumulative[k] = self.cumulative.get(k, 0.0) + t
+        for k, t in other.own.items():
+            self.own[k] = self.own.get(k, 0.0) + t
+
+    def __getstate__(self):
+        return self.counts, self.cumulative, self.own
+
+    def __setstate__(self, state):
+        self.counts, self.cumulative, self.own = state
+        self._children = []
+
+    def report(self, limit: int | None = None) -> str:
+        total = sum(self.own.values()) or 1.0
+        rows = sorted(self.counts, key=lambda k: self.own.get(k, 0.0), reverse=True)[:limit]
+        lines = [f"{'node':<20}{'calls':>10}{'own ms':>12}{'cum ms':>12}{'own %':>8}"]
+        for k in rows:
+            lines.append(
+                f"{k:<20}{self.counts[k]:>10}{self.own[k] * 1000:>12.2f}"
+                f"{self.cumulative[k] * 1000:>12.2f}{self.own[k] / total * 100:>7.1f}%")
+        return "\n".join(lines)
@@ -0,0 +1,173 @@
+"""
+Project mode: transpile a whole source tree with a process pool.
+
+Interpreter startup and the imports of `pretty_doc`/`wisepy2` are paid once
+per worker instead of once per file.
+"""
+from __future__ import annotations
+import io
+import os
+import typing
+import sys
+import time
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from Py2Jl import Compiler
+from Py2Jl.cache import Cache
+from Py2Jl.linemap import split_line_markers, write_sidecar
+from Py2Jl.profiling import NodeProfile
+from Py2Jl.vectorize import VectorReport
+
+JL_HEADER = "using Py2JlRuntime\n"
+
+
+def transpile_file(
+        filename: str, out: str, cache: Cache | None = None,
+        options: dict | None = None, profile: NodeProfile | None = None,
+        vector_report: VectorReport | None = None) -> bool:
+    """
+    transpile one Python file into `out`; returns True on a cache hit.
+    `options` are passed to `Compiler` as keyword arguments,
+    `profile` collects per-node timings and `vector_report` the vectorized loops
+    (cache hits are neither profiled nor reported).
+    the document is built before the output file is opened,
+    so a failing file never leaves a truncated `.jl` behind.
+    """
+    options = options or {}
+    with open(filename, 'rb') as f:
+        source = f.read()
+    if cache is not None:
+        key = cache.key(source, out, options)
+        if not options.get('compact'):
+            if cache.fetch(key, out):
+                return True
+        else:
+            # the cached text keeps its line comments, the sidecar is rebuilt from them
+            text = cache.load(key)
+            if text is not None:
+                write_output(filename, out, text, compact=True)
+                return True
+    doc = Compiler(
+        source.decode('utf-8'), out, profile=profile, vector_report=vector_report, **options).create_module()
+    buf = io.StringIO()
+    buf.write(JL_HEADER)
+    doc.render(buf.write)  # type: ignore
+    text = buf.getvalue()
+    write_output(filename, out, text, compact=options.get('compact', False))
+    if cache is not None:
+        cache.store(key, text)
+    return False
+
+
+def write_output(filename: str, out: str, text: str, compact: bool = False):
+    """
+    in compact mode, the line comments go to the sidecar line map instead of `out`.
+    """
+    if compact:
+        text, lines = split_line_markers(text, out)
+        write_sidecar(out, filename, lines)
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def resolve_root(source: str) -> Path:
+    """
+    `source` is either a directory or the dotted name of an importable package.
+    """
+    path = Path(source)
+    if path.is_dir():
+        return path
+    spec = None
+    # a file name, such as a mistyped input file, is not looked up as a package
+    if not source.endswith('.py') and all(part.isidentifier() for part in source.split('.')):
+        try:
+            spec = importlib.util.find_spec(source)
+        except ImportError:
+            # a parent package does not exist
+            spec = None
+    if spec is None or not spec.submodule_search_locations:
+        raise FileNotFoundError(f"no such file or package: {source}")
+    return Path(next(iter(spec.submodule_search_locations)))
+
+
+def iter_sources(root: Path) -> typing.Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__' and not d.startswith('.'))
+        for name in sorted(filenames):
+            if name.endswith('.py'):
+                yield Path(dirpath) / name
+
+
+def _transpile_job(job: tuple[str, str, Cache | None, dict, bool, bool]):
+    filename, out, cache, options, profiled, reported = job
+    profile = NodeProfile() if profiled else None
+    vector_report = VectorReport() if reported else None
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        status = 'cached' if transpile_file(filename, out, cache, options, profile, vector_report) else 'ok'
+    except Exception as e:
+        status = f"{type(e).__name__}: {e}"
+    return filename, out, status, time.perf_counter() - start, profile, vector_report
+
+
+def transpile_project(
+        source: str, out_dir: str, *,
+        jobs: int = 0, cache: Cache | None = None, options: dict | None = None,
+        profile: NodeProfile | None = None, vector_report: VectorReport | None = None,
+        log: typing.TextIO = sys.stderr) -> int:
+    """
+    mirror every `.py` file under `source` into `out_dir` as `.jl`.
+    the per-node timings of all workers are merged into `profile`,
+    the loops they vectorized or not into `vector_report`.
+    returns the number of files that failed to transpile.
+    """
+    root = resolve_root(source)
+    out_root = Path(out_dir)
+    job_list = [
+        (str(src), str(out_root / src.relative_to(root).with_suffix('.jl')), cache, options,
+         profile is not None, vector_report is not None)
+        for src in iter_sources(root)
+    ]
+    jobs = jobs or os.cpu_count() or 1
+    total_bytes = sum(os.path.getsize(job[0]) for job in job_list)
+
+    start = time.perf_counter()
+    failed = 0
+    if jobs == 1 or len(job_list) <= 1:
+        results = map(_transpile_job, job_list)
+        failed = _report(results, profile, vector_report, log)
+    else:
+        chunksize = max(1, len(job_list) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            failed = _report(pool.map(_transpile_job, job_list, chunksize=chunksize), profile, vector_report, log)
+    if cache is not None:
+        cache.evict()
+    elapsed = time.perf_counter() - start
+
+    n = len(job_list)
+    rate = n / elapsed if elapsed > 0 else float('inf')
+    kib_rate = total_bytes / 1024 / elapsed if elapsed > 0 else float('inf')
+    print(
+        f"{n - failed}/{n} files transpiled, {failed} failed, "
+        f"{elapsed:.2f}s ({rate:.1f} files/s, {kib_rate:.1f} KiB/s, {jobs} workers)",
+        file=log)
+    return failed
+
+
+def _report(
+        results: typing.Iterable[tuple[str, str, str, float, NodeProfile | None, VectorReport | None]],
+        profile: NodeProfile | None, vector_report: VectorReport | None, log: typing.TextIO):
+    failed = 0
+    for filename, out, status, elapsed, file_profile, file_report in results:
+        if profile is not None and file_profile is not None:
+            profile.merge(file_profile)
+        if vector_report is not None and file_report is not None:
+            vector_report.merge(file_report)
+        if status in ('ok', 'cached'):
+            print(f"[{status}] {filename} -> {out} ({elapsed * 1000:.1f} ms)", file=log)
+        else:
+            failed += 1
+            print(f"[error] {filename}: {status}", file=log)
+    return failed
@@ -0,0 +1,456 @@
+"""
+Scope analysis over an already parsed `ast.Module`.
+
+This mirrors CPython's `symtable` (the same resolution rules and the same
+symbol order), but works on the tree Py2Jl has already parsed and indexes
+every scope by the AST node that opens it, so the compiler never parses the
+source twice and never searches for a child table.
+
+The `Scope` and `Symbol` classes expose the subset of the
+`symtable.SymbolTable`/`symtable.Symbol` interface used by the compiler.
+Unlike `symtable`, private names in classes are kept unmangled, since the
+compiler looks symbols up by the names written in the source.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['Scope', 'Symbol', 'build_scope_index']
+
+# symbol flags, named after their `symtable` counterparts
+DEF_GLOBAL = 1
+DEF_LOCAL = 2
+DEF_PARAM = 4
+DEF_NONLOCAL = 8
+USE = 16
+DEF_IMPORT = 32
+DEF_ANNOT = 64
+DEF_FREE_CLASS = 128
+DEF_BOUND = DEF_LOCAL | DEF_PARAM | DEF_IMPORT
+
+# resolved scopes
+LOCAL = 1
+GLOBAL_EXPLICIT = 2
+GLOBAL_IMPLICIT = 3
+FREE = 4
+CELL = 5
+
+
+class Symbol:
+    def __init__(self, name: str, flags: int, scope: int, module_scope: bool):
+        self.name = name
+        self.flags = flags
+        self.scope = scope
+        self.module_scope = module_scope
+        self.namespaces: list[Scope] = []
+
+    def __repr__(self):
+        return f"<symbol {self.name!r}>"
+
+    def get_name(self):
+        return self.name
+
+    def is_referenced(self):
+        return bool(self.flags & USE)
+
+    def is_parameter(self):
+        return bool(self.flags & DEF_PARAM)
+
+    def is_global(self):
+        return (self.scope in (GLOBAL_IMPLICIT, GLOBAL_EXPLICIT)
+                or self.module_scope and bool(self.flags & DEF_BOUND))
+
+    def is_nonlocal(self):
+        return bool(self.flags & DEF_NONLOCAL)
+
+    def is_declared_global(self):
+        return self.scope == GLOBAL_EXPLICIT
+
+    def is_local(self):
+        return self.scope in (LOCAL, CELL) or self.module_scope and bool(self.flags & DEF_BOUND)
+
+    def is_annotated(self):
+        return bool(self.flags & DEF_ANNOT)
+
+    def is_free(self):
+        return self.scope == FREE
+
+    def is_cell(self):
+        return self.scope == CELL
+
+    def is_imported(self):
+        return bool(self.flags & DEF_IMPORT)
+
+    def is_assigned(self):
+        return bool(self.flags & DEF_LOCAL)
+
+    def is_namespace(self):
+        return bool(self.namespaces)
+
+    def get_namespaces(self):
+        return self.namespaces
+
+
+class Scope:
+    def __init__(self, kind: str, name: str, node: ast.AST, parent: Scope | None):
+        self.kind = kind
+        self.name = name
+        self.node = node
+        self.parent = parent
+        self.children: list[Scope] = []
+        self.flags: dict[str, int] = {}
+        self.symbols: dict[str, Symbol] = {}
+        self.is_generator = False
+        self.is_comprehension = False
+
+    def __repr__(self):
+        return f"<{self.kind} scope {self.name}>"
+
+    def get_type(self):
+        return self.kind
+
+    def get_name(self):
+        return self.name
+
+    def get_lineno(self):
+        return getattr(self.node, 'lineno', 0)
+
+    def is_optimized(self):
+        return self.kind == 'function'
+
+    def is_nested(self):
+        return self.parent is not None and self.parent.kind != 'module'
+
+    def has_children(self):
+        return bool(self.children)
+
+    def get_children(self):
+        return self.children
+
+    def get_identifiers(self):
+        return self.symbols.keys()
+
+    def lookup(self, name: str) -> Symbol:
+        return self.symbols[name]
+
+    def get_symbols(self):
+        return list(self.symbols.values())
+
+    def _matching(self, test: typing.Callable[[Symbol], bool]):
+        return tuple(name for name, sym in self.symbols.items() if test(sym))
+
+    def get_parameters(self):
+        return self._matching(Symbol.is_parameter)
+
+    def get_locals(self):
+        return self._matching(lambda s: s.scope in (LOCAL, CELL))
+
+    def get_globals(self):
+        return self._matching(lambda s: s.scope in (GLOBAL_IMPLICIT, GLOBAL_EXPLICIT))
+
+    def get_nonlocals(self):
+        return self._matching(Symbol.is_nonlocal)
+
+    def get_frees(self):
+        return self._matching(Symbol.is_free)
+
+    def get_cells(self):
+        return self._matching(Symbol.is_cell)
+
+    def get_methods(self):
+        return tuple(dict.fromkeys(c.name for c in self.children))
+
+
+class _Collector(ast.NodeVisitor):
+    """
+    records the flags of every name, visiting nodes in the order of CPython's symtable.c.
+    """
+
+    def __init__(self, module: ast.Module):
+        self.index: dict[ast.AST, Scope] = {}
+        self.module = module
+        self.cur: Scope = self.new_scope('module', 'top', module)
+        self.future_annotations = any(
+            isinstance(s, ast.ImportFrom) and s.module == '__future__'
+            and any(a.name == 'annotations' for a in s.names)
+            for s in module.body)
+
+    def new_scope(self, kind: str, name: str, node: ast.AST):
+        scope = Scope(kind, name, node, getattr(self, 'cur', None))
+        if scope.parent is not None:
+            scope.parent.children.append(scope)
+        self.index[node] = scope
+        return scope
+
+    def add_def(self, name: str, flag: int, scope: Scope | None = None):
+        scope = scope or self.cur
+        scope.flags[name] = scope.flags.get(name, 0) | flag
+        if flag & DEF_GLOBAL:
+            # like symtable.c, a `global` declaration anywhere is recorded at module level too
+            top = self.index[self.module]
+            top.flags[name] = top.flags.get(name, 0) | flag
+
+    def visit_seq(self, nodes: typing.Iterable[ast.AST | None]):
+        for node in nodes:
+            if node is not None:
+                self.visit(node)
+
+    def enter(self, kind: str, name: str, node: ast.AST):
+        parent = self.cur
+        self.cur = self.new_scope(kind, name, node)
+        return parent
+
+    def visit_annotation(self, node: ast.expr | None):
+        # postponed annotations live in a block of their own and never bind or use names here
+        if node is not None and not self.future_annotations:
+            self.visit(node)
+
+    def visit_arg_annotations(self, args: ast.arguments, returns: ast.expr | None):
+        for a in args.posonlyargs + args.args:
+            self.visit_annotation(a.annotation)
+        if args.vararg:
+            self.visit_annotation(args.vararg.annotation)
+        if args.kwarg:
+            self.visit_annotation(args.kwarg.annotation)
+        for a in args.kwonlyargs:
+            self.visit_annotation(a.annotation)
+        self.visit_annotation(returns)
+
+    def visit_params(self, args: ast.arguments):
+        for a in args.posonlyargs + args.args + args.kwonlyargs:
+            self.add_def(a.arg, DEF_PARAM)
+        if args.vararg:
+            self.add_def(args.vararg.arg, DEF_PARAM)
+        if args.kwarg:
+            self.add_def(args.kwarg.arg, DEF_PARAM)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        self.add_def(node.name, DEF_LOCAL)
+        self.visit_seq(node.args.defaults)
+        self.visit_seq(node.args.kw_defaults)
+        self.visit_arg_annotations(node.args, node.returns)
+        self.visit_seq(node.decorator_list)
+        parent = self.enter('function', node.name, node)
+        self.visit_params(node.args)
+        self.visit_seq(node.body)
+        self.cur = parent
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.add_def(node.name, DEF_LOCAL)
+        self.visit_seq(node.bases)
+        self.visit_seq(node.keywords)
+        self.visit_seq(node.decorator_list)
+        parent = self.enter('class', node.name, node)
+        self.visit_seq(node.body)
+        self.cur = parent
+
+    def visit_Lambda(self, node: ast.Lambda):
+        self.visit_seq(node.args.defaults)
+        self.visit_seq(node.args.kw_defaults)
+        parent = self.enter('function', 'lambda', node)
+        self.visit_params(node.args)
+        self.visit(node.body)
+        self.cur = parent
+
+    def visit_comprehension_scope(self, node: ast.expr, name: str, elts: list[ast.expr]):
+        generators: list[ast.comprehension] = node.generators  # type: ignore
+        outermost = generators[0]
+        self.visit(outermost.iter)
+        parent = self.enter('function', name, node)
+        self.cur.is_comprehension = True
+        self.cur.is_generator = isinstance(node, ast.GeneratorExp)
+        self.add_def('.0', DEF_PARAM)
+        self.visit(outermost.target)
+        self.visit_seq(outermost.ifs)
+        for gen in generators[1:]:
+            self.visit(gen.target)
+            self.visit(gen.iter)
+            self.visit_seq(gen.ifs)
+        self.visit_seq(elts)
+        self.cur = parent
+
+    def visit_ListComp(self, node: ast.ListComp):
+        self.visit_comprehension_scope(node, 'listcomp', [node.elt])
+
+    def visit_SetComp(self, node: ast.SetComp):
+        self.visit_comprehension_scope(node, 'setcomp', [node.elt])
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp):
+        self.visit_comprehension_scope(node, 'genexpr', [node.elt])
+
+    def visit_DictComp(self, node: ast.DictComp):
+        self.visit_comprehension_scope(node, 'dictcomp', [node.value, node.key])
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        if self.cur.is_comprehension:
+            name = typing.cast(ast.Name, node.target).id
+            scope = self.cur
+            while scope.is_comprehension:
+                scope = typing.cast(Scope, scope.parent)
+            if scope.kind == 'function':
+                self.add_def(name, DEF_GLOBAL if scope.flags.get(name, 0) & DEF_GLOBAL else DEF_NONLOCAL)
+                self.add_def(name, DEF_LOCAL, scope)
+            elif scope.kind == 'module':
+                self.add_def(name, DEF_GLOBAL)
+                self.add_def(name, DEF_GLOBAL, scope)
+        self.visit(node.value)
+        self.visit(node.target)
+
+    def visit_Name(self, node: ast.Name):
+        self.add_def(node.id, USE if isinstance(node.ctx, ast.Load) else DEF_LOCAL)
+        if node.id == 'super' and isinstance(node.ctx, ast.Load) and self.cur.kind == 'function':
+            self.add_def('__class__', USE)
+
+    def visit_Yield(self, node: ast.Yield | ast.YieldFrom):
+        self.cur.is_generator = True
+        if node.value is not None:
+            self.visit(node.value)
+
+    visit_YieldFrom = visit_Yield
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if isinstance(node.target, ast.Name):
+            if node.simple:
+                self.add_def(node.target.id, DEF_ANNOT | DEF_LOCAL)
+            elif node.value:
+                self.add_def(node.target.id, DEF_LOCAL)
+        else:
+            self.visit(node.target)
+        self.visit_annotation(node.annotation)
+        if node.value:
+            self.visit(node.value)
+
+    def visit_Try(self, node: ast.Try):
+        self.visit_seq(node.body)
+        self.visit_seq(node.orelse)
+        self.visit_seq(node.handlers)
+        self.visit_seq(node.finalbody)
+
+    visit_TryStar = visit_Try
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.type:
+            self.visit(node.type)
+        if node.name:
+            self.add_def(node.name, DEF_LOCAL)
+        self.visit_seq(node.body)
+
+    def visit_alias(self, node: ast.alias):
+        if node.name == '*':
+            return
+        name = node.asname or node.name.partition('.')[0]
+        self.add_def(name, DEF_IMPORT)
+
+    def visit_Global(self, node: ast.Global):
+        for name in node.names:
+            self.add_def(name, DEF_GLOBAL)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal):
+        for name in node.names:
+            self.add_def(name, DEF_NONLOCAL)
+
+    def visit_MatchAs(self, node):
+        if node.pattern:
+            self.visit(node.pattern)
+        if node.name:
+            self.add_def(node.name, DEF_LOCAL)
+
+    def visit_MatchStar(self, node):
+        if node.name:
+            self.add_def(node.name, DEF_LOCAL)
+
+    def visit_MatchMapping(self, node):
+        self.visit_seq(node.keys)
+        self.visit_seq(node.patterns)
+        if node.rest:
+            self.add_def(node.rest, DEF_LOCAL)
+
+
+def _analyze(scope: Scope, bound: set[str] | None, global_: set[str], free: set[str]):
+    """
+    resolve the scope of every name, the same way as `analyze_block` in symtable.c.
+    names free in `scope` are added to `free`.
+    """
+    local: set[str] = set()
+    scopes: dict[str, int] = {}
+    global_ = set(global_)
+    bound = set(bound) if bound is not None else None
+    newglobal: set[str] = set()
+    newbound: set[str] = set()
+    newfree: set[str] = set()
+
+    if scope.kind == 'class':
+        newglobal |= global_
+        if bound is not None:
+            newbound |= bound
+
+    for name, flags in scope.flags.items():
+        if flags & DEF_GLOBAL:
+            scopes[name] = GLOBAL_EXPLICIT
+            global_.add(name)
+            if bound is not None:
+                bound.discard(name)
+        elif flags & DEF_NONLOCAL:
+            scopes[name] = FREE
+            free.add(name)
+        elif flags & DEF_BOUND:
+            scopes[name] = LOCAL
+            local.add(name)
+            global_.discard(name)
+        elif bound is not None and name in bound:
+            scopes[name] = FREE
+            free.add(name)
+        else:
+            scopes[name] = GLOBAL_IMPLICIT
+
+    if scope.kind != 'class':
+        if scope.kind == 'function':
+            newbound |= local
+        if bound is not None:
+            newbound |= bound
+        newglobal |= global_
+    else:
+        newbound.add('__class__')
+
+    for child in scope.children:
+        _analyze(child, newbound, newglobal, newfree)
+
+    if scope.kind == 'function':
+        for name in local:
+            if name in newfree:
+                scopes[name] = CELL
+                newfree.discard(name)
+    elif scope.kind == 'class':
+        newfree.discard('__class__')
+
+    module_scope = scope.kind == 'module'
+    for name, flags in scope.flags.items():
+        scope.symbols[name] = Symbol(name, flags, scopes[name], module_scope)
+    for name in newfree:
+        sym = scope.symbols.get(name)
+        if sym is not None:
+            if scope.kind == 'class' and sym.flags & (DEF_BOUND | DEF_GLOBAL):
+                sym.flags |= DEF_FREE_CLASS
+            continue
+        if bound is None or name not in bound:
+            continue
+        scope.symbols[name] = Symbol(name, 0, FREE, module_scope)
+
+    for child in scope.children:
+        sym = scope.symbols.get(child.name)
+        if sym is not None:
+            sym.namespaces.append(child)
+
+    free |= newfree
+
+
+def build_scope_index(module: ast.Module) -> dict[ast.AST, Scope]:
+    """
+    map the module node and every function, lambda, class and comprehension node to its scope.
+    """
+    collector = _Collector(module)
+    collector.visit_seq(module.body)
+    _analyze(collector.index[module], None, set(), set())
+    return collector.index
@@ -0,0 +1,150 @@
+"""
+String building in loops.
+
+`s += piece` copies `s` on every iteration, which makes building a string in
+a loop quadratic. When a function local that always holds a `str` is only
+ever appended to within a loop, the loop appends the pieces to a buffer
+instead, and `s` is taken back from the buffer once after the loop.
+
+A loop qualifies for `s` if nothing in it but `s += ...` mentions `s`, it
+contains no `yield`, and it is not in a `try` statement, whose handlers could
+otherwise see `s` without the pieces appended before an exception.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['StringBuilders', 'find_string_builders']
+
+_LOOPS = (ast.For, ast.While)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+# builtins returning a `str`
+_STR_BUILTINS = frozenset({'str', 'repr', 'ascii', 'chr', 'format'})
+
+
+class StringBuilders:
+    def __init__(self):
+        # loop -> the locals it builds
+        self.loops: dict[ast.stmt, list[str]] = {}
+        # the `s += piece` statements appending to a buffer -> their loop
+        self.appends: dict[ast.AugAssign, ast.stmt] = {}
+
+
+def _is_str(x: ast.expr, is_builtin: typing.Callable[[str], bool]) -> bool:
+    if isinstance(x, ast.Constant):
+        return isinstance(x.value, str)
+    if isinstance(x, ast.JoinedStr):
+        return True
+    if isinstance(x, ast.BinOp) and isinstance(x.op, (ast.Add, ast.Mod)):
+        return _is_str(x.left, is_builtin)
+    if isinstance(x, ast.Call):
+        f = x.func
+        if isinstance(f, ast.Name):
+            return f.id in _STR_BUILTINS and is_builtin(f.id)
+        # `", ".join(xs)`, `"{}".format(x)`, ...
+        return isinstance(f, ast.Attribute) and isinstance(f.value, ast.Constant) and isinstance(f.value.value, str)
+    return False
+
+
+def _is_append(x: ast.AST | None, name: str) -> bool:
+    return (
+        isinstance(x, ast.AugAssign) and isinstance(x.op, ast.Add)
+        and isinstance(x.target, ast.Name) and x.target.id == name)
+
+
+def _scope_nodes(body: list[ast.stmt]) -> typing.Iterator[tuple[ast.AST, ast.AST | None]]:
+    """
+    the nodes of a function body with their parents, leaving out the bodies of
+    nested functions and classes, whose names are not locals of the function.
+    """
+    stack: list[tuple[ast.AST, ast.AST | None]] = [(x, None) for x in reversed(body)]
+    while stack:
+        x, parent = stack.pop()
+        yield x, parent
+        if not isinstance(x, _SCOPES):
+            stack.extend((c, x) for c in reversed(list(ast.iter_child_nodes(x))))
+
+
+def _bound_names(x: ast.AST) -> list[str]:
+    """
+    the names bound by `x` other than through `ast.Name` targets.
+    """
+    if isinstance(x, _SCOPES) and not isinstance(x, ast.Lambda):
+        return [x.name]  # type: ignore
+    if isinstance(x, (ast.Import, ast.ImportFrom)):
+        return [(a.asname or a.name).split('.')[0] for a in x.names]
+    if isinstance(x, ast.ExceptHandler) and x.name:
+        return [x.name]
+    return []
+
+
+def find_string_builders(
+        body: list[ast.stmt], locals: typing.Iterable[str],
+        is_builtin: typing.Callable[[str], bool], declared: dict[str, str] | None = None) -> StringBuilders:
+    """
+    `locals` are the locals of the function that are neither parameters nor cells;
+    `declared` holds the types locals are declared with.
+    """
+    declared = declared or {}
+    # the locals that only ever hold a `str`:
+    # each assignment stores a `str`, or appends to one, which is a `str` or raises
+    candidates = set(locals)
+    for x, parent in _scope_nodes(body):
+        candidates.difference_update(_bound_names(x))
+        if not (isinstance(x, ast.Name) and x.id in candidates):
+            continue
+        if isinstance(x.ctx, ast.Del):
+            candidates.discard(x.id)
+        elif isinstance(x.ctx, ast.Store):
+            if isinstance(parent, ast.Assign) and parent.targets == [x]:
+                value: ast.expr | None = parent.value
+            elif isinstance(parent, ast.AnnAssign) and parent.target is x:
+                value = parent.value
+            elif _is_append(parent, x.id):
+                continue
+            else:
+                value = None
+            t = declared.get(x.id)
+            if t is not None:
+                is_str = t == 'String'
+            else:
+                is_str = value is not None and _is_str(value, is_builtin)
+            if not is_str:
+                candidates.discard(x.id)
+
+    result = StringBuilders()
+    if candidates:
+        _find_loops(body, candidates, result, in_try=False)
+    return result
+
+
+def _find_loops(body: list[ast.stmt], candidates: set[str], result: StringBuilders, in_try: bool):
+    for stmt in body:
+        if isinstance(stmt, _SCOPES):
+            continue
+        rest = candidates
+        if isinstance(stmt, _LOOPS) and not in_try:
+            built = [name for name in sorted(candidates) if _builds(stmt, name)]
+            if built:
+                result.loops[stmt] = built
+                for x, _ in _scope_nodes([stmt]):
+                    if any(_is_append(x, name) for name in built):
+                        result.appends[x] = stmt  # type: ignore
+                rest = candidates.difference(built)
+        nested = in_try or isinstance(stmt, ast.Try)
+        for field in ('body', 'orelse', 'finalbody'):
+            _find_loops(getattr(stmt, field, []), rest, result, nested)
+        for handler in getattr(stmt, 'handlers', []):
+            _find_loops(handler.body, rest, result, nested)
+
+
+def _builds(loop: ast.stmt, name: str) -> bool:
+    appends = 0
+    for x, parent in _scope_nodes([loop]):
+        if isinstance(x, (ast.Yield, ast.YieldFrom, ast.Await)):
+            return False
+        if isinstance(x, ast.Name) and x.id == name:
+            if not _is_append(parent, name) or parent.target is not x:  # type: ignore
+                return False
+            appends += 1
+    return appends > 0
@@ -0,0 +1,238 @@
+"""
+A string-builder replacement for the subset of `pretty_doc` used by Py2Jl.
+
+Combining documents allocates one node and copies nothing: the segments
+are kept as plain strings, and rendering walks the tree once, appending
+each segment to the pieces of its output line, so building and writing a
+module takes time linear in its size. Py2Jl never emits breakable or
+aligned documents, which is what makes this form render byte-for-byte the
+same as `pretty_doc`.
+"""
+from __future__ import annotations
+import typing
+import pretty_doc
+
+
+class Text:
+    __slots__ = ('blank', )
+    # whether the document has no lines
+    blank: bool
+
+    def __mul__(self, other: Doc) -> Text:
+        return _cat(self, other)
+
+    def __rmul__(self, other: Doc) -> Text:
+        return _cat(other, self)
+
+    def __add__(self, other: Doc) -> Text:
+        return _cat(_cat(self, " "), other)
+
+    def __radd__(self, other: Doc) -> Text:
+        return _cat(_cat(other, " "), self)
+
+    def __rshift__(self, i: int) -> Text:
+        return indent(i, self)
+
+    def show(self, render_options=None) -> str:
+        return "".join(_lines(self))
+
+    def render(self, write: typing.Callable[[str], typing.Any], render_options=None):
+        write(self.show())
+
+
+# a part of a document: a document, or a line of one segment
+Part = typing.Union[Text, str]
+
+
+class _Line(Text):
+    __slots__ = ('it', )
+
+    def __init__(self, it: str):
+        self.blank = False
+        self.it = it
+
+
+class _Cat(Text):
+    """
+    two documents, the first line of `r` continuing the last line of `l`.
+    """
+    __slots__ = ('l', 'r')
+
+    def __init__(self, l: Part, r: Part):
+        self.blank = False
+        self.l = l
+        self.r = r
+
+
+class _Seq(Text):
+    """
+    documents concatenated, none of them blank.
+    """
+    __slots__ = ('parts', )
+
+    def __init__(self, parts: list[Part]):
+        self.blank = not parts
+        self.parts = parts
+
+
+class _VSep(Text):
+    __slots__ = ('sections', )
+
+    def __init__(self, sections: typing.Sequence[Doc]):
+        self.sections = [_part(s) for s in sections]
+        self.blank = all(type(s) is not str and s.blank for s in self.sections)  # type: ignore
+
+
+class _Indent(Text):
+    __slots__ = ('i', 'inner')
+
+    def __init__(self, i: int, inner: Part):
+        self.blank = type(inner) is not str and inner.blank  # type: ignore
+        self.i = i
+        self.inner = inner
+
+
+class Seg(pretty_doc.Doc_LineSeg):
+    """
+    a segment that can be combined with the documents of either backend.
+    """
+
+    def __mul__(self, other):
+        if isinstance(other, Seg):
+            return Seg(self.it + other.it)
+        if isinstance(other, Text):
+            return _cat(self, other)
+        return pretty_doc.Doc_LineSeg.__mul__(self, other)
+
+    def __add__(self, other):
+        if isinstance(other, Seg):
+            return Seg(self.it + " " + other.it)
+        if isinstance(other, Text):
+            return _cat(_cat(self.it, " "), other)
+        return pretty_doc.Doc_LineSeg.__add__(self, other)
+
+
+Doc = typing.Union[Text, pretty_doc.Doc_LineSeg]
+
+_NODES = frozenset({_Cat, _Seq, _VSep, _Indent})
+
+
+def _part(doc: Doc | str) -> Part:
+    t = type(doc)
+    if t is str:
+        return doc  # type: ignore
+    if t is _Line or t is Seg:
+        return doc.it  # type: ignore
+    if t in _NODES:
+        return doc  # type: ignore
+    if isinstance(doc, pretty_doc.Doc_LineSeg):
+        return doc.it
+    raise TypeError(f"cannot mix {t.__name__} into a text document")
+
+
+def _cat(l: Doc | str, r: Doc | str) -> Text:
+    l, r = _part(l), _part(r)
+    if type(l) is not str and l.blank:  # type: ignore
+        return r if type(r) is not str else _Line(r)  # type: ignore
+    if type(r) is not str and r.blank:  # type: ignore
+        return l if type(l) is not str else _Line(l)  # type: ignore
+    return _Cat(l, r)
+
+
+# on the stack of `_lines`: the next part continues the last line
+_JOIN = object()
+
+
+def _lines(doc: Doc) -> list[str]:
+    """
+    the lines of `doc`, each ending with a newline.
+    """
+    out: list[str] = []
+    # the indentation and the pieces of the last line
+    indent_of_last = 0
+    pieces: list[str] = []
+    joined = False
+    stack: list[typing.Any] = [_part(doc)]
+    indents = [0]
+    while stack:
+        x = stack.pop()
+        i = indents.pop()
+        if type(x) is str:
+            if joined:
+                pieces.append(x)
+                joined = False
+            else:
+                if pieces:
+                    out.append(f"{' ' * indent_of_last}{''.join(pieces)}\n")
+                indent_of_last = i
+                pieces = [x]
+        elif x is _JOIN:
+            joined = True
+        elif x.blank:
+            continue
+        elif type(x) is _Cat:
+            stack += (x.r, _JOIN, x.l)
+            indents += (i, i, i)
+        elif type(x) is _Seq:
+            parts = x.parts
+            for k in range(len(parts) - 1, 0, -1):
+                stack += (parts[k], _JOIN)
+                indents += (i, i)
+            stack.append(parts[0])
+            indents.append(i)
+        elif type(x) is _VSep:
+            stack.extend(reversed(x.sections))
+            indents.extend([i] * len(x.sections))
+        elif type(x) is _Indent:
+            stack.append(x.inner)
+            indents.append(i + x.i)
+        else:
+            stack.append(x.it)
+            indents.append(i)
+    if pieces:
+        out.append(f"{' ' * indent_of_last}{''.join(pieces)}\n")
+    return out
+
+
+def seg(s: str) -> Text:
+    return _Line(s)
+
+
+def vsep(sections: list[Doc]) -> Text:
+    return _VSep(sections)
+
+
+def indent(i: int, inner: Doc) -> Text:
+    return _Indent(i, _part(inner))
+
+
+empty = _VSep(())
+space = seg(" ")
+comma = seg(",")
+
+
+def parens(a: Doc) -> Text:
+    return _cat(_cat("(", a), ")")
+
+
+def bracket(a: Doc) -> Text:
+    return _cat(_cat("[", a), "]")
+
+
+def brace(a: Doc) -> Text:
+    return _cat(_cat("{", a), "}")
+
+
+def listof(elements: typing.Iterable[Doc]) -> Text:
+    parts = [_part(each) for each in elements]
+    return _Seq([p for p in parts if type(p) is str or not p.blank])  # type: ignore
+
+
+def seplistof(sep: Doc, elements: typing.Iterable[Doc]) -> Text:
+    s = _part(sep)
+    parts: list[Part] = []
+    for each in elements:
+        if parts:
+            parts.append(s)
+        parts.append(_part(each))
+    return _Seq([p for p in parts if type(p) is str or not p.blank])  # type: ignore
@@ -0,0 +1,242 @@
+"""
+Module-level variables as constant or typed Julia globals.
+
+A Julia function reading an untyped global does not know the type of its
+value, so every use of it is dispatched at run time. Over all bindings of
+a global, by the module and by the functions declaring it `global`:
+
+- a global bound once, by an assignment `x = value`, a `def` or a `class`
+  the module runs outside of loops and `try`, is `const`;
+- a global whose bindings all assign a `bool`, an `int` or a `float` of one
+  type, computed from constants and other such globals, or are `for` loops
+  over a `range`, is declared with its type at the start of the module
+  (`global x::Int`);
+- any other global that is read by a function, a lambda, a comprehension or
+  a loop run as a function (below) is reported with a `GlobalWarning`.
+
+The `for` and `while` loops of the module are run as functions declaring
+`global` the variables they assign, so that Julia compiles them and their
+temporaries are locals. Loops that define functions or classes, import,
+declare `global` or assign with `:=` in a comprehension are left as they are.
+"""
+from __future__ import annotations
+import ast
+import collections
+import typing
+from Py2Jl.infer import NUMERIC, BOOL, INT, FLOAT, binop_type
+from Py2Jl.astwalk import scope_nodes, all_stores
+from Py2Jl.scope import Scope
+
+__all__ = ['GlobalWarning', 'ModuleGlobals', 'find_globals']
+
+_LOOPS = (ast.For, ast.While)
+# statements that cannot run in a function
+_MODULE_ONLY = (
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef,
+    ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal)
+
+# a binding: the scope it is in, the `Name` target or the binding statement, and the parent of the target
+Binding = typing.Tuple[Scope, ast.AST, typing.Optional[ast.AST]]
+
+
+class GlobalWarning(UserWarning):
+    pass
+
+
+class ModuleGlobals:
+    def __init__(self):
+        self.consts: set[str] = set()
+        # the statements binding the constants
+        self.const_bindings: set[ast.stmt] = set()
+        # typed globals -> their types, in the order the module first mentions them
+        self.types: dict[str, str] = {}
+        # the loops of the module run as functions -> the globals they assign
+        self.loops: dict[ast.stmt, list[str]] = {}
+        # the globals reported as slow -> their first bindings
+        self.slow: dict[str, ast.AST] = {}
+
+
+def _module_statements(body: list[ast.stmt]) -> typing.Iterator[ast.stmt]:
+    """
+    the statements of the module outside of Julia scopes: those of its body and of its `if`s.
+    """
+    for x in body:
+        yield x
+        if isinstance(x, ast.If):
+            yield from _module_statements(x.body)
+            yield from _module_statements(x.orelse)
+
+
+def _loop_globals(x: ast.For | ast.While) -> list[str] | None:
+    """
+    the variables a loop of the module assigns, or None if it cannot run as a function.
+    """
+    own = {n for n, _ in scope_nodes([x])}
+    names: list[str] = []
+    for n in ast.walk(x):
+        if isinstance(n, _MODULE_ONLY):
+            return None
+        if isinstance(n, ast.NamedExpr) and n not in own:
+            # assigns a global from a comprehension
+            return None
+        if n in own and isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Load) and n.id not in names:
+            names.append(n.id)
+    return names
+
+
+class _Globals:
+    def __init__(self, module: ast.Module, scopes: dict[ast.AST, Scope], is_builtin: typing.Callable[[str], bool]):
+        self.module = module
+        self.scope = scopes[module]
+        self.scopes = scopes
+        self.is_builtin = is_builtin
+        found: dict[str, list[Binding]] = {
+            name: [(self.scope, x, p) for x, p in stores] for name, stores in all_stores(module).items()}
+        # the bindings by the scopes declaring globals, each walked once
+        for scope in scopes.values():
+            declared = [n for n, s in scope.symbols.items() if s.is_declared_global()]
+            if scope is self.scope or not declared:
+                continue
+            stores = all_stores(scope.node)
+            for name in declared:
+                found.setdefault(name, []).extend((scope, x, p) for x, p in stores.get(name, ()))
+        self.bindings: dict[str, list[Binding]] = {
+            name: found[name] for name, sym in self.scope.symbols.items() if sym.is_global() and found.get(name)}
+
+    def is_const(self, bindings: list[Binding], statements: set[ast.stmt]) -> ast.stmt | None:
+        """
+        the statement binding a constant, if the bindings are one.
+        """
+        if len(bindings) != 1:
+            return None
+        scope, x, parent = bindings[0]
+        if scope is not self.scope:
+            return None
+        if isinstance(x, (ast.FunctionDef, ast.ClassDef)) and x in statements:
+            return x
+        if (isinstance(parent, ast.Assign) and parent.targets == [x] or
+                isinstance(parent, ast.AnnAssign) and parent.target is x and parent.value is not None):
+            return parent if parent in statements else None
+        return None
+
+    def expr_type(self, x: ast.expr, scope: Scope, env: dict[str, str]) -> str | None:
+        if isinstance(x, ast.Constant):
+            return {bool: BOOL, int: INT, float: FLOAT}.get(type(x.value))
+        if isinstance(x, ast.Name):
+            sym = scope.symbols.get(x.id)
+            return env.get(x.id) if sym is not None and sym.is_global() else None
+        if isinstance(x, ast.BinOp):
+            return binop_type(x.op, self.expr_type(x.left, scope, env), self.expr_type(x.right, scope, env), x.right)
+        if isinstance(x, ast.UnaryOp):
+            t = self.expr_type(x.operand, scope, env)
+            if isinstance(x.op, ast.Not):
+                return BOOL
+            if t not in NUMERIC or isinstance(x.op, ast.Invert) and t == FLOAT:
+                return None
+            return INT if t == BOOL else t
+        return None
+
+    def binding_type(self, b: Binding, env: dict[str, str]) -> str | None:
+        scope, x, parent = b
+        if not isinstance(x, ast.Name) or isinstance(x.ctx, ast.Del):
+            return None
+        if isinstance(parent, ast.Assign) and parent.targets == [x]:
+            return self.expr_type(parent.value, scope, env)
+        if isinstance(parent, ast.AnnAssign) and parent.value is not None:
+            return self.expr_type(parent.value, scope, env)
+        if isinstance(parent, ast.AugAssign):
+            return binop_type(parent.op, env.get(x.id), self.expr_type(parent.value, scope, env), parent.value)
+        if isinstance(parent, ast.For) and parent.target is x:
+            it = parent.iter
+            if (isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == 'range'
+                    and not it.keywords and self.is_builtin('range')):
+                return INT
+        return None
+
+    def typed(self, name: str, types: dict[str, str]) -> str | None:
+        bindings = self.bindings[name]
+        # the type of the first binding that does not depend on the global itself
+        guess = next(filter(None, (self.binding_type(b, types) for b in bindings)), None)
+        if guess not in NUMERIC:
+            return None
+        env = {**types, name: guess}
+        return guess if all(self.binding_type(b, env) == guess for b in bindings) else None
+
+    def reads(self, name: str) -> set[str]:
+        """
+        the names the values assigned to `name` read, on which its type depends.
+        """
+        names: set[str] = set()
+        for _, _, parent in self.bindings[name]:
+            if isinstance(parent, (ast.Assign, ast.AnnAssign, ast.AugAssign)) and parent.value is not None:
+                names.update(x.id for x in ast.walk(parent.value) if isinstance(x, ast.Name))
+        return names
+
+    def read_slowly(self, loops: typing.Iterable[ast.stmt]) -> set[str]:
+        """
+        the globals read by functions, lambdas, comprehensions and loops run as functions.
+        """
+        names: set[str] = set()
+        for scope in self.scopes.values():
+            if scope is self.scope or scope.kind == 'class':
+                # class bodies run once, as the module does
+                continue
+            names.update(n for n, s in scope.symbols.items() if s.is_global() and s.is_referenced())
+        for loop in loops:
+            names.update(
+                x.id for x, _ in scope_nodes([loop]) if isinstance(x, ast.Name) and isinstance(x.ctx, ast.Load))
+        return names
+
+
+def find_globals(
+        module: ast.Module, scopes: dict[ast.AST, Scope],
+        is_builtin: typing.Callable[[str], bool], *, loops: bool = True) -> ModuleGlobals:
+    """
+    which globals of a module are constant or typed, and which are slow.
+    `loops` runs the loops of the module as functions.
+    """
+    analysis = _Globals(module, scopes, is_builtin)
+    result = ModuleGlobals()
+    statements = set(_module_statements(module.body))
+    if loops:
+        for x in module.body:
+            if isinstance(x, _LOOPS):
+                names = _loop_globals(x)
+                if names is not None:
+                    result.loops[x] = names
+
+    candidates = []
+    for name, bindings in analysis.bindings.items():
+        stmt = analysis.is_const(bindings, statements)
+        if stmt is not None:
+            result.consts.add(name)
+            result.const_bindings.add(stmt)
+        else:
+            candidates.append(name)
+    # the types of the constants and typed globals found so far. typing a global
+    # can only type the globals whose values read it, which are tried again
+    readers: dict[str, list[str]] = {}
+    for name in analysis.bindings:
+        for n in analysis.reads(name):
+            readers.setdefault(n, []).append(name)
+    types: dict[str, str] = {}
+    work = collections.deque(analysis.bindings)
+    queued = set(work)
+    while work:
+        name = work.popleft()
+        queued.discard(name)
+        t = analysis.typed(name, types)
+        if t is None:
+            continue
+        types[name] = t
+        for r in readers.get(name, ()):
+            if r not in types and r not in queued:
+                work.append(r)
+                queued.add(r)
+    result.types = {name: types[name] for name in candidates if name in types}
+
+    read = analysis.read_slowly(result.loops)
+    for name in candidates:
+        if name not in types and name in read:
+            result.slow[name] = analysis.bindings[name][0][1]
+    return result
@@ -0,0 +1,191 @@
+"""
+Elementwise numeric loops as Julia `@simd` loops.
+
+`for i in range(start, stop)` in a function is vectorized when every
+statement of its body is
+
+- a map `out[i] = e`, or
+- a reduction `acc += e`, `acc -= e`, `acc *= e`, `acc = min(acc, e)` or `acc = max(acc, e)`,
+
+where `e` is built from numbers, names the loop does not assign, `i`,
+items `xs[i]`, `+`, `-`, `*`, `/` and the builtins `abs`, `min` and `max`,
+and each accumulator is read by its own reduction only. Iterations then
+depend on each other through the reductions alone, which `@simd` may
+reorder: float sums can round differently than in Python.
+
+The `@simd` loop indexes without bounds checks. Unless the indexing is
+already proven in bounds (see `Py2Jl.bounds`), it runs behind a
+`jpy_simd_bounds` test that every indexed list covers the range, and the
+ordinary loop runs otherwise.
+"""
+from __future__ import annotations
+import ast
+import typing
+
+__all__ = ['NotVectorizable', 'ElementwiseLoop', 'VectorReport', 'elementwise_loop']
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_REDUCTIONS = (ast.Add, ast.Sub, ast.Mult)
+_FUNCTIONS = frozenset({'abs', 'min', 'max'})
+
+
+class NotVectorizable(Exception):
+    pass
+
+
+class ElementwiseLoop:
+    def __init__(self, start: ast.expr | None, stop: ast.expr):
+        # the range, `start` is None for 0
+        self.start = start
+        self.stop = stop
+        # the lists indexed, in order of appearance
+        self.lists: list[str] = []
+        # the `xs[i]` items read or assigned
+        self.items: set[ast.Subscript] = set()
+        self.maps = 0
+        self.reductions = 0
+
+    def describe(self) -> str:
+        kinds = []
+        if self.maps:
+            kinds.append(f"{self.maps} map{'s' if self.maps > 1 else ''}")
+        if self.reductions:
+            kinds.append(f"{self.reductions} reduction{'s' if self.reductions > 1 else ''}")
+        return " and ".join(kinds)
+
+
+class VectorReport:
+    """
+    the `for` loops of functions, and whether they were vectorized or why not,
+    enabled with `Compiler(..., vector_report=VectorReport())`.
+    """
+
+    def __init__(self):
+        # (file, line, vectorized, what the loop does or why it was not vectorized)
+        self.loops: list[tuple[str, int, bool, str]] = []
+
+    def add(self, filename: str, line: int, vectorized: bool, detail: str):
+        self.loops.append((filename, line, vectorized, detail))
+
+    def merge(self, other: VectorReport):
+        self.loops.extend(other.loops)
+
+    def report(self) -> str:
+        n = sum(vectorized for _, _, vectorized, _ in self.loops)
+        lines = [f"{n} of {len(self.loops)} loops vectorized"]
+        for filename, line, vectorized, detail in self.loops:
+            lines.append(f"{filename}, line {line}: {'vectorized' if vectorized else 'not vectorized'}, {detail}")
+        return "\n".join(lines)
+
+
+def _code(x: ast.AST) -> str:
+    return f"`{ast.unparse(x).splitlines()[0]}`"
+
+
+def _is_call(x: ast.expr, names: typing.Container[str], is_builtin: typing.Callable[[str], bool]) -> bool:
+    return (
+        isinstance(x, ast.Call) and isinstance(x.func, ast.Name) and x.func.id in names
+        and not x.keywords and not any(isinstance(arg, ast.Starred) for arg in x.args)
+        and is_builtin(x.func.id))
+
+
+def _pure(x: ast.expr, is_builtin: typing.Callable[[str], bool]) -> bool:
+    """
+    whether `x` can be evaluated twice: the range is both tested and iterated.
+    """
+    if isinstance(x, (ast.Name, ast.Constant)):
+        return True
+    if isinstance(x, ast.BinOp):
+        return _pure(x.left, is_builtin) and _pure(x.right, is_builtin)
+    if isinstance(x, ast.UnaryOp):
+        return _pure(x.operand, is_builtin)
+    return _is_call(x, ('len',), is_builtin) and len(x.args) == 1 and isinstance(x.args[0], ast.Name)  # type: ignore
+
+
+def elementwise_loop(x: ast.For, is_builtin: typing.Callable[[str], bool]) -> ElementwiseLoop:
+    """
+    raises `NotVectorizable` with the reason when `x` is not an elementwise loop.
+    """
+    it = x.iter
+    if not (_is_call(it, ('range',), is_builtin) and 1 <= len(it.args) <= 3):  # type: ignore
+        raise NotVectorizable("it does not iterate over a `range`")
+    if not isinstance(x.target, ast.Name):
+        raise NotVectorizable("its target is not a name")
+    args: list[ast.expr] = it.args  # type: ignore
+    if len(args) == 3 and not (isinstance(args[2], ast.Constant) and args[2].value == 1):
+        raise NotVectorizable("its step is not 1")
+    start, stop = (None, args[0]) if len(args) == 1 else (args[0], args[1])
+    for bound in (start, stop):
+        if bound is not None and not _pure(bound, is_builtin):
+            raise NotVectorizable(f"its bound {_code(bound)} may have side effects")
+
+    var = x.target.id
+    loop = ElementwiseLoop(start, stop)
+    accumulators: set[str] = set()
+    # the expressions computed per iteration
+    exprs: list[ast.expr] = []
+    for stmt in x.body:
+        if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Subscript) and isinstance(stmt.targets[0].value, ast.Name)):
+            target = stmt.targets[0]
+            if not (isinstance(target.slice, ast.Name) and target.slice.id == var):
+                raise NotVectorizable(f"{_code(target)} is not indexed by `{var}`")
+            loop.items.add(target)
+            if target.value.id not in loop.lists:  # type: ignore
+                loop.lists.append(target.value.id)  # type: ignore
+            exprs.append(stmt.value)
+            loop.maps += 1
+            continue
+        if isinstance(stmt, ast.AugAssign) and isinstance(stmt.target, ast.Name) and isinstance(stmt.op, _REDUCTIONS):
+            acc, value = stmt.target.id, stmt.value
+        elif (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)
+                and _is_call(stmt.value, ('min', 'max'), is_builtin) and len(stmt.value.args) == 2):  # type: ignore
+            acc = stmt.targets[0].id
+            a, b = stmt.value.args  # type: ignore
+            if isinstance(a, ast.Name) and a.id == acc:
+                value = b
+            elif isinstance(b, ast.Name) and b.id == acc:
+                value = a
+            else:
+                raise NotVectorizable(f"{_code(stmt)} assigns `{acc}` other than by a reduction")
+        else:
+            raise NotVectorizable(f"{_code(stmt)} is neither an elementwise assignment nor a reduction")
+        if acc == var or acc in accumulators:
+            raise NotVectorizable(f"`{acc}` is assigned more than once per iteration")
+        accumulators.add(acc)
+        exprs.append(value)
+        loop.reductions += 1
+
+    for e in exprs:
+        _elementwise(e, var, loop, is_builtin)
+    for e in exprs:
+        for n in ast.walk(e):
+            if isinstance(n, ast.Name) and n.id in accumulators:
+                raise NotVectorizable(f"the accumulator `{n.id}` is read in {_code(e)}")
+    if accumulators & set(loop.lists):
+        raise NotVectorizable(f"`{sorted(accumulators & set(loop.lists))[0]}` is both indexed and accumulated")
+    return loop
+
+
+def _elementwise(x: ast.expr, var: str, loop: ElementwiseLoop, is_builtin: typing.Callable[[str], bool]):
+    if isinstance(x, ast.Constant):
+        if not isinstance(x.value, (int, float)):
+            raise NotVectorizable(f"{_code(x)} is not a number")
+    elif isinstance(x, ast.Name):
+        pass
+    elif isinstance(x, ast.Subscript):
+        if not (isinstance(x.value, ast.Name) and isinstance(x.slice, ast.Name) and x.slice.id == var):
+            raise NotVectorizable(f"{_code(x)} is not indexed by `{var}`")
+        loop.items.add(x)
+        if x.value.id not in loop.lists:
+            loop.lists.append(x.value.id)
+    elif isinstance(x, ast.BinOp) and isinstance(x.op, _OPERATORS):
+        _elementwise(x.left, var, loop, is_builtin)
+        _elementwise(x.right, var, loop, is_builtin)
+    elif isinstance(x, ast.UnaryOp) and isinstance(x.op, (ast.USub, ast.UAdd)):
+        _elementwise(x.operand, var, loop, is_builtin)
+    elif _is_call(x, _FUNCTIONS, is_builtin) and x.args:  # type: ignore
+        for arg in x.args:  # type: ignore
+            _elementwise(arg, var, loop, is_builtin)
+    else:
+        raise NotVectorizable(f"{_code(x)} is not elementwise arithmetic")
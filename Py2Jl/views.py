@@ -0,0 +1,86 @@
+"""
+Slices read without copying.
+
+`xs[a:b]` copies the elements it selects. In a function, a slice is made a
+view sharing the elements of `xs` when it is only read where it is made:
+iterated by a `for` loop or a list, set or dict comprehension, indexed or
+sliced again, compared, tested for truth, or passed to a builtin that only
+reads it (`len`, `sum`, `min`, ...). A local that is assigned nothing but
+slices and is only read in these ways holds views as well.
+
+`xs` must be a parameter or local of the function, other than a cell, that
+the function itself never changes: all it does with `xs` is read it in the
+ways above or return it, so no slice sees `xs` change while it is in use.
+A list that is reachable from elsewhere could still be changed by a function
+called while a view of it is in use, which `slice_views=False` rules out.
+Generators are left out, since whoever resumes one can change `xs` in between.
+"""
+from __future__ import annotations
+import ast
+import typing
+from Py2Jl.astwalk import scope_nodes, is_read
+
+__all__ = ['find_views']
+
+
+def _is_slice(x: ast.AST) -> bool:
+    return isinstance(x, ast.Subscript) and isinstance(x.ctx, ast.Load) and isinstance(x.slice, ast.Slice)
+
+
+def find_views(
+        body: list[ast.stmt], locals: typing.Iterable[str], params: typing.Iterable[str],
+        is_builtin: typing.Callable[[str], bool]) -> set[ast.Subscript]:
+    """
+    the slices in a function body that can be views.
+    `locals` are the locals of the function that are not cells, and
+    `params` its parameters that are not cells.
+    """
+    nodes = list(scope_nodes(body))
+    names = set(locals) | set(params)
+    # the names the function only reads, and the locals among them that only hold slices
+    readonly = set(names)
+    holders = set(names).difference(params)
+    returned: set[str] = set()
+    for x, parent in nodes:
+        if not (isinstance(x, ast.Name) and x.id in names):
+            continue
+        if isinstance(x.ctx, ast.Load):
+            if isinstance(parent, ast.Return):
+                returned.add(x.id)
+            elif not is_read(x, parent, is_builtin):
+                readonly.discard(x.id)
+        elif isinstance(x.ctx, ast.Store):
+            if isinstance(parent, ast.AugAssign):
+                # `xs += ys` extends `xs` in place
+                readonly.discard(x.id)
+            elif not (isinstance(parent, ast.Assign) and parent.targets == [x] and _is_slice(parent.value)):
+                holders.discard(x.id)
+        else:
+            readonly.discard(x.id)
+    for x, _ in nodes:
+        if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            holders.discard(x.name)
+        elif isinstance(x, (ast.Import, ast.ImportFrom)):
+            holders.difference_update((a.asname or a.name).split('.')[0] for a in x.names)
+        elif isinstance(x, ast.ExceptHandler) and x.name:
+            holders.discard(x.name)
+    holders &= readonly
+    holders -= returned
+
+    views: set[ast.Subscript] = set()
+    # children come before their parents, so a slice of a slice is visited after the slice it is taken of
+    for x, parent in reversed(nodes):
+        if not _is_slice(x):
+            continue
+        base = x.value  # type: ignore
+        if not (isinstance(base, ast.Name) and base.id in readonly or base in views):
+            continue
+        if is_read(x, parent, is_builtin) or _holds(parent, x, holders):  # type: ignore
+            views.add(x)  # type: ignore
+    return views
+
+
+def _holds(parent: ast.AST | None, x: ast.expr, holders: set[str]) -> bool:
+    return (
+        isinstance(parent, ast.Assign) and parent.value is x
+        and isinstance(parent.targets[0], ast.Name) and parent.targets[0].id in holders)
@@ -0,0 +1,82 @@
+"""
+Compare the `pretty_doc` and `text` emission backends on a generated module.
+
+    python benchmarks/emit_backends.py [n_functions] [repeat]
+
+Building (`create_module`) and rendering are timed separately, as the best of
+`repeat` runs. Both backends must produce the same bytes; the script fails otherwise.
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Py2Jl import Compiler
+
+TEMPLATE = '''
+def f{i}(x, y, /, *, k={i}):
+    s = 0
+    for e in x:
+        if e < y:
+            s = s + e * k
+        elif e == y:
+            s -= 1
+        else:
+            s = s + (lambda a, /: a + {i})(e)
+    while s > 100:
+        s = s // 2
+    try:
+        d = {{1: s, 2: [e + 1 for e in x if e > 0]}}
+    except ValueError as err:
+        raise err
+    return s + d[1]
+
+def g{i}(n, /):
+    i = 0
+    while i < n:
+        yield i * {i}
+        i += 1
+
+r{i} = f{i}([1, 2, 3], 2, k=3) + sum(g{i}(10))
+'''
+
+
+def generate(n: int) -> str:
+    return "".join(TEMPLATE.format(i=i) for i in range(n))
+
+
+def measure(src: str, backend: str, repeat: int):
+    """
+    the best times to build the document of `src` and to render it, and the rendered code.
+    """
+    build = render = float('inf')
+    out = ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        doc = Compiler(src, 'bench.py', backend=backend).create_module()
+        built = time.perf_counter()
+        chunks: list[str] = []
+        doc.render(chunks.append)  # type: ignore
+        out = "".join(chunks)
+        build = min(build, built - start)
+        render = min(render, time.perf_counter() - built)
+    return build, render, out
+
+
+def main(n: int = 200, repeat: int = 5):
+    src = generate(n)
+    results = {}
+    for backend in ('pretty_doc', 'text'):
+        results[backend] = measure(src, backend, repeat)
+    if results['pretty_doc'][2] != results['text'][2]:
+        sys.exit("backends disagree on the generated code")
+    total_pd = sum(results['pretty_doc'][:2])
+    print(f"{n} functions, {len(src.splitlines())} source lines, {len(results['text'][2].splitlines())} output lines")
+    for backend, (build, render, _) in results.items():
+        total = build + render
+        print(f"{backend:10}: {total * 1000:8.1f} ms  (build {build * 1000:8.1f} ms, render {render * 1000:7.1f} ms)"
+              f"  {total_pd / total:.2f}x")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
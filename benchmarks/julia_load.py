@@ -0,0 +1,88 @@
+"""
+Julia load and compile time of a call-heavy generated module, with and without direct calls.
+
+    python benchmarks/julia_load.py [n_functions] [calls_per_function]
+
+Needs `julia` on the PATH; `Py2JlRuntime` is loaded from `runtime-support`.
+For each variant, a fresh Julia process reports the time to `include` the
+transpiled module (parsing, lowering, top-level evaluation) and the time of
+the first call of every function (type inference and code generation).
+"""
+from __future__ import annotations
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Py2Jl import Compiler
+
+RUNTIME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'runtime-support', 'Py2JlRuntime')
+
+DRIVER = '''
+using Py2JlRuntime
+t_include = @elapsed include(ARGS[1])
+t_first_call = @elapsed for i in 0:{n} - 1
+    getfield(Main, Symbol("f", i))(1, 2)
+end
+println(t_include, " ", t_first_call)
+'''
+
+
+def generate(n: int, calls: int) -> str:
+    lines = [
+        "def add(a, b, /):",
+        "    return a + b",
+        "",
+        "def scale(a, /, *, k=2):",
+        "    return a * k",
+        "",
+    ]
+    for f in range(n):
+        lines.append(f"def f{f}(x, y, /):")
+        for c in range(calls):
+            if c % 2:
+                lines.append(f"    x = scale(add(x, {c}), k=y)")
+            else:
+                lines.append(f"    y = add(scale(y), add(x, {c}))")
+        lines.append("    return x + y")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def transpile(src: str, out: str, **options):
+    doc = Compiler(src, 'calls.py', **options).create_module()
+    with open(out, 'w', encoding='utf-8') as f:
+        doc.render(f.write)  # type: ignore
+
+
+def measure(julia: str, driver: str, module: str):
+    result = subprocess.run(
+        [julia, '--startup-file=no', f'--project={RUNTIME}', driver, module],
+        check=True, capture_output=True, text=True)
+    t_include, t_first_call = map(float, result.stdout.split()[-2:])
+    return t_include, t_first_call
+
+
+def main(n: int = 200, calls: int = 20):
+    julia = shutil.which('julia')
+    if julia is None:
+        sys.exit("julia is not on the PATH")
+    src = generate(n, calls)
+    with tempfile.TemporaryDirectory() as tmp:
+        driver = os.path.join(tmp, 'driver.jl')
+        with open(driver, 'w') as f:
+            f.write(DRIVER.format(n=n))
+        print(f"{n} functions, {n * calls} calls")
+        for label, direct_calls in (('jpy_call', False), ('direct', True)):
+            module = os.path.join(tmp, f'{label}.jl')
+            transpile(src, module, direct_calls=direct_calls)
+            size = os.path.getsize(module)
+            t_include, t_first_call = measure(julia, driver, module)
+            print(
+                f"{label:<9}: {size / 1024:8.1f} KiB  include {t_include * 1000:8.1f} ms  "
+                f"first calls {t_first_call * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
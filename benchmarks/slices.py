@@ -0,0 +1,118 @@
+"""
+Run time of slice-heavy generated code, with slices copied and read as views.
+
+    python benchmarks/slices.py [n] [repeat]
+
+Needs `julia` on the PATH; `Py2JlRuntime` is loaded from `runtime-support`.
+Each kernel runs with copied slices (`slice_views=False`), with the views the
+compiler proves safe (the default) and with every slice read as a view
+(`readonly_slices=True`), which also covers `total`, whose slices are passed
+to a recursive call. For each variant, a fresh Julia process includes the
+transpiled module, calls every kernel once to compile it, then reports the
+best of `repeat` timed calls.
+"""
+from __future__ import annotations
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Py2Jl import Compiler
+
+RUNTIME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'runtime-support', 'Py2JlRuntime')
+
+SOURCE = '''
+def windows(n, /):
+    xs = [i * 7919 % 1009 for i in range(n)]
+    best = 0
+    for i in range(n):
+        s = sum(xs[i:i + 64])
+        if s > best:
+            best = s
+    return best
+
+def tails(n, /):
+    xs = [i % 13 for i in range(n)]
+    total = 0
+    for i in range(0, n, 256):
+        for x in xs[i:]:
+            total += x
+    return total
+
+def backwards(n, /):
+    xs = [i % 5 for i in range(n)]
+    total = 0
+    for k in range(64):
+        for x in xs[-1:-n // 2:-1]:
+            total += x * k
+    return total
+
+def halves(xs, n, /):
+    if n == 1:
+        return xs[0]
+    h = n // 2
+    return halves(xs[:h], h) + halves(xs[h:], n - h)
+
+def total(n, /):
+    xs = [i % 11 for i in range(n)]
+    return halves(xs, n)
+'''
+
+KERNELS = ('windows', 'tails', 'backwards', 'total')
+VARIANTS = {
+    'copy': dict(slice_views=False),
+    'views': dict(),
+    'readonly': dict(readonly_slices=True),
+}
+
+DRIVER = '''
+using Py2JlRuntime
+include(ARGS[1])
+for f in ({kernels})
+    f(10)
+    t = minimum(@elapsed(f({n})) for _ in 1:{repeat})
+    println(nameof(f), " ", t)
+end
+'''
+
+
+def transpile(out: str, **options):
+    doc = Compiler(SOURCE, 'slices.py', **options).create_module()
+    with open(out, 'w', encoding='utf-8') as f:
+        doc.render(f.write)  # type: ignore
+
+
+def measure(julia: str, driver: str, module: str) -> dict[str, float]:
+    result = subprocess.run(
+        [julia, '--startup-file=no', f'--project={RUNTIME}', driver, module],
+        check=True, capture_output=True, text=True)
+    times = {}
+    for line in result.stdout.splitlines()[-len(KERNELS):]:
+        name, t = line.split()
+        times[name] = float(t)
+    return times
+
+
+def main(n: int = 100_000, repeat: int = 5):
+    julia = shutil.which('julia')
+    if julia is None:
+        sys.exit("julia is not on the PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        driver = os.path.join(tmp, 'driver.jl')
+        with open(driver, 'w') as f:
+            f.write(DRIVER.format(kernels=", ".join(KERNELS), n=n, repeat=repeat))
+        print(f"n = {n}, best of {repeat}")
+        results = {}
+        for label, options in VARIANTS.items():
+            module = os.path.join(tmp, f'{label}.jl')
+            transpile(module, **options)
+            results[label] = measure(julia, driver, module)
+        for k in KERNELS:
+            copy = results['copy'][k]
+            cells = [f"{label} {results[label][k] * 1000:8.2f} ms ({copy / results[label][k]:.2f}x)" for label in VARIANTS]
+            print(f"{k:<10}: " + "  ".join(cells))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
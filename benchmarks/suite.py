@@ -0,0 +1,136 @@
+"""
+Transpiler throughput benchmarks.
+
+    python benchmarks/suite.py --out results.json
+    python benchmarks/suite.py --out new.json --compare_to results.json --threshold 0.1
+
+Each case is a synthetic module (see `synth.py`) scaled along one axis.
+Parse (`ast.parse` plus scope analysis), transform (`create_module`) and render
+times are measured separately, as the best of `--repeat` runs; peak memory is
+measured in an extra traced run. With `--compare_to`, every metric that grew by more
+than `--threshold` over the baseline is reported and the exit code is 1.
+"""
+from __future__ import annotations
+import ast
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from wisepy2 import wise
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Py2Jl import Compiler, __version__
+import synth
+
+SCALES = {
+    'functions': (25, 100, 400),
+    'statements': (10, 40, 160),
+    'depth': (4, 16, 64),
+    'comprehensions': (0, 4, 16),
+    'literal_size': (8, 64, 512),
+}
+
+METRICS = ('parse_s', 'transform_s', 'render_s', 'peak_bytes')
+
+
+def cases(quick: bool):
+    yield 'default', {}
+    for axis, values in SCALES.items():
+        for v in values[:2] if quick else values:
+            yield f"{axis}={v}", {axis: v}
+
+
+def run_once(src: str, backend: str):
+    t0 = time.perf_counter()
+    tree = ast.parse(src, 'bench.py')
+    compiler = Compiler(tree, 'bench.py', backend=backend)
+    t1 = time.perf_counter()
+    doc = compiler.create_module()
+    t2 = time.perf_counter()
+    doc.render(io.StringIO().write)  # type: ignore
+    t3 = time.perf_counter()
+    return t1 - t0, t2 - t1, t3 - t2
+
+
+def measure(src: str, backend: str, repeat: int) -> dict:
+    best = [float('inf')] * 3
+    for _ in range(repeat):
+        best = [min(a, b) for a, b in zip(best, run_once(src, backend))]
+    tracemalloc.start()
+    try:
+        run_once(src, backend)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return dict(zip(METRICS, (*best, peak)))
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, new in results['cases'].items():
+        old = baseline['cases'].get(name)
+        if old is None or 'error' in old or 'error' in new:
+            continue
+        for metric in METRICS:
+            if old[metric] > 0 and new[metric] > old[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {old[metric]:.4g} -> {new[metric]:.4g} "
+                    f"(+{(new[metric] / old[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(
+        *, out: str = '', compare_to: str = '', threshold: float = 0.1,
+        repeat: int = 3, backend: str = 'pretty_doc', quick: bool = False):
+    """
+    run the benchmark suite; `--compare_to baseline.json` flags regressions above `--threshold`.
+    """
+    results: dict = {
+        'meta': {
+            'py2jl': __version__,
+            'python': platform.python_version(),
+            'backend': backend,
+            'repeat': repeat,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'cases': {},
+    }
+    for name, params in cases(quick):
+        src = synth.generate(**params)
+        entry: dict = {'params': {**synth.DEFAULTS, **params}, 'source_lines': src.count('\n')}
+        try:
+            entry.update(measure(src, backend, repeat))
+        except RecursionError:
+            entry['error'] = 'RecursionError'
+        results['cases'][name] = entry
+        if 'error' in entry:
+            print(f"{name:<22} {entry['error']}", file=sys.stderr)
+        else:
+            print(
+                f"{name:<22} parse {entry['parse_s'] * 1000:8.1f} ms  "
+                f"transform {entry['transform_s'] * 1000:8.1f} ms  "
+                f"render {entry['render_s'] * 1000:8.1f} ms  "
+                f"peak {entry['peak_bytes'] / 2 ** 20:7.1f} MiB", file=sys.stderr)
+
+    if out:
+        with open(out, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if compare_to:
+        with open(compare_to) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions above {threshold * 100:.0f}% against {compare_to}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    wise(main)()  # type: ignore
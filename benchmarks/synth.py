@@ -0,0 +1,63 @@
+"""
+Synthetic Python modules for the compiler benchmarks.
+
+Modules scale along independent axes, and only use constructs the compiler supports:
+
+- functions:       number of top-level functions
+- statements:      straight-line statements per function body
+- depth:           nesting depth of one arithmetic expression per function
+- comprehensions:  list comprehensions per function
+- literal_size:    elements of one list and one dict literal per function
+"""
+from __future__ import annotations
+import random
+
+AXES = ('functions', 'statements', 'depth', 'comprehensions', 'literal_size')
+
+DEFAULTS = dict(functions=50, statements=20, depth=4, comprehensions=2, literal_size=8)
+
+
+def _nested_expr(rng: random.Random, depth: int) -> str:
+    expr = "x"
+    for i in range(depth):
+        op = rng.choice("+-*")
+        expr = f"({expr} {op} {i + 1})"
+    return expr
+
+
+def _statement(rng: random.Random, i: int) -> str:
+    kind = i % 5
+    if kind == 0:
+        return f"a{i} = x * {i} + y"
+    if kind == 1:
+        return f"if x < {i}:\n        y = y + {i}\n    else:\n        y = y - 1"
+    if kind == 2:
+        return f"for e in xs:\n        y += e"
+    if kind == 3:
+        return f"while y > {i * 10}:\n        y = y // 2"
+    return f"z = helper(x, y) if x > {i} else y"
+
+
+def generate(seed: int = 0, **params: int) -> str:
+    """
+    generate a module; missing parameters take their value from `DEFAULTS`.
+    """
+    p = {**DEFAULTS, **params}
+    rng = random.Random(seed)
+    lines = ["def helper(a, b, /):", "    return a + b", ""]
+    for f in range(p['functions']):
+        lines.append(f"def f{f}(x, y, xs, /):")
+        for i in range(p['statements']):
+            lines.append("    " + _statement(rng, i))
+        lines.append(f"    d = {_nested_expr(rng, p['depth'])}")
+        for i in range(p['comprehensions']):
+            lines.append(f"    c{i} = [e * {i} for e in xs if e > {i}]")
+        n = p['literal_size']
+        lines.append("    lit = [" + ", ".join(str(rng.randrange(1000)) for _ in range(n)) + "]")
+        lines.append("    tbl = {" + ", ".join(f"{k}: {rng.randrange(1000)}" for k in range(n)) + "}")
+        lines.append("    return y + d")
+        lines.append("")
+    lines.append("total = 0")
+    lines.append(f"for i in [{', '.join(map(str, range(10)))}]:")
+    lines.append(f"    total = total + f0(i, 1, [1, 2, 3])")
+    return "\n".join(lines) + "\n"
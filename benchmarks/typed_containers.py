@@ -0,0 +1,104 @@
+"""
+Run time of dict-heavy generated code, with `Any` containers and with inferred element types.
+
+    python benchmarks/typed_containers.py [n] [repeat]
+
+Needs `julia` on the PATH; `Py2JlRuntime` is loaded from `runtime-support`.
+For each variant, a fresh Julia process includes the transpiled module, calls
+every kernel once to compile it, then reports the best of `repeat` timed calls.
+"""
+from __future__ import annotations
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Py2Jl import Compiler
+
+RUNTIME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'runtime-support', 'Py2JlRuntime')
+
+SOURCE = '''
+def histogram(n, /):
+    counts = {}
+    for i in range(n):
+        k = i * 7919 % 1009
+        if k in counts:
+            counts[k] += 1
+        else:
+            counts[k] = 1
+    return counts
+
+def weights(n, /):
+    total = {}
+    for i in range(n):
+        k = i % 64
+        w = i * 0.5
+        if k in total:
+            total[k] += w
+        else:
+            total[k] = w
+    return total
+
+def distinct(n, /):
+    seen = {}
+    hits = 0
+    for i in range(n):
+        k = i * i % 4099
+        if k in seen:
+            hits += 1
+        seen[k] = True
+    return hits
+'''
+
+KERNELS = ('histogram', 'weights', 'distinct')
+
+DRIVER = '''
+using Py2JlRuntime
+include(ARGS[1])
+for f in ({kernels})
+    f(10)
+    t = minimum(@elapsed(f({n})) for _ in 1:{repeat})
+    println(nameof(f), " ", t)
+end
+'''
+
+
+def transpile(out: str, **options):
+    doc = Compiler(SOURCE, 'containers.py', **options).create_module()
+    with open(out, 'w', encoding='utf-8') as f:
+        doc.render(f.write)  # type: ignore
+
+
+def measure(julia: str, driver: str, module: str) -> dict[str, float]:
+    result = subprocess.run(
+        [julia, '--startup-file=no', f'--project={RUNTIME}', driver, module],
+        check=True, capture_output=True, text=True)
+    times = {}
+    for line in result.stdout.splitlines()[-len(KERNELS):]:
+        name, t = line.split()
+        times[name] = float(t)
+    return times
+
+
+def main(n: int = 1_000_000, repeat: int = 5):
+    julia = shutil.which('julia')
+    if julia is None:
+        sys.exit("julia is not on the PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        driver = os.path.join(tmp, 'driver.jl')
+        with open(driver, 'w') as f:
+            f.write(DRIVER.format(kernels=", ".join(KERNELS), n=n, repeat=repeat))
+        print(f"n = {n}, best of {repeat}")
+        results = {}
+        for label, typed in (('Any', False), ('typed', True)):
+            module = os.path.join(tmp, f'{label}.jl')
+            transpile(module, typed_containers=typed)
+            results[label] = measure(julia, driver, module)
+        for k in KERNELS:
+            untyped, typed = results['Any'][k], results['typed'][k]
+            print(f"{k:<10}: Any {untyped * 1000:8.2f} ms  typed {typed * 1000:8.2f} ms  ({untyped / typed:.2f}x)")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,87 @@
+using Py2JlRuntime
+# runtests/annotations.jl, line 1
+function var".total_2"(_xs′::PyVector)::Float64
+    xs = _xs′
+    local xs::PyVector
+    local s
+    local x
+    # runtests/annotations.jl, line 2
+    s = 0.0
+    # runtests/annotations.jl, line 3
+    for var".item_1" in xs
+        x = var".item_1"
+        # runtests/annotations.jl, line 4
+        s = jpy_iadd(s, x)
+        jpy_none;
+    end
+    # runtests/annotations.jl, line 5
+    return s
+    jpy_none;
+end
+const total = var".total_2"
+# runtests/annotations.jl, line 7
+function var".count_4"(_words′::Dict, _pair′::Tuple{Integer, Real})::Int
+    words = _words′
+    pair = _pair′
+    local words::Dict
+    local pair::Tuple{Int, Float64}
+    local n::Int
+    local w
+    # runtests/annotations.jl, line 8
+    n = 0
+    # runtests/annotations.jl, line 9
+    for var".item_3" in words
+        w = var".item_3"
+        # runtests/annotations.jl, line 10
+        n = jpy_iadd(n, words[w])
+        jpy_none;
+    end
+    # runtests/annotations.jl, line 11
+    return jpy_add(n, pair[0])
+    jpy_none;
+end
+const count = var".count_4"
+# runtests/annotations.jl, line 13
+println(total(jpy_list(1, 2)), total(jpy_list(0.5, 1.5)), total(jpy_list()));
+# runtests/annotations.jl, line 14
+println(count(jpy_dict("a"=>1, "b"=>2), (3, 4, )));
+# runtests/annotations.jl, line 16
+function var".nbytes_5"(_data′::AbstractVector{UInt8})::Int
+    data = _data′
+    local data::AbstractVector{UInt8}
+    # runtests/annotations.jl, line 17
+    return length(data)
+    jpy_none;
+end
+const nbytes = var".nbytes_5"
+# runtests/annotations.jl, line 19
+println(nbytes(b"ab"), nbytes(b"\x00\xff"));
+# runtests/annotations.jl, line 21
+function var".extend_7"(_xs′::PyVector, _n′::Integer)::PyVector
+    xs = _xs′
+    n = _n′
+    local xs::PyVector
+    local n::Int
+    local ys::PyVector{Float64}
+    local i::Int
+    # runtests/annotations.jl, line 22
+    ys = jpy_typed_list(Float64, 0.5)
+    # runtests/annotations.jl, line 23
+    for var".item_6" in 0:n - 1
+        i = var".item_6"
+        # runtests/annotations.jl, line 24
+        xs.append(i);
+        # runtests/annotations.jl, line 25
+        ys.append(i);
+        jpy_none;
+    end
+    # runtests/annotations.jl, line 26
+    return ys
+    jpy_none;
+end
+const extend = var".extend_7"
+# runtests/annotations.jl, line 28
+const zs = jpy_list(1, 2)
+# runtests/annotations.jl, line 29
+println(extend(zs, 2), zs);
+jpy_none;
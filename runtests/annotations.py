@@ -0,0 +1,29 @@
+def total(xs: list[float], /) -> float:
+    s = 0.0
+    for x in xs:
+        s += x
+    return s
+
+def count(words: dict[str, int], pair: tuple[int, float], /) -> int:
+    n: int = 0
+    for w in words:
+        n += words[w]
+    return n + pair[0]
+
+println(total([1, 2]), total([0.5, 1.5]), total([]))
+println(count({"a": 1, "b": 2}, (3, 4)))
+
+def nbytes(data: bytes, /) -> int:
+    return len(data)
+
+println(nbytes(b"ab"), nbytes(b"\x00\xff"))
+
+def extend(xs: list[float], n: int, /) -> list[float]:
+    ys: list[float] = [0.5]
+    for i in range(n):
+        xs.append(i)
+        ys.append(i)
+    return ys
+
+zs = [1, 2]
+println(extend(zs, 2), zs)
@@ -8,13 +8,12 @@ function var".sum_by_2"(_f′, _xs′)
     local s
     local e
     # runtests/benchmark.jl, line 2
-    s = jpy_literal(0)
+    s = 0
     # runtests/benchmark.jl, line 3
-    var".iter_1" = jpy_getiter(xs)
-    @noscope while jpy_movenext(var".iter_1")
-        e = jpy_getcurrent(var".iter_1")
+    for var".item_1" in xs
+        e = var".item_1"
         # runtests/benchmark.jl, line 4
-        s = jpy_add(s, jpy_call(f, (e, ), (;)))
+        s = jpy_add(s, f(e))
         jpy_none;
     end
     # runtests/benchmark.jl, line 5
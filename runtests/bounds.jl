@@ -0,0 +1,81 @@
+using Py2JlRuntime
+# runtests/bounds.jl, line 1
+function var".dot_3"(_xs′, _ys′)
+    xs = _xs′
+    ys = _ys′
+    local xs
+    local ys
+    local s
+    local i::Int
+    # runtests/bounds.jl, line 2
+    s = 0
+    # runtests/bounds.jl, line 3
+    if jpy_simd_bounds(0, length(xs), xs, ys)
+        @simd for var".item_1" in 0:(length(xs)) - 1
+            i = var".item_1"
+            # runtests/bounds.jl, line 4
+            s = jpy_iadd(s, jpy_mul(jpy_getindex_inbounds(xs, i), jpy_getindex_inbounds(ys, i)))
+            jpy_none;
+        end
+    else
+        for var".item_2" in 0:(length(xs)) - 1
+            i = var".item_2"
+            # runtests/bounds.jl, line 4
+            s = jpy_iadd(s, jpy_mul(jpy_getindex_inbounds(xs, i), ys[i]))
+            jpy_none;
+        end
+    end
+    # runtests/bounds.jl, line 5
+    return s
+    jpy_none;
+end
+const dot = var".dot_3"
+# runtests/bounds.jl, line 7
+function var".smooth_5"(_xs′)
+    xs = _xs′
+    local xs
+    local out
+    local i::Int
+    # runtests/bounds.jl, line 8
+    out = jpy_list(0, 0, 0, 0, 0)
+    # runtests/bounds.jl, line 9
+    for var".item_4" in 1:((length(xs) - 1)) - 1
+        i = var".item_4"
+        # runtests/bounds.jl, line 10
+        out[i] = jpy_add(jpy_add(jpy_getindex_inbounds(xs, (i - 1)), jpy_getindex_inbounds(xs, i)), jpy_getindex_inbounds(xs, (i + 1)))
+        # runtests/bounds.jl, line 11
+        jpy_setindex_inbounds(xs, jpy_iadd(jpy_getindex_inbounds(xs, i), 1), i);
+        jpy_none;
+    end
+    # runtests/bounds.jl, line 12
+    return out
+    jpy_none;
+end
+const smooth = var".smooth_5"
+# runtests/bounds.jl, line 14
+function var".evens_7"(_xs′)
+    xs = _xs′
+    local xs
+    local n
+    local i::Int
+    # runtests/bounds.jl, line 15
+    n = 0
+    # runtests/bounds.jl, line 16
+    for var".item_6" in 0:2:(length(xs)) - 1
+        i = var".item_6"
+        # runtests/bounds.jl, line 17
+        n = jpy_iadd(n, jpy_getindex_inbounds(xs, i))
+        jpy_none;
+    end
+    # runtests/bounds.jl, line 18
+    return n
+    jpy_none;
+end
+const evens = var".evens_7"
+# runtests/bounds.jl, line 20
+println(@jpy_all(jpy_eq(dot(jpy_list(1, 2, 3), jpy_list(4, 5, 6)), 32)));
+# runtests/bounds.jl, line 21
+println(@jpy_all(jpy_eq(smooth(jpy_list(1, 2, 3, 4, 5)), jpy_list(0, 6, 10, 13, 0))));
+# runtests/bounds.jl, line 22
+println(@jpy_all(jpy_eq(evens(jpy_list(1, 2, 3, 4, 5)), 9)));
+jpy_none;
@@ -0,0 +1,22 @@
+def dot(xs, ys, /):
+    s = 0
+    for i in range(len(xs)):
+        s += xs[i] * ys[i]
+    return s
+
+def smooth(xs, /):
+    out = [0, 0, 0, 0, 0]
+    for i in range(1, len(xs) - 1):
+        out[i] = xs[i - 1] + xs[i] + xs[i + 1]
+        xs[i] += 1
+    return out
+
+def evens(xs, /):
+    n = 0
+    for i in range(0, len(xs), 2):
+        n += xs[i]
+    return n
+
+println(dot([1, 2, 3], [4, 5, 6]) == 32)
+println(smooth([1, 2, 3, 4, 5]) == [0, 6, 10, 13, 0])
+println(evens([1, 2, 3, 4, 5]) == 9)
@@ -0,0 +1,177 @@
+using Py2JlRuntime
+var".norm"(self, args...; kwargs...) = getproperty(self, :norm)(args...; kwargs...)
+var".scale"(self, args...; kwargs...) = getproperty(self, :scale)(args...; kwargs...)
+var".__init__"(self, args...; kwargs...) = getproperty(self, :__init__)(args...; kwargs...)
+var".tick"(self, args...; kwargs...) = getproperty(self, :tick)(args...; kwargs...)
+var".__repr__"(self, args...; kwargs...) = getproperty(self, :__repr__)(args...; kwargs...)
+# runtests/classes.jl, line 1
+# runtests/classes.jl, line 4
+mutable struct Point
+    x::Float64
+    y::Float64
+end
+Point(x) = Point(x, 0.0)
+Point(; x, y = 0.0) = Point(x, y)
+# runtests/classes.jl, line 8
+function var".norm"(_self′::Point)
+    self = _self′
+    local self::Point
+    # runtests/classes.jl, line 9
+    return jpy_pow(((self.x * self.x) + (self.y * self.y)), 0.5)
+    jpy_none;
+end
+# runtests/classes.jl, line 11
+function var".scale"(_self′::Point, _k′)
+    self = _self′
+    k = _k′
+    local self::Point
+    local k
+    # runtests/classes.jl, line 12
+    self.x = jpy_imul(self.x, k)
+    # runtests/classes.jl, line 13
+    self.y = jpy_imul(self.y, k)
+    jpy_none;
+end
+Py2JlRuntime.jpy_repr(self::Point) = jpy_joinstr("Point(x=", jpy_repr(self.x), ", y=", jpy_repr(self.y), ")")
+Base.:(==)(self::Point, other::Point) = self.x == other.x && self.y == other.y
+Base.show(io::IO, self::Point) = print(io, jpy_str(self))
+# runtests/classes.jl, line 16
+struct Tag
+    name::String
+    aliases::PyVector
+end
+Tag(name) = Tag(name, jpy_list())
+Tag(; name, aliases = jpy_list()) = Tag(name, aliases)
+Py2JlRuntime.jpy_repr(self::Tag) = jpy_joinstr("Tag(name=", jpy_repr(self.name), ", aliases=", jpy_repr(self.aliases), ")")
+Base.:(==)(self::Tag, other::Tag) = self.name == other.name && self.aliases == other.aliases
+Base.hash(self::Tag, h::UInt) = hash((self.name, self.aliases, ), h)
+Base.show(io::IO, self::Tag) = print(io, jpy_str(self))
+# runtests/classes.jl, line 20
+mutable struct Counter
+    count::Any
+    step::Any
+    Counter(::PyUninit) = new()
+end
+function Counter(args...; kwargs...)
+    self = Counter(jpy_uninit)
+    var".__init__"(self, args...; kwargs...)
+    return self
+end
+# runtests/classes.jl, line 23
+function var".__init__"(_self′::Counter, _step′)
+    self = _self′
+    step = _step′
+    local self::Counter
+    local step
+    # runtests/classes.jl, line 24
+    self.count = 0
+    # runtests/classes.jl, line 25
+    self.step = step
+    jpy_none;
+end
+# runtests/classes.jl, line 27
+function var".tick"(_self′::Counter)
+    self = _self′
+    local self::Counter
+    # runtests/classes.jl, line 28
+    self.count = jpy_iadd(self.count, self.step)
+    # runtests/classes.jl, line 29
+    return self.count
+    jpy_none;
+end
+# runtests/classes.jl, line 31
+function var".__repr__"(_self′::Counter)
+    self = _self′
+    local self::Counter
+    # runtests/classes.jl, line 32
+    return jpy_joinstr("Counter(", jpy_str(self.count), ")")
+    jpy_none;
+end
+Py2JlRuntime.jpy_repr(self::Counter) = var".__repr__"(self)
+Base.show(io::IO, self::Counter) = print(io, jpy_str(self))
+# runtests/classes.jl, line 34
+var".class_1" = jpy_class("Animal", ())
+# runtests/classes.jl, line 35
+var".class_1".sound = "..."
+# runtests/classes.jl, line 37
+function var".__init___2"(_self′, _name′)
+    self = _self′
+    name = _name′
+    local self
+    local name
+    # runtests/classes.jl, line 38
+    self.name = name
+    jpy_none;
+end
+var".class_1".__init__ = var".__init___2"
+# runtests/classes.jl, line 40
+function var".speak_3"(_self′)
+    self = _self′
+    local self
+    # runtests/classes.jl, line 41
+    return jpy_joinstr(jpy_str(self.name), " says ", jpy_str(self.sound))
+    jpy_none;
+end
+var".class_1".speak = var".speak_3"
+jpy_none;
+const Animal = var".class_1"
+# runtests/classes.jl, line 43
+var".class_4" = jpy_class("Dog", (Animal, ))
+# runtests/classes.jl, line 44
+var".class_4".sound = "woof"
+# runtests/classes.jl, line 46
+function var".speak_5"(_self′)
+    self = _self′
+    local self
+    # runtests/classes.jl, line 47
+    return jpy_add(jpy_super(var".class_4", self).speak(), "!")
+    jpy_none;
+end
+var".class_4".speak = var".speak_5"
+jpy_none;
+const Dog = var".class_4"
+# runtests/classes.jl, line 49
+function var".total_7"(_points′)
+    points = _points′
+    local points
+    local s
+    local p
+    # runtests/classes.jl, line 50
+    s = 0.0
+    # runtests/classes.jl, line 51
+    for var".item_6" in points
+        p = var".item_6"
+        # runtests/classes.jl, line 52
+        s = jpy_iadd(s, var".norm"(p))
+        jpy_none;
+    end
+    # runtests/classes.jl, line 53
+    return s
+    jpy_none;
+end
+const total = var".total_7"
+# runtests/classes.jl, line 55
+const p = Point(3.0, 4.0)
+# runtests/classes.jl, line 56
+println(var".norm"(p));
+# runtests/classes.jl, line 57
+var".scale"(p, 2);
+# runtests/classes.jl, line 58
+println(p);
+# runtests/classes.jl, line 59
+println(@jpy_all(jpy_eq(Point(1.0), Point(1.0, 0.0))));
+# runtests/classes.jl, line 60
+println(Tag("a"));
+# runtests/classes.jl, line 61
+const c = Counter(3)
+# runtests/classes.jl, line 62
+var".tick"(c);
+# runtests/classes.jl, line 63
+println(var".tick"(c));
+# runtests/classes.jl, line 64
+println(jpy_repr(c));
+# runtests/classes.jl, line 65
+println(Dog("rex").speak());
+# runtests/classes.jl, line 66
+println(total(jpy_list(Point(3.0, 4.0), Point(6.0, 8.0))));
+jpy_none;
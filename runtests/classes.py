@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field
+
+@dataclass
+class Point:
+    x: float
+    y: float = 0.0
+
+    def norm(self):
+        return (self.x * self.x + self.y * self.y) ** 0.5
+
+    def scale(self, k, /):
+        self.x *= k
+        self.y *= k
+
+@dataclass(frozen=True)
+class Tag:
+    name: str
+    aliases: list = field(default_factory=list)
+
+class Counter:
+    __slots__ = ('count', 'step')
+
+    def __init__(self, step, /):
+        self.count = 0
+        self.step = step
+
+    def tick(self):
+        self.count += self.step
+        return self.count
+
+    def __repr__(self):
+        return f"Counter({self.count})"
+
+class Animal:
+    sound = "..."
+
+    def __init__(self, name, /):
+        self.name = name
+
+    def speak(self):
+        return f"{self.name} says {self.sound}"
+
+class Dog(Animal):
+    sound = "woof"
+
+    def speak(self):
+        return super().speak() + "!"
+
+def total(points, /):
+    s = 0.0
+    for p in points:
+        s += p.norm()
+    return s
+
+p = Point(3.0, y=4.0)
+println(p.norm())
+p.scale(2)
+println(p)
+println(Point(1.0) == Point(1.0, 0.0))
+println(Tag("a"))
+c = Counter(3)
+c.tick()
+println(c.tick())
+println(repr(c))
+println(Dog("rex").speak())
+println(total([Point(3.0, 4.0), Point(6.0, 8.0)]))
@@ -0,0 +1,115 @@
+using Py2JlRuntime
+# runtests/closures.jl, line 1
+function var".scaled_1"(_xs′, _k′)
+    xs = _xs′
+    k = _k′
+    local xs
+    local k
+    local offset
+    # runtests/closures.jl, line 2
+    offset = jpy_mul(k, 10)
+    # runtests/closures.jl, line 3
+    return (let k = k, offset = offset
+        jpy_listcomp(jpy_add(jpy_mul(x, k), offset) for x in xs)
+    end)
+    jpy_none;
+end
+const scaled = var".scaled_1"
+# runtests/closures.jl, line 5
+function var".adders_2"(_n′)
+    n = _n′
+    local n
+    local base
+    # runtests/closures.jl, line 6
+    base = jpy_mul(n, 2)
+    # runtests/closures.jl, line 7
+    return (let n = n, base = base
+        jpy_listcomp((function (_x′)
+            x = _x′
+            local x
+            return jpy_add(jpy_add(x, base), n)
+        end) for _ in 0:2)
+    end)
+    jpy_none;
+end
+const adders = var".adders_2"
+# runtests/closures.jl, line 9
+function var".counter_5"(_steps′)
+    steps = _steps′
+    local steps
+    local count::Base.RefValue{Int}
+    local inc
+    local _::Int
+    # runtests/closures.jl, line 10
+    count = Ref{Int}(0)
+    # runtests/closures.jl, line 11
+    function var".inc_3"()
+        # runtests/closures.jl, line 12
+        # runtests/closures.jl, line 13
+        count[] = jpy_iadd(count[], 2)
+        jpy_none;
+    end
+    inc = var".inc_3"
+    # runtests/closures.jl, line 14
+    for var".item_4" in 0:steps - 1
+        _ = var".item_4"
+        # runtests/closures.jl, line 15
+        inc();
+        jpy_none;
+    end
+    # runtests/closures.jl, line 16
+    return count[]
+    jpy_none;
+end
+const counter = var".counter_5"
+# runtests/closures.jl, line 18
+function var".average_7"(_xs′)
+    xs = _xs′
+    local xs
+    local total::Base.RefValue{Float64}
+    local halve
+    # runtests/closures.jl, line 19
+    total = Ref{Float64}(0.0)
+    # runtests/closures.jl, line 20
+    function var".halve_6"()
+        # runtests/closures.jl, line 21
+        # runtests/closures.jl, line 22
+        total[] = jpy_div(total[], 2)
+        jpy_none;
+    end
+    halve = var".halve_6"
+    # runtests/closures.jl, line 23
+    total[] = 8.0
+    # runtests/closures.jl, line 24
+    halve();
+    # runtests/closures.jl, line 25
+    return total[]
+    jpy_none;
+end
+const average = var".average_7"
+# runtests/closures.jl, line 27
+function var".late_8"()
+    local f
+    local y
+    # runtests/closures.jl, line 28
+    f = (function ()
+        return y
+    end)
+    # runtests/closures.jl, line 29
+    y = 3
+    # runtests/closures.jl, line 30
+    return f()
+    jpy_none;
+end
+const late = var".late_8"
+# runtests/closures.jl, line 32
+println(@jpy_all(jpy_eq(scaled(jpy_list(1, 2, 3), 2), jpy_list(22, 24, 26))));
+# runtests/closures.jl, line 33
+println(@jpy_all(jpy_eq(adders(1)[2](1), 4)));
+# runtests/closures.jl, line 34
+println(@jpy_all(jpy_eq(counter(5), 10)));
+# runtests/closures.jl, line 35
+println(@jpy_all(jpy_eq(average(jpy_list(1.0)), 4.0)));
+# runtests/closures.jl, line 36
+println(@jpy_all(jpy_eq(late(), 3)));
+jpy_none;
@@ -0,0 +1,36 @@
+def scaled(xs, k, /):
+    offset = k * 10
+    return [x * k + offset for x in xs]
+
+def adders(n, /):
+    base = n * 2
+    return [lambda x, /: x + base + n for _ in range(3)]
+
+def counter(steps, /):
+    count = 0
+    def inc():
+        nonlocal count
+        count += 2
+    for _ in range(steps):
+        inc()
+    return count
+
+def average(xs, /):
+    total = 0.0
+    def halve():
+        nonlocal total
+        total = total / 2
+    total = 8.0
+    halve()
+    return total
+
+def late():
+    f = lambda: y
+    y = 3
+    return f()
+
+println(scaled([1, 2, 3], 2) == [22, 24, 26])
+println(adders(1)[2](1) == 4)
+println(counter(5) == 10)
+println(average([1.0]) == 4.0)
+println(late() == 3)
@@ -0,0 +1,76 @@
+using Py2JlRuntime
+# runtests/comprehensions.jl, line 1
+function var".squares_1"(_xs′)
+    xs = _xs′
+    local xs
+    # runtests/comprehensions.jl, line 2
+    return jpy_listcomp(jpy_mul(x, x) for x in xs)
+    jpy_none;
+end
+const squares = var".squares_1"
+# runtests/comprehensions.jl, line 4
+function var".large_2"(_n′)
+    n = _n′
+    local n
+    # runtests/comprehensions.jl, line 5
+    return jpy_setcomp(i for i in 0:n - 1 if jpy_bool(@jpy_all(jpy_gt(i, 2))))
+    jpy_none;
+end
+const large = var".large_2"
+# runtests/comprehensions.jl, line 7
+function var".table_3"(_items′)
+    items = _items′
+    local items
+    # runtests/comprehensions.jl, line 8
+    return jpy_dictcomp(k => v for (k, v) in items)
+    jpy_none;
+end
+const table = var".table_3"
+# runtests/comprehensions.jl, line 10
+function var".pairs_4"(_n′)
+    n = _n′
+    local n
+    # runtests/comprehensions.jl, line 11
+    return jpy_listcomp((i, j, ) for i in 0:n - 1 for j in 0:i - 1 if jpy_bool(@jpy_all(jpy_gt(j, 0))))
+    jpy_none;
+end
+const pairs = var".pairs_4"
+# runtests/comprehensions.jl, line 13
+function var".flat_5"(_rows′)
+    rows = _rows′
+    local rows
+    # runtests/comprehensions.jl, line 14
+    return jpy_listcomp(Iterators.flatten((x for x in row if jpy_bool(x)) for row in rows if jpy_bool(row)))
+    jpy_none;
+end
+const flat = var".flat_5"
+# runtests/comprehensions.jl, line 16
+function var".shadow_6"(_xs′)
+    xs = _xs′
+    local xs
+    local x::Int
+    local ys
+    # runtests/comprehensions.jl, line 17
+    x = -1
+    # runtests/comprehensions.jl, line 18
+    ys = jpy_listcomp(Any, (x for x in xs))
+    # runtests/comprehensions.jl, line 19
+    return x
+    jpy_none;
+end
+const shadow = var".shadow_6"
+# runtests/comprehensions.jl, line 21
+println(@jpy_all(jpy_eq(sum(squares(jpy_list(1, 2, 3))), 14)));
+# runtests/comprehensions.jl, line 22
+println(@jpy_all(jpy_eq(large(6), jpy_set(3, 4, 5))));
+# runtests/comprehensions.jl, line 23
+println(@jpy_all(jpy_eq(table(jpy_list(("a", 0, ), ("b", 1, ))), jpy_dict("a"=>0, "b"=>1))));
+# runtests/comprehensions.jl, line 24
+println(@jpy_all(jpy_eq(sum((jpy_add(jpy_mul(i, 10), j) for (i, j) in pairs(4))), 84)));
+# runtests/comprehensions.jl, line 25
+println(@jpy_all(jpy_eq(sum(flat(jpy_list(jpy_list(1, 0), jpy_list(), jpy_list(2)))), 3)));
+# runtests/comprehensions.jl, line 26
+println(@jpy_all(jpy_eq(sum((x for x in 0:4)), 10)));
+# runtests/comprehensions.jl, line 27
+println(@jpy_all(jpy_eq(shadow(jpy_list(1, 2)), -1)));
+jpy_none;
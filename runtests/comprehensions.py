@@ -0,0 +1,27 @@
+def squares(xs, /):
+    return [x * x for x in xs]
+
+def large(n, /):
+    return {i for i in range(n) if i > 2}
+
+def table(items, /):
+    return {k: v for k, v in items}
+
+def pairs(n, /):
+    return [(i, j) for i in range(n) for j in range(i) if j > 0]
+
+def flat(rows, /):
+    return [x for row in rows if row for x in row if x]
+
+def shadow(xs, /):
+    x = -1
+    ys = [x for x in xs]
+    return x
+
+println(sum(squares([1, 2, 3])) == 14)
+println(large(6) == {3, 4, 5})
+println(table([("a", 0), ("b", 1)]) == {"a": 0, "b": 1})
+println(sum(i * 10 + j for i, j in pairs(4)) == 84)
+println(sum(flat([[1, 0], [], [2]])) == 3)
+println(sum(x for x in range(5)) == 10)
+println(shadow([1, 2]) == -1)
@@ -0,0 +1,86 @@
+using Py2JlRuntime
+const var".const_3" = jpy_typed_list(Int, 1, 2)
+const var".const_6" = jpy_typed_list(Int, 3, 1, 2)
+# runtests/containers.jl, line 1
+function var".g_1"(_xs′)
+    xs = _xs′
+    local xs
+    # runtests/containers.jl, line 2
+    xs.append(1.5);
+    jpy_none;
+end
+const g = var".g_1"
+# runtests/containers.jl, line 4
+function var".passed_then_grown_2"()
+    local xs
+    # runtests/containers.jl, line 5
+    xs = jpy_list(1, 2)
+    # runtests/containers.jl, line 6
+    g(xs);
+    # runtests/containers.jl, line 7
+    xs.append(1.5);
+    # runtests/containers.jl, line 8
+    return xs
+    jpy_none;
+end
+const passed_then_grown = var".passed_then_grown_2"
+# runtests/containers.jl, line 10
+function var".passed_directly_4"()
+    # runtests/containers.jl, line 11
+    g(jpy_list(1, 2));
+    # runtests/containers.jl, line 12
+    return length(var".const_3")
+    jpy_none;
+end
+const passed_directly = var".passed_directly_4"
+# runtests/containers.jl, line 14
+function var".stored_other_type_5"()
+    local d
+    # runtests/containers.jl, line 15
+    d = jpy_dict("a"=>1)
+    # runtests/containers.jl, line 16
+    d["b"] = "x"
+    # runtests/containers.jl, line 17
+    return d
+    jpy_none;
+end
+const stored_other_type = var".stored_other_type_5"
+# runtests/containers.jl, line 19
+function var".kept_7"()
+    # runtests/containers.jl, line 20
+    return sorted(var".const_6")
+    jpy_none;
+end
+const kept = var".kept_7"
+# runtests/containers.jl, line 22
+println(passed_then_grown());
+# runtests/containers.jl, line 23
+println(passed_directly());
+# runtests/containers.jl, line 24
+println(stored_other_type());
+# runtests/containers.jl, line 25
+println(kept());
+# runtests/containers.jl, line 27
+function var".comprehension_grown_8"()
+    local ys
+    # runtests/containers.jl, line 28
+    ys = jpy_listcomp(Any, (x for x in 0:2))
+    # runtests/containers.jl, line 29
+    ys[0] = 1.5
+    # runtests/containers.jl, line 30
+    return ys
+    jpy_none;
+end
+const comprehension_grown = var".comprehension_grown_8"
+# runtests/containers.jl, line 32
+function var".comprehension_read_9"()
+    # runtests/containers.jl, line 33
+    return sum(jpy_listcomp(jpy_mul(x, x) for x in 0:2))
+    jpy_none;
+end
+const comprehension_read = var".comprehension_read_9"
+# runtests/containers.jl, line 35
+println(comprehension_grown());
+# runtests/containers.jl, line 36
+println(comprehension_read());
+jpy_none;
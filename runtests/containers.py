@@ -0,0 +1,36 @@
+def g(xs, /):
+    xs.append(1.5)
+
+def passed_then_grown():
+    xs = [1, 2]
+    g(xs)
+    xs.append(1.5)
+    return xs
+
+def passed_directly():
+    g([1, 2])
+    return len([1, 2])
+
+def stored_other_type():
+    d = {"a": 1}
+    d["b"] = "x"
+    return d
+
+def kept():
+    return sorted([3, 1, 2])
+
+println(passed_then_grown())
+println(passed_directly())
+println(stored_other_type())
+println(kept())
+
+def comprehension_grown():
+    ys = [x for x in range(3)]
+    ys[0] = 1.5
+    return ys
+
+def comprehension_read():
+    return sum([x * x for x in range(3)])
+
+println(comprehension_grown())
+println(comprehension_read())
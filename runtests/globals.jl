@@ -0,0 +1,70 @@
+using Py2JlRuntime
+global total::Int
+global ticks::Float64
+global i::Int
+global n::Int
+# runtests/globals.jl, line 1
+const scale = 3
+# runtests/globals.jl, line 2
+total = 0
+# runtests/globals.jl, line 3
+ticks = 0.0
+# runtests/globals.jl, line 4
+const names = jpy_list()
+# runtests/globals.jl, line 6
+function var".tick_1"()
+    # runtests/globals.jl, line 7
+    global total
+    # runtests/globals.jl, line 8
+    total = jpy_iadd(total, scale)
+    jpy_none;
+end
+const tick = var".tick_1"
+# runtests/globals.jl, line 10
+function var".label_2"(_x′)
+    x = _x′
+    local x
+    # runtests/globals.jl, line 11
+    return names[x]
+    jpy_none;
+end
+const label = var".label_2"
+# runtests/globals.jl, line 13
+function var".loop_3"()
+    global i
+    global ticks
+    for var".item_4" in 0:4
+        i = var".item_4"
+        # runtests/globals.jl, line 14
+        tick();
+        # runtests/globals.jl, line 15
+        ticks = jpy_iadd(ticks, 0.5)
+        # runtests/globals.jl, line 16
+        names.append(jpy_mul(i, scale));
+        jpy_none;
+    end
+end
+var".loop_3"();
+# runtests/globals.jl, line 18
+n = 10
+# runtests/globals.jl, line 19
+function var".loop_5"()
+    global n
+    @noscope while jpy_bool(@jpy_all(jpy_gt(n, 1)))
+        # runtests/globals.jl, line 20
+        n = jpy_floordiv(n, 2)
+        jpy_none;
+    end
+end
+var".loop_5"();
+# runtests/globals.jl, line 22
+println(@jpy_all(jpy_eq(total, 15)));
+# runtests/globals.jl, line 23
+println(@jpy_all(jpy_eq(ticks, 2.5)));
+# runtests/globals.jl, line 24
+println(@jpy_all(jpy_eq(i, 4)));
+# runtests/globals.jl, line 25
+println(@jpy_all(jpy_eq(label(2), 6)));
+# runtests/globals.jl, line 26
+println(@jpy_all(jpy_eq(n, 1)));
+jpy_none;
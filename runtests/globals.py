@@ -0,0 +1,26 @@
+scale = 3
+total = 0
+ticks = 0.0
+names = []
+
+def tick():
+    global total
+    total += scale
+
+def label(x, /):
+    return names[x]
+
+for i in range(5):
+    tick()
+    ticks += 0.5
+    names.append(i * scale)
+
+n = 10
+while n > 1:
+    n = n // 2
+
+println(total == 15)
+println(ticks == 2.5)
+println(i == 4)
+println(label(2) == 6)
+println(n == 1)
@@ -0,0 +1,89 @@
+using Py2JlRuntime
+const var".const_1" = jpy_typed_list(Int, 1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1)
+const var".const_2" = ("M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I", )
+const var".const_6" = jpy_typed_set(String, "a", "e", "i", "o", "u")
+const var".const_8" = jpy_typed_dict(Int, String, 0=>"Mon", 1=>"Tue", 2=>"Wed", 3=>"Thu", 4=>"Fri", 5=>"Sat", 6=>"Sun")
+# runtests/hoist.jl, line 1
+const DIGITS = "0123456789abcdef"
+# runtests/hoist.jl, line 3
+function var".roman_5"(_n′)
+    n = _n′
+    local n
+    local values
+    local numerals
+    local out
+    local i::Int
+    # runtests/hoist.jl, line 4
+    values = var".const_1"
+    # runtests/hoist.jl, line 5
+    numerals = var".const_2"
+    # runtests/hoist.jl, line 6
+    out = ""
+    # runtests/hoist.jl, line 7
+    var".buffer_3" = jpy_strbuffer(out)
+    for var".item_4" in 0:(length(values)) - 1
+        i = var".item_4"
+        # runtests/hoist.jl, line 8
+        @noscope while jpy_bool(@jpy_all(jpy_ge(n, jpy_getindex_inbounds(values, i))))
+            # runtests/hoist.jl, line 9
+            jpy_strappend(var".buffer_3", numerals[i]);
+            # runtests/hoist.jl, line 10
+            n = jpy_isub(n, jpy_getindex_inbounds(values, i))
+            jpy_none;
+        end
+        jpy_none;
+    end
+    out = jpy_strtake(var".buffer_3")
+    # runtests/hoist.jl, line 11
+    return out
+    jpy_none;
+end
+const roman = var".roman_5"
+# runtests/hoist.jl, line 13
+function var".is_vowel_7"(_c′)
+    c = _c′
+    local c
+    # runtests/hoist.jl, line 14
+    return @jpy_all(jpy_in(c, var".const_6"))
+    jpy_none;
+end
+const is_vowel = var".is_vowel_7"
+# runtests/hoist.jl, line 16
+function var".weekday_9"(_i′)
+    i = _i′
+    local i
+    # runtests/hoist.jl, line 17
+    return var".const_8"[jpy_mod(i, 7)]
+    jpy_none;
+end
+const weekday = var".weekday_9"
+# runtests/hoist.jl, line 19
+function var".fresh_10"()
+    local xs
+    # runtests/hoist.jl, line 20
+    xs = jpy_typed_list(Int, 1, 2, 3)
+    # runtests/hoist.jl, line 21
+    xs.append(4);
+    # runtests/hoist.jl, line 22
+    return xs
+    jpy_none;
+end
+const fresh = var".fresh_10"
+# runtests/hoist.jl, line 24
+function var".magic_11"()
+    # runtests/hoist.jl, line 25
+    return b"\x89PNG\x0d\x0a\x22\x24\x5c"
+    jpy_none;
+end
+const magic = var".magic_11"
+# runtests/hoist.jl, line 27
+println(roman(1994));
+# runtests/hoist.jl, line 28
+println(is_vowel("e"), is_vowel("z"));
+# runtests/hoist.jl, line 29
+println(weekday(9));
+# runtests/hoist.jl, line 30
+println(length(fresh()), length(fresh()));
+# runtests/hoist.jl, line 31
+println(length(magic()));
+jpy_none;
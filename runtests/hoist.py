@@ -0,0 +1,31 @@
+DIGITS = '0123456789abcdef'
+
+def roman(n, /):
+    values = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
+    numerals = ('M', 'CM', 'D', 'CD', 'C', 'XC', 'L', 'XL', 'X', 'IX', 'V', 'IV', 'I')
+    out = ''
+    for i in range(len(values)):
+        while n >= values[i]:
+            out += numerals[i]
+            n -= values[i]
+    return out
+
+def is_vowel(c, /):
+    return c in {'a', 'e', 'i', 'o', 'u'}
+
+def weekday(i, /):
+    return {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}[i % 7]
+
+def fresh():
+    xs = [1, 2, 3]
+    xs.append(4)
+    return xs
+
+def magic():
+    return b'\x89PNG\r\n"$\\'
+
+println(roman(1994))
+println(is_vowel('e'), is_vowel('z'))
+println(weekday(9))
+println(len(fresh()), len(fresh()))
+println(len(magic()))
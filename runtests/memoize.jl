@@ -0,0 +1,78 @@
+using Py2JlRuntime
+# runtests/memoize.jl, line 1
+# runtests/memoize.jl, line 4
+function var".fib_1"(_n′)
+    n = _n′
+    local n
+    # runtests/memoize.jl, line 5
+    if jpy_bool(@jpy_all(jpy_lt(n, 2)))
+        # runtests/memoize.jl, line 6
+        return n
+        jpy_none;
+    else
+        jpy_none;
+    end
+    # runtests/memoize.jl, line 7
+    return jpy_add(fib(jpy_sub(n, 1)), fib(jpy_sub(n, 2)))
+    jpy_none;
+end
+const fib = jpy_cache(var".fib_1", jpy_none, false, Tuple, Any)
+# runtests/memoize.jl, line 10
+function var".square_2"(_x′)
+    x = _x′
+    local x
+    # runtests/memoize.jl, line 11
+    return jpy_mul(x, x)
+    jpy_none;
+end
+const square = jpy_cache(var".square_2", 2, false, Tuple, Any)
+# runtests/memoize.jl, line 13
+println(fib(80));
+# runtests/memoize.jl, line 14
+println(fib.cache_info());
+# runtests/memoize.jl, line 15
+function var".loop_3"()
+    global x
+    for var".item_4" in jpy_list(1, 2, 1, 3, 1, 2)
+        x = var".item_4"
+        # runtests/memoize.jl, line 16
+        square(x);
+        jpy_none;
+    end
+end
+var".loop_3"();
+# runtests/memoize.jl, line 17
+println(square.cache_info());
+# runtests/memoize.jl, line 18
+square.cache_clear();
+# runtests/memoize.jl, line 19
+println(square.cache_info());
+# runtests/memoize.jl, line 22
+function var".scaled_5"(_a′::Integer, _b′::Integer = 2)::Int
+    a = _a′
+    b = _b′
+    local a::Int
+    local b::Int
+    # runtests/memoize.jl, line 23
+    return (a * b)
+    jpy_none;
+end
+const scaled = jpy_cache(var".scaled_5", 4, false, Tuple, Int)
+# runtests/memoize.jl, line 25
+function var".options_6"(_x′ ; _lo′ = 0, _hi′ = 10)
+    x = _x′
+    lo = _lo′
+    hi = _hi′
+    local x
+    local lo
+    local hi
+    # runtests/memoize.jl, line 26
+    return min(max(x, lo), hi)
+    jpy_none;
+end
+const options = var".options_6"
+# runtests/memoize.jl, line 28
+println(scaled(3), scaled(3, 5), scaled.cache_info());
+# runtests/memoize.jl, line 29
+println(options(20), options(-5; hi = 3), options(20; lo = 1, hi = 4));
+jpy_none;
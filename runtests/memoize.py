@@ -0,0 +1,29 @@
+from functools import cache, lru_cache
+
+@cache
+def fib(n, /):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+@lru_cache(maxsize=2)
+def square(x, /):
+    return x * x
+
+println(fib(80))
+println(fib.cache_info())
+for x in [1, 2, 1, 3, 1, 2]:
+    square(x)
+println(square.cache_info())
+square.cache_clear()
+println(square.cache_info())
+
+@lru_cache(maxsize=4)
+def scaled(a: int, b: int = 2, /) -> int:
+    return a * b
+
+def options(x, /, *, lo=0, hi=10):
+    return min(max(x, lo), hi)
+
+println(scaled(3), scaled(3, 5), scaled.cache_info())
+println(options(20), options(-5, hi=3), options(20, lo=1, hi=4))
@@ -0,0 +1,114 @@
+using Py2JlRuntime
+# runtests/ranges.jl, line 1
+function var".digits_2"(_a′, _b′, _step′)
+    a = _a′
+    b = _b′
+    step = _step′
+    local a
+    local b
+    local step
+    local s::Int
+    local i::Int
+    # runtests/ranges.jl, line 2
+    s = 0
+    # runtests/ranges.jl, line 3
+    for var".item_1" in jpy_range(a, b, step)
+        i = var".item_1"
+        # runtests/ranges.jl, line 4
+        s = ((s * 10) + i)
+        jpy_none;
+    end
+    # runtests/ranges.jl, line 5
+    return s
+    jpy_none;
+end
+const digits = var".digits_2"
+# runtests/ranges.jl, line 7
+function var".count_4"(_n′)
+    n = _n′
+    local n
+    local c::Int
+    local i::Int
+    # runtests/ranges.jl, line 8
+    c = 0
+    # runtests/ranges.jl, line 9
+    for var".item_3" in 0:n - 1
+        i = var".item_3"
+        # runtests/ranges.jl, line 10
+        c = (c + 1)
+        jpy_none;
+    end
+    # runtests/ranges.jl, line 11
+    return c
+    jpy_none;
+end
+const count = var".count_4"
+# runtests/ranges.jl, line 13
+function var".literal_steps_8"()
+    local s::Int
+    local i::Int
+    # runtests/ranges.jl, line 14
+    s = 0
+    # runtests/ranges.jl, line 15
+    for var".item_5" in 9:-3:1
+        i = var".item_5"
+        # runtests/ranges.jl, line 16
+        s = ((s * 10) + i)
+        jpy_none;
+    end
+    # runtests/ranges.jl, line 17
+    for var".item_6" in 0:4:9
+        i = var".item_6"
+        # runtests/ranges.jl, line 18
+        s = ((s * 10) + i)
+        jpy_none;
+    end
+    # runtests/ranges.jl, line 19
+    for var".item_7" in 3:2
+        i = var".item_7"
+        # runtests/ranges.jl, line 20
+        s = ((s * 10) + i)
+        jpy_none;
+    end
+    # runtests/ranges.jl, line 21
+    return s
+    jpy_none;
+end
+const literal_steps = var".literal_steps_8"
+# runtests/ranges.jl, line 23
+function var".shadowed_9"(_n′)
+    n = _n′
+    local n
+    local range
+    # runtests/ranges.jl, line 24
+    range = count
+    # runtests/ranges.jl, line 25
+    return range(n)
+    jpy_none;
+end
+const shadowed = var".shadowed_9"
+# runtests/ranges.jl, line 27
+println(@jpy_all(jpy_eq(count(5), 5)));
+# runtests/ranges.jl, line 28
+println(@jpy_all(jpy_eq(count(0), 0)));
+# runtests/ranges.jl, line 29
+println(@jpy_all(jpy_eq(count(-3), 0)));
+# runtests/ranges.jl, line 30
+println(@jpy_all(jpy_eq(digits(1, 5, 1), 1234)));
+# runtests/ranges.jl, line 31
+println(@jpy_all(jpy_eq(digits(1, 9, 3), 147)));
+# runtests/ranges.jl, line 32
+println(@jpy_all(jpy_eq(digits(9, 1, -3), 963)));
+# runtests/ranges.jl, line 33
+println(@jpy_all(jpy_eq(digits(9, 0, -1), 987654321)));
+# runtests/ranges.jl, line 34
+println(@jpy_all(jpy_eq(digits(5, 1, 1), 0)));
+# runtests/ranges.jl, line 35
+println(@jpy_all(jpy_eq(digits(1, 5, -1), 0)));
+# runtests/ranges.jl, line 36
+println(@jpy_all(jpy_eq(literal_steps(), 963048)));
+# runtests/ranges.jl, line 37
+println(@jpy_all(jpy_eq(sum(jpy_listcomp(Any, (i for i in 1:2:10))), 25)));
+# runtests/ranges.jl, line 38
+println(@jpy_all(jpy_eq(shadowed(4), 4)));
+jpy_none;
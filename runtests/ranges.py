@@ -0,0 +1,38 @@
+def digits(a, b, step, /):
+    s = 0
+    for i in range(a, b, step):
+        s = s * 10 + i
+    return s
+
+def count(n, /):
+    c = 0
+    for i in range(n):
+        c = c + 1
+    return c
+
+def literal_steps():
+    s = 0
+    for i in range(9, 0, -3):
+        s = s * 10 + i
+    for i in range(0, 10, 4):
+        s = s * 10 + i
+    for i in range(3, 3):
+        s = s * 10 + i
+    return s
+
+def shadowed(n, /):
+    range = count
+    return range(n)
+
+println(count(5) == 5)
+println(count(0) == 0)
+println(count(-3) == 0)
+println(digits(1, 5, 1) == 1234)
+println(digits(1, 9, 3) == 147)
+println(digits(9, 1, -3) == 963)
+println(digits(9, 0, -1) == 987654321)
+println(digits(5, 1, 1) == 0)
+println(digits(1, 5, -1) == 0)
+println(literal_steps() == 963048)
+println(sum([i for i in range(1, 11, 2)]) == 25)
+println(shadowed(4) == 4)
@@ -0,0 +1,76 @@
+using Py2JlRuntime
+const var".const_3" = jpy_typed_list(Int, 4, 5)
+const var".const_4" = jpy_typed_list(Int, 1, 2)
+const var".const_5" = jpy_typed_list(Int, 1, 2)
+const var".const_7" = jpy_typed_list(Int, 4, 3, 2)
+const var".const_8" = jpy_typed_list(Int, 5, 3, 1)
+const var".const_9" = jpy_typed_list(Int, 4, 2)
+const var".const_10" = jpy_typed_list(Int, 5, 4)
+# runtests/slices.jl, line 1
+function var".tail_sum_2"(_xs′)
+    xs = _xs′
+    local xs
+    local total
+    local x
+    # runtests/slices.jl, line 2
+    total = 0
+    # runtests/slices.jl, line 3
+    for var".item_1" in jpy_view(xs, jpy_slice(1, jpy_none, jpy_none))
+        x = var".item_1"
+        # runtests/slices.jl, line 4
+        total = jpy_iadd(total, x)
+        jpy_none;
+    end
+    # runtests/slices.jl, line 5
+    return total
+    jpy_none;
+end
+const tail_sum = var".tail_sum_2"
+# runtests/slices.jl, line 7
+function var".ends_6"(_xs′)
+    xs = _xs′
+    local xs
+    # runtests/slices.jl, line 8
+    return @jpy_all(@jpy_all(jpy_eq(jpy_view(xs, jpy_slice(-2, jpy_none, jpy_none)), var".const_3")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(jpy_none, -3, jpy_none)), var".const_4")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(-100, 2, jpy_none)), var".const_5")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(3, 1, jpy_none)), jpy_list())))
+    jpy_none;
+end
+const ends = var".ends_6"
+# runtests/slices.jl, line 10
+function var".backwards_11"(_xs′)
+    xs = _xs′
+    local xs
+    local rest
+    # runtests/slices.jl, line 11
+    rest = jpy_view(xs, jpy_slice(jpy_none, jpy_none, -1))
+    # runtests/slices.jl, line 12
+    return @jpy_all(@jpy_all(jpy_eq(jpy_view(rest, jpy_slice(1, -1, jpy_none)), var".const_7")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(jpy_none, jpy_none, -2)), var".const_8")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(3, 0, -2)), var".const_9")), @jpy_all(jpy_eq(jpy_view(xs, jpy_slice(-1, -3, -1)), var".const_10")))
+    jpy_none;
+end
+const backwards = var".backwards_11"
+# runtests/slices.jl, line 14
+function var".copies_12"(_xs′)
+    xs = _xs′
+    local xs
+    local ys
+    # runtests/slices.jl, line 15
+    ys = xs[jpy_slice(jpy_none, jpy_none, jpy_none)]
+    # runtests/slices.jl, line 16
+    ys[0] = 0
+    # runtests/slices.jl, line 17
+    ys[jpy_slice(1, 3, jpy_none)] = jpy_list(7)
+    # runtests/slices.jl, line 18
+    return ys
+    jpy_none;
+end
+const copies = var".copies_12"
+# runtests/slices.jl, line 20
+println(@jpy_all(jpy_eq(tail_sum(jpy_list(1, 2, 3, 4, 5)), 14)));
+# runtests/slices.jl, line 21
+println(ends(jpy_list(1, 2, 3, 4, 5)));
+# runtests/slices.jl, line 22
+println(backwards(jpy_list(1, 2, 3, 4, 5)));
+# runtests/slices.jl, line 23
+println(@jpy_all(jpy_eq(copies(jpy_list(1, 2, 3, 4, 5)), jpy_list(0, 7, 4, 5))));
+# runtests/slices.jl, line 24
+println(@jpy_all(jpy_eq("héllo"[jpy_slice(1, -1, jpy_none)], "éll")));
+jpy_none;
@@ -0,0 +1,24 @@
+def tail_sum(xs, /):
+    total = 0
+    for x in xs[1:]:
+        total += x
+    return total
+
+def ends(xs, /):
+    return xs[-2:] == [4, 5] and xs[:-3] == [1, 2] and xs[-100:2] == [1, 2] and xs[3:1] == []
+
+def backwards(xs, /):
+    rest = xs[::-1]
+    return rest[1:-1] == [4, 3, 2] and xs[::-2] == [5, 3, 1] and xs[3:0:-2] == [4, 2] and xs[-1:-3:-1] == [5, 4]
+
+def copies(xs, /):
+    ys = xs[:]
+    ys[0] = 0
+    ys[1:3] = [7]
+    return ys
+
+println(tail_sum([1, 2, 3, 4, 5]) == 14)
+println(ends([1, 2, 3, 4, 5]))
+println(backwards([1, 2, 3, 4, 5]))
+println(copies([1, 2, 3, 4, 5]) == [0, 7, 4, 5])
+println("héllo"[1:-1] == "éll")
@@ -0,0 +1,62 @@
+using Py2JlRuntime
+# runtests/strings.jl, line 1
+function var".table_3"(_rows′)
+    rows = _rows′
+    local rows
+    local out
+    local name
+    local value
+    # runtests/strings.jl, line 2
+    out = ""
+    # runtests/strings.jl, line 3
+    var".buffer_1" = jpy_strbuffer(out)
+    for var".item_2" in rows
+        (name, value, ) = var".item_2"
+        # runtests/strings.jl, line 4
+        jpy_strappend(var".buffer_1", if jpy_bool(value)
+            jpy_joinstr(jpy_format(jpy_repr(name), "<6"), "|", jpy_format(value, ">8.3f"), "|", jpy_format(value, "+,d"), "\n")
+        else
+            jpy_joinstr(jpy_str(name), "?\n")
+        end);
+        jpy_none;
+    end
+    out = jpy_strtake(var".buffer_1")
+    # runtests/strings.jl, line 5
+    return out
+    jpy_none;
+end
+const table = var".table_3"
+# runtests/strings.jl, line 7
+function var".digits_5"(_n′)
+    n = _n′
+    local n
+    local s
+    local i::Int
+    # runtests/strings.jl, line 8
+    s = "="
+    # runtests/strings.jl, line 9
+    i = 0
+    # runtests/strings.jl, line 10
+    var".buffer_4" = jpy_strbuffer(s)
+    @noscope while jpy_bool(@jpy_all(jpy_lt(i, n)))
+        # runtests/strings.jl, line 11
+        jpy_strappend(var".buffer_4", jpy_str(mod(i, 10)));
+        # runtests/strings.jl, line 12
+        i = (i + 1)
+        jpy_none;
+    end
+    s = jpy_strtake(var".buffer_4")
+    # runtests/strings.jl, line 13
+    return s
+    jpy_none;
+end
+const digits = var".digits_5"
+# runtests/strings.jl, line 15
+println(@jpy_all(jpy_eq(table(jpy_list(("a", 1234, ), ("bc", 5, ), ("d", 0, ))), "'a'   |1234.000|+1,234\n'bc'  |   5.000|+5\nd?\n")));
+# runtests/strings.jl, line 16
+println(@jpy_all(jpy_eq(digits(12), "=012345678901")));
+# runtests/strings.jl, line 17
+println(@jpy_all(jpy_eq(jpy_joinstr(jpy_str(3.5), jpy_str(jpy_none), jpy_repr(jpy_list(1, "x")), jpy_ascii("é")), "3.5None[1, 'x']'\\xe9'")));
+# runtests/strings.jl, line 18
+println(@jpy_all(jpy_eq(jpy_joinstr(jpy_format(255, "#06x"), " ", jpy_format(0.1, ".1%"), " ", jpy_format(12345.678, "_.1f"), " ", jpy_format("ab", "*^6")), "0x00ff 10.0% 12_345.7 **ab**")));
+jpy_none;
@@ -0,0 +1,18 @@
+def table(rows, /):
+    out = ""
+    for name, value in rows:
+        out += f"{name!r:<6}|{value:>8.3f}|{value:+,d}\n" if value else f"{name}?\n"
+    return out
+
+def digits(n, /):
+    s = "="
+    i = 0
+    while i < n:
+        s += str(i % 10)
+        i += 1
+    return s
+
+println(table([("a", 1234), ("bc", 5), ("d", 0)]) == "'a'   |1234.000|+1,234\n'bc'  |   5.000|+5\nd?\n")
+println(digits(12) == "=012345678901")
+println(f"{3.5!s}{None}{[1, 'x']!r}{'é'!a}" == "3.5None[1, 'x']'\\xe9'")
+println(f"{255:#06x} {0.1:.1%} {12345.678:_.1f} {'ab':*^6}" == "0x00ff 10.0% 12_345.7 **ab**")
@@ -0,0 +1,80 @@
+using Py2JlRuntime
+# runtests/vectorize.jl, line 1
+function var".axpy_3"(_out′, _a′, _b′, _c′, _n′)
+    out = _out′
+    a = _a′
+    b = _b′
+    c = _c′
+    n = _n′
+    local out
+    local a
+    local b
+    local c
+    local n
+    local i::Int
+    # runtests/vectorize.jl, line 2
+    if jpy_simd_bounds(0, n, out, a, b)
+        @simd for var".item_1" in 0:n - 1
+            i = var".item_1"
+            # runtests/vectorize.jl, line 3
+            jpy_setindex_inbounds(out, jpy_add(jpy_mul(jpy_getindex_inbounds(a, i), jpy_getindex_inbounds(b, i)), c), i);
+            jpy_none;
+        end
+    else
+        for var".item_2" in 0:n - 1
+            i = var".item_2"
+            # runtests/vectorize.jl, line 3
+            out[i] = jpy_add(jpy_mul(a[i], b[i]), c)
+            jpy_none;
+        end
+    end
+    # runtests/vectorize.jl, line 4
+    return out
+    jpy_none;
+end
+const axpy = var".axpy_3"
+# runtests/vectorize.jl, line 6
+function var".stats_6"(_a′, _b′)
+    a = _a′
+    b = _b′
+    local a
+    local b
+    local s
+    local m
+    local i::Int
+    # runtests/vectorize.jl, line 7
+    s = 0
+    # runtests/vectorize.jl, line 8
+    m = a[0]
+    # runtests/vectorize.jl, line 9
+    if jpy_simd_bounds(0, length(a), a, b)
+        @simd for var".item_4" in 0:(length(a)) - 1
+            i = var".item_4"
+            # runtests/vectorize.jl, line 10
+            s = jpy_iadd(s, jpy_mul(jpy_getindex_inbounds(a, i), jpy_getindex_inbounds(b, i)))
+            # runtests/vectorize.jl, line 11
+            m = max(m, abs(jpy_getindex_inbounds(a, i)))
+            jpy_none;
+        end
+    else
+        for var".item_5" in 0:(length(a)) - 1
+            i = var".item_5"
+            # runtests/vectorize.jl, line 10
+            s = jpy_iadd(s, jpy_mul(jpy_getindex_inbounds(a, i), b[i]))
+            # runtests/vectorize.jl, line 11
+            m = max(m, abs(jpy_getindex_inbounds(a, i)))
+            jpy_none;
+        end
+    end
+    # runtests/vectorize.jl, line 12
+    return jpy_add(jpy_mul(s, 100), m)
+    jpy_none;
+end
+const stats = var".stats_6"
+# runtests/vectorize.jl, line 14
+println(@jpy_all(jpy_eq(axpy(jpy_list(0, 0, 0), jpy_list(1, 2, 3), jpy_list(4, 5, 6), 1, 3), jpy_list(5, 11, 19))));
+# runtests/vectorize.jl, line 15
+println(@jpy_all(jpy_eq(axpy(jpy_list(0, 0), jpy_list(1, 2, 3), jpy_list(4, 5, 6), 1, 2), jpy_list(5, 11))));
+# runtests/vectorize.jl, line 16
+println(@jpy_all(jpy_eq(stats(jpy_list(1, -7, 3), jpy_list(4, 5, 6)), -1293)));
+jpy_none;
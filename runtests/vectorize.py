@@ -0,0 +1,16 @@
+def axpy(out, a, b, c, n, /):
+    for i in range(n):
+        out[i] = a[i] * b[i] + c
+    return out
+
+def stats(a, b, /):
+    s = 0
+    m = a[0]
+    for i in range(len(a)):
+        s += a[i] * b[i]
+        m = max(m, abs(a[i]))
+    return s * 100 + m
+
+println(axpy([0, 0, 0], [1, 2, 3], [4, 5, 6], 1, 3) == [5, 11, 19])
+println(axpy([0, 0], [1, 2, 3], [4, 5, 6], 1, 2) == [5, 11])
+println(stats([1, -7, 3], [4, 5, 6]) == -1293)
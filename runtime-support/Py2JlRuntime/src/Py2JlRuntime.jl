@@ -1,7 +1,8 @@
 module Py2JlRuntime
+using Printf
 export @noscope
-export PyIterator, PyVector
-export @jpy_yield, @jpy_yieldfrom, jpy_literal, jpy_addlist, jpy_slice, jpy_getiter, jpy_movenext, jpy_getcurrent, jpy_call, jpy_bool, jpy_none, @jpy_all, jpy_dict, jpy_set, jpy_list, @jpy_any, jpy_add, jpy_sub, jpy_mul, jpy_floordiv, jpy_div, jpy_iadd, jpy_isub, jpy_imul, jpy_ifloordiv, jpy_idiv, jpy_pos, jpy_neg, jpy_invert, jpy_not, jpy_eq, jpy_ne, jpy_lt, jpy_le, jpy_gt, jpy_ge, jpy_isnot, jpy_is, jpy_in, jpy_notin, @jpy_conjunctive_cmp
+export PyIterator, PyVector, PyView, PySlice, PyGenerator, PyUninit, PyClass, PyObject, PyCache, PyCacheInfo
+export @jpy_yield, @jpy_yieldfrom, jpy_literal, jpy_addlist, jpy_slice, jpy_view, jpy_getindex_inbounds, jpy_setindex_inbounds, jpy_simd_bounds, jpy_getiter, jpy_movenext, jpy_getcurrent, jpy_range, jpy_call, jpy_bool, jpy_none, @jpy_all, jpy_dict, jpy_set, jpy_list, jpy_typed_dict, jpy_typed_set, jpy_typed_list, jpy_listcomp, jpy_setcomp, jpy_dictcomp, jpy_str, jpy_repr, jpy_ascii, jpy_format, jpy_joinstr, jpy_strbuffer, jpy_strappend, jpy_strtake, jpy_uninit, jpy_class, jpy_super, jpy_dataclass!, jpy_cache, @jpy_any, jpy_add, jpy_sub, jpy_mul, jpy_floordiv, jpy_mod, jpy_div, jpy_iadd, jpy_isub, jpy_imul, jpy_ifloordiv, jpy_imod, jpy_idiv, jpy_pos, jpy_neg, jpy_invert, jpy_not, jpy_eq, jpy_ne, jpy_lt, jpy_le, jpy_gt, jpy_ge, jpy_isnot, jpy_is, jpy_in, jpy_notin, @jpy_conjunctive_cmp
 
 macro noscope(ex)
     Meta.isexpr(ex, :while) || error("noscope: only use for while")
@@ -26,13 +27,73 @@ struct PyVector{T}
     inner :: Vector{T}
 end
 
-@inline Base.iterate(x::PyVector, args...) = iterate(x.inner, args...)
-@inline Base.getindex(x::PyVector, i::Integer) = getindex(x.inner, i+1)
-@inline Base.setindex!(x::PyVector, v, i::Integer) = setindex!(x.inner, v, i+1)
+# a slice of a list that shares its elements; it has no mutating methods
+struct PyView{T, A<:AbstractVector{T}}
+    inner :: A
+end
+
+PyView(inner::A) where {T, A<:AbstractVector{T}} = PyView{T, A}(inner)
+
+const PySequence = Union{PyVector, PyView}
+
+# `start:stop:step`, each `nothing` when left out
+struct PySlice{A, B, C}
+    start :: A
+    stop :: B
+    step :: C
+end
+
+# the 1-based index of a Python index, which counts from the end when negative
+@inline _index(n::Integer, i::Integer) = i < 0 ? i + n + 1 : i + 1
+
+@inline Base.iterate(x::PySequence, args...) = iterate(x.inner, args...)
+@inline Base.getindex(x::PySequence, i::Integer) = getindex(x.inner, _index(length(x.inner), i))
+@inline Base.setindex!(x::PyVector, v, i::Integer) = setindex!(x.inner, v, _index(length(x.inner), i))
 @inline Base.push!(x::PyVector, args...) = push!(x.inner, args...)
 @inline Base.pop!(x::PyVector, args...) = pop!(x.inner, args...)
-@inline Base.eltype(x::PyVector) = eltype(x.inner)
-@inline Base.length(x::PyVector) = length(x.inner)
+@inline Base.eltype(x::PySequence) = eltype(x.inner)
+@inline Base.length(x::PySequence) = length(x.inner)
+Base.:(==)(x::PySequence, y::PySequence) = x.inner == y.inner
+
+# indices the compiler proved to be in bounds and non-negative: no bounds checks,
+# unless julia runs with `--check-bounds=yes`
+@inline jpy_getindex_inbounds(x::PySequence, i::Integer) = @inbounds x.inner[i + 1]
+@inline jpy_getindex_inbounds(x, i) = x[i]
+
+@inline function jpy_setindex_inbounds(x::PyVector, v, i::Integer)
+    @inbounds x.inner[i + 1] = v
+    return nothing
+end
+
+@inline function jpy_setindex_inbounds(x, v, i)
+    x[i] = v
+    return nothing
+end
+
+# whether the indices `start:stop-1` are in bounds of every list,
+# which the `@simd` loop over them then indexes unchecked
+@inline function jpy_simd_bounds(start::Integer, stop::Integer, xs...)
+    start >= 0 && all(x -> x isa PySequence && stop <= length(x.inner), xs)
+end
+# assigning a list to a typed local or field: it holds the list itself, as in Python,
+# so a list with other element types is an error rather than a copy
+Base.convert(::Type{T}, x::PyVector) where {T<:PyVector} =
+    x isa T ? x : throw(ArgumentError("a $(typeof(x)) is not a $T, and converting it would copy it"))
+
+# a generator compiled to a closure: each call resumes the body,
+# returning `Some(value)` at a yield and `nothing` once the body is done
+struct PyGenerator{F}
+    resume :: F
+end
+
+Base.IteratorSize(::Type{<:PyGenerator}) = Base.SizeUnknown()
+Base.IteratorEltype(::Type{<:PyGenerator}) = Base.EltypeUnknown()
+
+@inline function Base.iterate(g::PyGenerator, _ = nothing)
+    r = g.resume()
+    r === nothing && return nothing
+    return (something(r), nothing)
+end
 
 macro jpy_yield(v)
     esc(:($put!(PyContinuation, $v)))
@@ -60,20 +121,60 @@ end
     push!(x, y)
 end
 
-@inline function jpy_slice(x, start, stop, step)
-    if start === jpy_none
-        start = 0
-    end
-    if stop === jpy_none
-        stop = length(x)-1
+@inline jpy_slice(start, stop, step) = PySlice(start, stop, step)
+
+# a bound of a slice of `n` elements as `slice.indices` has it: 0-based, clamped to `lo:hi`
+@inline function _slice_bound(i, n::Int, default::Int, lo::Int, hi::Int)
+    i === nothing && return default
+    i = Int(i)
+    return clamp(i < 0 ? i + n : i, lo, hi)
+end
+
+# the 1-based indices a slice selects from `n` elements
+@inline function _slice_range(n::Int, s::PySlice{A, B, Nothing}) where {A, B}
+    (_slice_bound(s.start, n, 0, 0, n) + 1):_slice_bound(s.stop, n, n, 0, n)
+end
+
+@inline function _slice_range(n::Int, s::PySlice)
+    step = Int(s.step)
+    step == 0 && throw(ArgumentError("slice step cannot be zero"))
+    if step > 0
+        start = _slice_bound(s.start, n, 0, 0, n)
+        stop = _slice_bound(s.stop, n, n, 0, n)
+        return (start + 1):step:stop
     end
-    if step === jpy_none
-        step = 1
+    start = _slice_bound(s.start, n, n - 1, -1, n - 1)
+    stop = _slice_bound(s.stop, n, -1, -1, n - 1)
+    return (start + 1):step:(stop + 2)
+end
+
+@inline Base.getindex(x::PySequence, s::PySlice) = PyVector(x.inner[_slice_range(length(x.inner), s)])
+@inline Base.getindex(x::Tuple, s::PySlice) = x[_slice_range(length(x), s)]
+
+function Base.getindex(x::AbstractString, s::PySlice)
+    isascii(x) && return String(codeunits(x)[_slice_range(ncodeunits(x), s)])
+    chars = collect(x)
+    return String(chars[_slice_range(length(chars), s)])
+end
+
+function Base.setindex!(x::PyVector, v, s::PySlice)
+    r = _slice_range(length(x.inner), s)
+    if r isa UnitRange
+        splice!(x.inner, r, collect(v))
+    else
+        values = collect(v)
+        length(values) == length(r) ||
+            throw(ArgumentError("attempt to assign sequence of size $(length(values)) to extended slice of size $(length(r))"))
+        x.inner[r] = values
     end
-    return x[start:step:stop]
-    
+    return x
 end
 
+# a slice read without copying, where the compiler knows neither the slice
+# nor the list is mutated while the slice is alive; other values are copied
+@inline jpy_view(x::PySequence, s::PySlice) = PyView(view(x.inner, _slice_range(length(x.inner), s)))
+@inline jpy_view(x, s::PySlice) = x[s]
+
 
 @inline function jpy_getiter(x::T) where T
     PyIterator{T, _infer_state_type(T)}(x, nothing)
@@ -96,6 +197,10 @@ end
     return x.state[1]
 end
 
+@inline function jpy_range(start::Integer, stop::Integer, step::Integer)
+    start:step:(step > 0 ? stop - one(stop) : stop + one(stop))
+end
+
 @inline function jpy_call(f, args, kwargs)
     f(args...; kwargs...)
 end
@@ -104,12 +209,20 @@ end
     x
 end
 
-@inline function jpy_bool(x::Union{AbstractVector, AbstractSet, AbstractDict})
-    isempty(x)
+@inline function jpy_bool(x::Number)
+    !iszero(x)
+end
+
+@inline function jpy_bool(::Nothing)
+    false
+end
+
+@inline function jpy_bool(x::Union{AbstractVector, AbstractSet, AbstractDict, AbstractString, PySequence})
+    !isempty(x)
 end
 
 @inline function jpy_bool(x::Tuple)
-    isempty(x)
+    !isempty(x)
 end
 
 const jpy_none = nothing
@@ -137,10 +250,46 @@ end
     Set(xs)
 end
 
+# `Set(())` and `collect(())` have element type `Union{}` and could hold nothing
+@inline jpy_set() = Set{Any}()
+
 @inline function jpy_list(xs...)
     PyVector(collect(xs))
 end
 
+@inline jpy_list() = PyVector{Any}(Any[])
+
+# displays with annotated element types
+@inline function jpy_typed_dict(::Type{K}, ::Type{V}, xs...) where {K, V}
+    Dict{K, V}(xs...)
+end
+
+@inline function jpy_typed_set(::Type{T}, xs...) where T
+    Set{T}(xs)
+end
+
+@inline function jpy_typed_list(::Type{T}, xs...) where T
+    PyVector{T}(T[xs...])
+end
+
+# comprehensions: the element type is the one inferred for the generator, or the given one,
+# and the result is sized up front when the generator has a length
+@inline jpy_listcomp(gen) = PyVector(collect(gen))
+@inline jpy_listcomp(::Type{T}, gen) where T = PyVector{T}(collect(T, gen))
+@inline jpy_setcomp(::Type{T}, gen) where T = Set{T}(gen)
+@inline jpy_dictcomp(::Type{K}, ::Type{V}, gen) where {K, V} = Dict{K, V}(gen)
+
+@inline function jpy_setcomp(gen)
+    T = Base.@default_eltype(gen)
+    isconcretetype(T) ? Set{T}(gen) : Set(gen)
+end
+
+@inline function jpy_dictcomp(gen)
+    T = Base.@default_eltype(gen)
+    T <: Pair && isconcretetype(T) || return Dict(gen)
+    Dict{fieldtype(T, 1), fieldtype(T, 2)}(gen)
+end
+
 macro jpy_any(xs...)
     foldr(xs) do (l, r)
         left = gensym(:left)
@@ -155,15 +304,21 @@ macro jpy_any(xs...)
 end
 
 @inline jpy_add(a, b) = a + b
+@inline jpy_add(a::AbstractString, b::AbstractString) = string(a, b)
 @inline jpy_sub(a, b) = a - b
 @inline jpy_mul(a, b) = a * b
-@inline jpy_floordiv(a, b) = div(a, b)
+@inline jpy_mul(a::AbstractString, n::Integer) = repeat(a, max(n, 0))
+@inline jpy_mul(n::Integer, a::AbstractString) = repeat(a, max(n, 0))
+# Python's `//` and `%` round towards negative infinity, as the native `fld` and `mod` do
+@inline jpy_floordiv(a, b) = fld(a, b)
+@inline jpy_mod(a, b) = mod(a, b)
 @inline jpy_div(a, b) = a / b
 
 @inline jpy_iadd(a, b) = jpy_add(a, b)
 @inline jpy_isub(a, b) = jpy_sub(a, b)
 @inline jpy_imul(a, b) = jpy_mul(a, b)
 @inline jpy_ifloordiv(a, b) = jpy_floordiv(a, b)
+@inline jpy_imod(a, b) = jpy_mod(a, b)
 @inline jpy_idiv(a, b) = jpy_div(a, b)
 
 @inline jpy_pos(a) = +a
@@ -190,5 +345,515 @@ macro jpy_conjunctive_cmp(op, args...)
     return esc(Expr(:&&, xs...))
 end
 
+# strings: `str`, `repr`, `ascii` and `format` as Python does them
+
+jpy_str(x::AbstractString) = String(x)
+jpy_str(x) = jpy_repr(x)
+
+jpy_repr(x) = string(x)
+jpy_repr(x::Bool) = x ? "True" : "False"
+jpy_repr(::Nothing) = "None"
+jpy_repr(x::AbstractFloat) = _float_repr(Float64(x))
+jpy_repr(x::AbstractString) = _string_repr(x)
+jpy_repr(x::PySequence) = "[" * join(map(jpy_repr, x.inner), ", ") * "]"
+jpy_repr(x::Tuple) = length(x) == 1 ? "(" * jpy_repr(x[1]) * ",)" : "(" * join(map(jpy_repr, x), ", ") * ")"
+jpy_repr(x::AbstractDict) = "{" * join((jpy_repr(k) * ": " * jpy_repr(v) for (k, v) in x), ", ") * "}"
+jpy_repr(x::AbstractSet) = isempty(x) ? "set()" : "{" * join(map(jpy_repr, collect(x)), ", ") * "}"
+
+jpy_ascii(x) = join(isascii(c) ? string(c) : _escape_char(c) for c in jpy_repr(x))
+
+function _escape_char(c::Char)
+    n = UInt32(c)
+    n < 0x100 && return "\\x" * string(n, base=16, pad=2)
+    n < 0x10000 && return "\\u" * string(n, base=16, pad=4)
+    "\\U" * string(n, base=16, pad=8)
+end
+
+function _string_repr(s::AbstractString)
+    q = occursin('\'', s) && !occursin('"', s) ? '"' : '\''
+    io = IOBuffer()
+    write(io, q)
+    for c in s
+        if c == q || c == '\\'
+            write(io, '\\', c)
+        elseif c == '\n'
+            write(io, "\\n")
+        elseif c == '\r'
+            write(io, "\\r")
+        elseif c == '\t'
+            write(io, "\\t")
+        elseif !isprint(c)
+            write(io, _escape_char(c))
+        else
+            write(io, c)
+        end
+    end
+    write(io, q)
+    String(take!(io))
+end
+
+# the shortest digits that round-trip, laid out like Python's `repr`
+function _float_repr(x::Float64)
+    isnan(x) && return "nan"
+    isinf(x) && return x > 0 ? "inf" : "-inf"
+    iszero(x) && return signbit(x) ? "-0.0" : "0.0"
+    s = string(abs(x))
+    m, e = occursin('e', s) ? split(s, 'e') : (s, "0")
+    ip, fp = split(m, '.')
+    digits = ip * fp
+    # x == 0.digits * 10^point
+    point = length(ip) + parse(Int, e)
+    nz = findfirst(!=('0'), digits)
+    point -= nz - 1
+    digits = rstrip(digits[nz:end], '0')
+    exp = point - 1
+    sign = signbit(x) ? "-" : ""
+    if -4 <= exp < 16
+        if point <= 0
+            return sign * "0." * "0"^(-point) * digits
+        elseif point >= length(digits)
+            return sign * digits * "0"^(point - length(digits)) * ".0"
+        end
+        return sign * digits[1:point] * "." * digits[point+1:end]
+    end
+    mantissa = length(digits) == 1 ? digits : digits[1:1] * "." * digits[2:end]
+    sign * mantissa * "e" * (exp < 0 ? "-" : "+") * lpad(string(abs(exp)), 2, '0')
+end
+
+# the format specification mini-language: [[fill]align][sign][#][0][width][grouping][.precision][type]
+struct FormatSpec
+    fill :: Char
+    align :: Char  # '\0' if not given
+    sign :: Char
+    alternate :: Bool
+    width :: Int
+    grouping :: Char  # '\0' if not given
+    precision :: Int  # -1 if not given
+    type :: Char  # '\0' if not given
+end
+
+function FormatSpec(spec::AbstractString)
+    cs = collect(spec)
+    n = length(cs)
+    i = 1
+    fill, align = ' ', '\0'
+    if n >= 2 && cs[2] in "<>=^"
+        fill, align = cs[1], cs[2]
+        i = 3
+    elseif n >= 1 && cs[1] in "<>=^"
+        align = cs[1]
+        i = 2
+    end
+    sign = '-'
+    if i <= n && cs[i] in "+- "
+        sign = cs[i]
+        i += 1
+    end
+    alternate = i <= n && cs[i] == '#'
+    alternate && (i += 1)
+    if i <= n && cs[i] == '0'
+        if align == '\0'
+            fill, align = '0', '='
+        end
+        i += 1
+    end
+    width = 0
+    while i <= n && isdigit(cs[i])
+        width = 10width + (cs[i] - '0')
+        i += 1
+    end
+    grouping = '\0'
+    if i <= n && cs[i] in ",_"
+        grouping = cs[i]
+        i += 1
+    end
+    precision = -1
+    if i <= n && cs[i] == '.'
+        i += 1
+        precision = 0
+        while i <= n && isdigit(cs[i])
+            precision = 10precision + (cs[i] - '0')
+            i += 1
+        end
+    end
+    type = '\0'
+    if i <= n
+        type = cs[i]
+        i += 1
+    end
+    i <= n && throw(ArgumentError("Invalid format specifier '$spec'"))
+    FormatSpec(fill, align, sign, alternate, width, grouping, precision, type)
+end
+
+jpy_format(x, spec::AbstractString) = isempty(spec) ? jpy_str(x) : _format(x, FormatSpec(spec))
+
+_format(x, f::FormatSpec) = _format(jpy_str(x), f)
+
+function _format(x::AbstractString, f::FormatSpec)
+    f.type in ('\0', 's') || throw(ArgumentError("Unknown format code '$(f.type)' for object of type 'str'"))
+    _pad(f.precision >= 0 ? first(x, f.precision) : x, f, '<')
+end
+
+function _format(x::Integer, f::FormatSpec)
+    t = f.type
+    t in "eEfFgGn%" && return _format(Float64(x), f)
+    t == 'c' && return _pad(string(Char(x)), f, '>')
+    t in "\0dbBoxX" || throw(ArgumentError("Unknown format code '$t' for object of type 'int'"))
+    base, prefix = t == 'b' ? (2, "0b") : t == 'o' ? (8, "0o") : t == 'x' ? (16, "0x") : t == 'X' ? (16, "0X") : (10, "")
+    digits = string(x isa Bool ? Int(x) : x, base=base)
+    neg = startswith(digits, '-')
+    neg && (digits = digits[2:end])
+    t == 'X' && (digits = uppercase(digits))
+    _pad_number(neg, f.alternate ? prefix : "", _group(digits, f.grouping, base == 10 ? 3 : 4), f)
+end
+
+function _format(x::AbstractFloat, f::FormatSpec)
+    x = Float64(x)
+    t = f.type
+    t in "\0eEfFgGn%" || throw(ArgumentError("Unknown format code '$t' for object of type 'float'"))
+    neg = signbit(x) && !isnan(x)
+    y = abs(x)
+    p = f.precision < 0 ? 6 : f.precision
+    if !isfinite(y)
+        body = isnan(y) ? "nan" : "inf"
+        t in "EFG" && (body = uppercase(body))
+        t == '%' && (body *= "%")
+    elseif t == '\0'
+        body = f.precision < 0 ? _float_repr(y) : _float_general(y, p, f.alternate)
+    elseif t == '%'
+        body = _printf('f', y * 100, p, f.alternate) * "%"
+    else
+        body = _printf(t == 'n' ? 'g' : t, y, p, f.alternate)
+    end
+    if f.grouping != '\0'
+        m = match(r"^(\d+)(.*)$"s, body)
+        m === nothing || (body = _group(m[1], f.grouping, 3) * m[2])
+    end
+    _pad_number(neg, "", body, f)
+end
+
+_printf(t::Char, y::Float64, p::Int, alternate::Bool) =
+    Printf.format(Printf.Format(string('%', alternate ? "#" : "", '.', p, t)), y)
+
+_strip_zeros(s::AbstractString) = occursin('.', s) ? rstrip(rstrip(s, '0'), '.') : s
+
+# no format type but a precision: like 'g', switching to exponents from `exp >= p - 1`,
+# with at least one digit after the point
+function _float_general(y::Float64, p::Int, alternate::Bool)
+    p = max(p, 1)
+    s = _printf('e', y, p - 1, false)
+    m, e = split(s, 'e')
+    exp = parse(Int, e)
+    if -4 <= exp < p - 1
+        body = _printf('f', y, p - 1 - exp, alternate)
+        alternate || (body = _strip_zeros(body))
+        return occursin('.', body) ? body : body * ".0"
+    end
+    (alternate ? m : _strip_zeros(m)) * "e" * e
+end
+
+function _group(digits::AbstractString, sep::Char, every::Int)
+    sep == '\0' && return String(digits)
+    n = length(digits)
+    join(reverse([digits[max(1, i - every + 1):i] for i in n:-every:1]), sep)
+end
+
+function _pad_number(neg::Bool, prefix::String, body::AbstractString, f::FormatSpec)
+    sign = neg ? "-" : f.sign == '+' ? "+" : f.sign == ' ' ? " " : ""
+    n = f.width - length(sign) - length(prefix) - length(body)
+    if n > 0 && f.align == '='
+        return sign * prefix * string(f.fill)^n * body
+    end
+    _pad(sign * prefix * body, f, '>')
+end
+
+function _pad(s::AbstractString, f::FormatSpec, default::Char)
+    n = f.width - length(s)
+    n <= 0 && return String(s)
+    fill = string(f.fill)
+    align = f.align == '\0' ? default : f.align
+    align == '<' && return s * fill^n
+    align == '>' && return fill^n * s
+    align == '^' && return fill^(n ÷ 2) * s * fill^(n - n ÷ 2)
+    throw(ArgumentError("'=' alignment not allowed in string format specifier"))
+end
+
+# f-strings are built in one go, from strings only
+@inline jpy_joinstr(parts::AbstractString...) = string(parts...)
+
+# `s += piece` in a loop appends to a buffer, taken back to `s` after the loop
+@inline function jpy_strbuffer(s::AbstractString)
+    io = IOBuffer()
+    write(io, s)
+    io
+end
+
+@inline function jpy_strappend(io::IOBuffer, piece::AbstractString)
+    write(io, piece)
+    nothing
+end
+
+@inline jpy_strtake(io::IOBuffer) = String(take!(io))
+
+# classes compiled to structs: `C(jpy_uninit)` makes an instance for `__init__` to fill in
+struct PyUninit end
+const jpy_uninit = PyUninit()
+
+# other classes: instances keep their attributes in a dict, and look up the others in their class
+struct PyClass
+    name :: String
+    bases :: Vector{PyClass}
+    attrs :: Dict{Symbol, Any}
+end
+
+struct PyObject
+    cls :: PyClass
+    attrs :: Dict{Symbol, Any}
+end
+
+# `super()` in a method of `cls`
+struct PySuper
+    cls :: PyClass
+    self :: Any
+end
+
+jpy_class(name::String, bases::Tuple) = PyClass(name, PyClass[bases...], Dict{Symbol, Any}())
+
+jpy_super(cls::PyClass, self) = PySuper(cls, self)
+
+# the attribute `name` of `cls` or of its bases, depth first, as `Some`, or `nothing`
+function _classattr(cls::PyClass, name::Symbol)
+    attrs = getfield(cls, :attrs)
+    haskey(attrs, name) && return Some(attrs[name])
+    for base in getfield(cls, :bases)
+        v = _classattr(base, name)
+        v === nothing || return v
+    end
+    return nothing
+end
+
+# functions looked up in the class of an instance are its methods
+_bind(f::Function, self) = (args...; kwargs...) -> f(self, args...; kwargs...)
+_bind(v, self) = v
+
+function Base.getproperty(cls::PyClass, name::Symbol)
+    v = _classattr(cls, name)
+    v === nothing && throw(ErrorException("type object '$(getfield(cls, :name))' has no attribute '$name'"))
+    something(v)
+end
+
+function Base.setproperty!(cls::PyClass, name::Symbol, v)
+    getfield(cls, :attrs)[name] = v
+end
+
+function Base.getproperty(x::PyObject, name::Symbol)
+    attrs = getfield(x, :attrs)
+    haskey(attrs, name) && return attrs[name]
+    cls = getfield(x, :cls)
+    v = _classattr(cls, name)
+    v === nothing && throw(ErrorException("'$(getfield(cls, :name))' object has no attribute '$name'"))
+    _bind(something(v), x)
+end
+
+function Base.setproperty!(x::PyObject, name::Symbol, v)
+    getfield(x, :attrs)[name] = v
+end
+
+function Base.getproperty(s::PySuper, name::Symbol)
+    for base in getfield(getfield(s, :cls), :bases)
+        v = _classattr(base, name)
+        v === nothing || return _bind(something(v), getfield(s, :self))
+    end
+    throw(ErrorException("'super' object has no attribute '$name'"))
+end
+
+function (cls::PyClass)(args...; kwargs...)
+    self = PyObject(cls, Dict{Symbol, Any}())
+    init = _classattr(cls, :__init__)
+    init === nothing || something(init)(self, args...; kwargs...)
+    return self
+end
+
+function _method(x::PyObject, name::Symbol)
+    f = _classattr(getfield(x, :cls), name)
+    f === nothing ? nothing : something(f)
+end
+
+function jpy_repr(x::PyObject)
+    f = _method(x, :__repr__)
+    f === nothing ? "<$(getfield(getfield(x, :cls), :name)) object>" : f(x)
+end
+
+function jpy_str(x::PyObject)
+    f = _method(x, :__str__)
+    f === nothing ? jpy_repr(x) : f(x)
+end
+
+function Base.:(==)(a::PyObject, b::PyObject)
+    f = _method(a, :__eq__)
+    f === nothing ? a === b : jpy_bool(f(a, b))
+end
+
+Base.show(io::IO, x::PyObject) = print(io, jpy_str(x))
+
+# the `__init__`, `__repr__` and `__eq__` of a `@dataclass` with `fields`,
+# `defaults` holding the defaults of the last ones; methods of the class itself are kept.
+# the fields of dataclass bases come first
+function jpy_dataclass!(cls::PyClass, fields::Tuple, defaults::NamedTuple)
+    attrs = getfield(cls, :attrs)
+    all_fields = Symbol[]
+    all_defaults = (;)
+    for base in reverse(getfield(cls, :bases))
+        inherited = _classattr(base, :__dataclass_fields__)
+        inherited === nothing && continue
+        for f in something(inherited)
+            f in all_fields || push!(all_fields, f)
+        end
+        all_defaults = merge(all_defaults, something(_classattr(base, :__dataclass_defaults__)))
+    end
+    for f in fields
+        f in all_fields || push!(all_fields, f)
+    end
+    fields = Tuple(all_fields)
+    defaults = merge(all_defaults, defaults)
+    attrs[:__dataclass_fields__] = fields
+    attrs[:__dataclass_defaults__] = defaults
+    get!(attrs, :__init__) do
+        function (self, args...; kwargs...)
+            length(args) <= length(fields) || throw(ArgumentError(
+                "$(getfield(cls, :name)).__init__ takes $(length(fields)) arguments but $(length(args)) were given"))
+            for (i, f) in enumerate(fields)
+                v = i <= length(args) ? args[i] :
+                    haskey(kwargs, f) ? kwargs[f] :
+                    haskey(defaults, f) ? defaults[f] :
+                    throw(ArgumentError("$(getfield(cls, :name)).__init__ is missing the argument '$f'"))
+                setproperty!(self, f, v)
+            end
+            nothing
+        end
+    end
+    get!(attrs, :__repr__) do
+        self -> getfield(cls, :name) * "(" * join(("$f=" * jpy_repr(getproperty(self, f)) for f in fields), ", ") * ")"
+    end
+    get!(attrs, :__eq__) do
+        (a, b) -> b isa PyObject && getfield(b, :cls) === getfield(a, :cls) &&
+            all(getproperty(a, f) == getproperty(b, f) for f in fields)
+    end
+    cls
+end
+
+# `functools.lru_cache` and `functools.cache`: the results of a function by its arguments,
+# in a list from the most to the least recently used, as CPython does
+mutable struct _CacheLink{K, V}
+    key :: K
+    value :: V
+    prev :: _CacheLink{K, V}
+    next :: _CacheLink{K, V}
+    # the root of the list
+    function _CacheLink{K, V}() where {K, V}
+        root = new{K, V}()
+        root.prev = root
+        root.next = root
+        root
+    end
+    _CacheLink{K, V}(key, value, prev, next) where {K, V} = new{K, V}(key, value, prev, next)
+end
+
+# `maxsize` is -1 when unbounded
+mutable struct PyCache{F, K, V} <: Function
+    f :: F
+    maxsize :: Int
+    typed :: Bool
+    table :: Dict{K, _CacheLink{K, V}}
+    root :: _CacheLink{K, V}
+    hits :: Int
+    misses :: Int
+end
+
+struct PyCacheInfo
+    hits :: Int
+    misses :: Int
+    maxsize :: Union{Int, Nothing}
+    currsize :: Int
+end
+
+# `f` memoized with at most `maxsize` results, or any number if it is `nothing`;
+# its arguments are keys of type `K`, and its results are of type `V`
+function jpy_cache(f, maxsize::Union{Integer, Nothing}, typed::Bool, ::Type{K}, ::Type{V}) where {K, V}
+    bound = maxsize === nothing ? -1 : max(Int(maxsize), 0)
+    PyCache{typeof(f), K, V}(f, bound, typed, Dict{K, _CacheLink{K, V}}(), _CacheLink{K, V}(), 0, 0)
+end
+
+# `typed` caches arguments of different types separately, as `1` and `1.0`
+function _cache_key(c::PyCache, args::Tuple, kwargs)
+    key = isempty(kwargs) ? args : (args, values(kwargs))
+    getfield(c, :typed) ? (key, map(typeof, args)) : key
+end
+
+function _unlink!(link::_CacheLink)
+    link.prev.next = link.next
+    link.next.prev = link.prev
+end
+
+function _link_first!(root::_CacheLink, link::_CacheLink)
+    link.prev = root
+    link.next = root.next
+    root.next.prev = link
+    root.next = link
+end
+
+function (c::PyCache{F, K, V})(args...; kwargs...) where {F, K, V}
+    key = _cache_key(c, args, kwargs)
+    table = getfield(c, :table)
+    root = getfield(c, :root)
+    maxsize = getfield(c, :maxsize)
+    link = get(table, key, nothing)
+    if link !== nothing
+        setfield!(c, :hits, getfield(c, :hits) + 1)
+        if maxsize > 0
+            _unlink!(link)
+            _link_first!(root, link)
+        end
+        return link.value
+    end
+    setfield!(c, :misses, getfield(c, :misses) + 1)
+    value = getfield(c, :f)(args...; kwargs...)
+    # a recursive call may have cached the key already
+    (maxsize == 0 || haskey(table, key)) && return value
+    if maxsize > 0 && length(table) >= maxsize
+        oldest = root.prev
+        _unlink!(oldest)
+        delete!(table, oldest.key)
+    end
+    link = _CacheLink{K, V}(key, value, root, root.next)
+    _link_first!(root, link)
+    table[key] = link
+    return value
+end
+
+function Base.getproperty(c::PyCache, name::Symbol)
+    if name === :cache_info
+        return () -> PyCacheInfo(
+            getfield(c, :hits), getfield(c, :misses),
+            getfield(c, :maxsize) < 0 ? nothing : getfield(c, :maxsize), length(getfield(c, :table)))
+    elseif name === :cache_clear
+        return function ()
+            empty!(getfield(c, :table))
+            root = getfield(c, :root)
+            root.prev = root
+            root.next = root
+            setfield!(c, :hits, 0)
+            setfield!(c, :misses, 0)
+            nothing
+        end
+    elseif name === :__wrapped__
+        return getfield(c, :f)
+    end
+    getfield(c, name)
+end
+
+jpy_repr(x::PyCacheInfo) = "CacheInfo(hits=$(x.hits), misses=$(x.misses), maxsize=$(jpy_repr(x.maxsize)), currsize=$(x.currsize))"
+
+Base.show(io::IO, x::PyCacheInfo) = print(io, jpy_repr(x))
 
 end # module